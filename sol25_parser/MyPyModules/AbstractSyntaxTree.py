@@ -7,7 +7,7 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            18.02.2025                                                 *
-* Poslední změna:   22.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento soubor obsahuje definice uzlů abstraktního           *
 *                   syntaktického stromu (AST) pro jazyk SOL25 a obecných      *
@@ -25,7 +25,9 @@ from MyPyModules.CustomErrors import InternalError
 class ASTNodes:
     """
     Třída `ASTNodes` obsahuje vnořené třídy reprezentující různé typy uzlů
-    abstraktního syntaktického stromu (AST) pro jazyk SOL25.
+    abstraktního syntaktického stromu (AST) pro jazyk SOL25. Uzly definují
+    `__slots__` (bez `__dict__`), protože velké programy obsahují statisíce
+    uzlů a slovníky atributů by tvořily většinu paměti AST.
 
     Vnořené třídy:
         - ASTAbstractNode: Abstraktní třída pro všechny uzly AST.
@@ -47,6 +49,8 @@ class ASTNodes:
             - visit_by(visitor:ASTNodeVisitor): Metoda pro návštěvu uzlu návštěvníkem.
         """
 
+        __slots__ = ()
+
         def visit_by(self, visitor):
             """
             Metoda pro návštěvu uzlu návštěvníkem.
@@ -71,6 +75,8 @@ class ASTNodes:
             - visit_by(visitor:ASTNodeVisitor)
         """
 
+        __slots__ = ("classNodeList",)
+
         def __init__(self, classes: List["ASTNodes.ClassNode"]):
             """
             Inicializuje uzel programu.
@@ -97,6 +103,8 @@ class ASTNodes:
             - visit_by(visitor:ASTNodeVisitor)
         """
 
+        __slots__ = ("identifier", "perentIdentifier", "methodNodeList")
+
         def __init__(self, identifier: str, parentIdentifier: str, methods: List["ASTNodes.MethodNode"]):
             """
             Inicializuje uzel třídy.
@@ -118,6 +126,8 @@ class ASTNodes:
         Třída reprezentující uzel metody v AST.
         """
 
+        __slots__ = ("selector", "blockNode")
+
         def __init__(self, selector: str, blockNode: "ASTNodes.BlockNode"):
             """
             Inicializuje uzel metody.
@@ -137,6 +147,8 @@ class ASTNodes:
         Třída reprezentující uzel bloku v AST.
         """
 
+        __slots__ = ("parameterNodeList", "statementNodeList")
+
         def __init__(self, parameters: List[str], statements: List["ASTNodes"]):
             """
             Inicializuje uzel bloku.
@@ -156,6 +168,8 @@ class ASTNodes:
         Třída reprezentující uzel proměnné v AST.
         """
 
+        __slots__ = ("identifier",)
+
         def __init__(self, identifier: str):
             """
             Inicializuje uzel proměnné.
@@ -173,6 +187,8 @@ class ASTNodes:
         Třída reprezentující uzel literálu v AST.
         """
 
+        __slots__ = ("literalType", "literalValue")
+
         def __init__(self, literalType: str, literalValue: Any):
             """
             Inicializuje uzel literálu.
@@ -192,6 +208,8 @@ class ASTNodes:
         Třída reprezentující uzel přiřazení v AST.
         """
 
+        __slots__ = ("identifierNode", "exprNode")
+
         def __init__(self, identifier: "ASTNodes.IdentifierNode", expression: "ASTNodes.ExpressionNode"):
             """
             Inicializuje uzel přiřazení.
@@ -211,6 +229,8 @@ class ASTNodes:
         Třída reprezentující uzel výrazu v AST.
         """
 
+        __slots__ = ("receiver", "selector", "argNodeList")
+
         def __init__(self, receiver: "ASTNodes", selector: str, args: List["ASTNodes"]):
             """
             Inicializuje uzel výrazu.
@@ -7,19 +7,17 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            17.02.2025                                                 *
-* Poslední změna:   10.03.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento soubor obsahuje třídu ArgumentParser, která          *
 *                   zpracovává argumenty příkazové řádky pro skript            *
-*                   `parse.py`.                                                *
+*                   `parse.py`. Modul `argparse` se importuje až tehdy, když   *
+*                   jsou nějaké argumenty skutečně zadány.                     *
 ********************************************************************************
 """
 
 # Import modulů standardní knihovny
-from sys import argv
-
-# Import modulů instalovaných pomocí 'pip'
-import argparse
+import sys  # argv
 
 # Import vlastních modulů
 from MyPyModules.CustomErrors import ScriptParameterError, ParsingSuccess
@@ -31,22 +29,77 @@ class ArgumentParser:
     `parse.py`.
 
     Atributy:
-        - parser (argparse.ArgumentParser): Instance parseru pro zpracování argumentů.
+        - parser (argparse.ArgumentParser|None): Instance parseru pro zpracování argumentů
+                                                 (vytváří se až při zpracování argumentů).
+        - inputFile (str|None): Soubor se zdrojovým kódem (místo STDIN).
+        - astBackend (str|None): Reprezentace AST ('object' nebo 'flat').
+        - fusedPass (bool): Sémantická analýza a generování XML v jediném průchodu AST.
+        - checkSyntax (bool): Pouze kontrola lexikální a syntaktické správnosti.
+        - maxErrors (int|None): Počet sbíraných lexikálních a syntaktických (resp. sémantických) chyb.
+        - batchPaths (list|None): Cesty analyzované v dávkovém režimu.
+        - outputDirectory (str|None): Výstupní adresář dávkového režimu.
+        - jobs (int|None): Počet pracovních procesů dávkového režimu.
+        - serverSocket (str|None): Cesta k socketu serverového režimu.
+        - cacheDirectory (str|None): Adresář mezipaměti výsledků.
+        - cacheSize (int|None): Maximální velikost mezipaměti výsledků v bajtech.
 
     Metody:
-        - __init__(): Inicializuje parser s definovanými argumenty.
+        - __init__(): Inicializuje výchozí hodnoty argumentů.
+        - create_parser() -> argparse.ArgumentParser: Vytvoří parser s definovanými argumenty.
         - parser_result(): Zpracovává a vrací výsledky parsování argumentů.
         - parse_arguments(): Zpracovává argumenty příkazové řádky.
     """
     def __init__(self):
         """
-        Inicializuje parser s definovanými argumenty příkazové řádky.
+        Inicializuje výchozí hodnoty argumentů příkazové řádky. Parser
+        argumentů se vytváří až v `parser_result()`.
         """
-        self.parser = argparse.ArgumentParser(
+        self.parser = None
+
+        # Soubor se zdrojovým kódem (None, pokud se čte STDIN)
+        self.inputFile = None
+
+        # Reprezentace AST (None, pokud se použije výchozí)
+        self.astBackend = None
+
+        # Sloučený průchod sémantické analýzy a generování XML
+        self.fusedPass = False
+
+        # Pouze kontrola syntaxe (bez AST, sémantické analýzy a výstupu XML)
+        self.checkSyntax = False
+
+        # Zotavení z chyb (None, pokud parsování ukončí první chyba)
+        self.maxErrors = None
+
+        # Výsledky dávkového režimu (None, pokud se dávkový režim nepoužije)
+        self.batchPaths = None
+        self.outputDirectory = None
+        self.jobs = None
+
+        # Cesta k socketu serverového režimu (None, pokud se režim nepoužije)
+        self.serverSocket = None
+
+        # Mezipaměť výsledků (None, pokud se nepoužije)
+        self.cacheDirectory = None
+        self.cacheSize = None
+
+    def create_parser(self):
+        """
+        Vytvoří parser s definovanými argumenty příkazové řádky.
+
+        Návratová hodnota:
+            - argparse.ArgumentParser: Parser argumentů skriptu `parse.py`.
+        """
+        import argparse
+
+        parser = argparse.ArgumentParser(
             formatter_class = argparse.RawTextHelpFormatter,
             add_help = False,
             allow_abbrev = False,
-            usage = "python3.11 %(prog)s [-h | --help]",
+            usage = "python3.11 %(prog)s [-h | --help | [--input FILE] [--ast-backend {object,flat}] [--fused]\n"
+                    "                         [--max-errors N] | [--input FILE] --check-syntax [--max-errors N]\n"
+                    "                         | --batch PATH [PATH ...] [--output-dir DIR] [--jobs N]]\n"
+                    "                         [--cache DIR [--cache-size BYTES]] | --serve SOCKET]",
             description = "This filter-type script (written in Python 3.11) reads SOL25 source code \n"
                           "from the standard input (STDIN), checks the lexical, syntactic, and static \n"
                           "semantic correctness of the code, and prints the XML representation of the \n"
@@ -72,7 +125,7 @@ class ArgumentParser:
             )
 
         # Přidání argumentu pro nápovědu
-        self.parser.add_argument(
+        parser.add_argument(
             "-h", "--help",
             action = 'store_true',
             help = "Prints the script help to STDOUT (does not read any input) and returns exit code 0. \n"
@@ -80,6 +133,111 @@ class ArgumentParser:
                    "with error 10."
             )
 
+        # Přidání argumentu pro čtení zdrojového kódu ze souboru
+        parser.add_argument(
+            "--input",
+            metavar = "FILE",
+            help = "Reads the SOL25 source code from FILE (memory-mapped) instead of STDIN. \n"
+                   "Cannot be combined with '--batch' or '--serve'."
+            )
+
+        # Přidání argumentu pro volbu reprezentace AST
+        parser.add_argument(
+            "--ast-backend",
+            choices = ("object", "flat"),
+            help = "Selects the in-memory representation of the abstract syntax tree: a tree of \n"
+                   "objects (default) or a flat tree stored in typed arrays, which needs several \n"
+                   "times less memory for very large programs. Both produce identical output. \n"
+                   "Cannot be combined with '--batch' or '--serve'."
+            )
+
+        # Přidání argumentu pro sloučený průchod AST
+        parser.add_argument(
+            "--fused",
+            action = 'store_true',
+            help = "Checks the static semantics and generates the XML output in a single traversal \n"
+                   "of the abstract syntax tree. The output is buffered and discarded on error; \n"
+                   "the output and exit codes are identical to the default two-pass analysis. \n"
+                   "Cannot be combined with '--batch' or '--serve'."
+            )
+
+        # Přidání argumentu pro pouhou kontrolu syntaxe
+        parser.add_argument(
+            "--check-syntax",
+            action = 'store_true',
+            help = "Only checks the lexical and syntactic correctness of the SOL25 source code \n"
+                   "(including keywords and reserved words) without building the abstract syntax \n"
+                   "tree. Prints nothing to STDOUT and returns exit code 0, 21 or 22. \n"
+                   "Can be combined only with '--input'."
+            )
+
+        # Přidání argumentu pro zotavení z chyb
+        parser.add_argument(
+            "--max-errors",
+            type = int,
+            metavar = "N",
+            help = "Recovers from lexical and syntactic errors and reports up to N of them with \n"
+                   "their line and column in a single run (after a syntactic error the input is \n"
+                   "skipped up to the next '.', ']', '}' or 'class' at the same nesting depth and \n"
+                   "parsing resumes in the enclosing block, class or program; after a lexical \n"
+                   "error the unexpected character is skipped). The exit code is that of the \n"
+                   "first error. A syntactically correct program is checked for all semantic \n"
+                   "errors, up to N of them are reported in source order and the exit code is \n"
+                   "that of the first one. Cannot be combined with '--batch', '--cache' or \n"
+                   "'--serve'."
+            )
+
+        # Přidání argumentů pro dávkový režim
+        parser.add_argument(
+            "--batch",
+            nargs = "+",
+            metavar = "PATH",
+            help = "Analyses the given SOL25 source files and directories (searched recursively for \n"
+                   "'*.sol25' and '*.src' files) in a single process instead of reading STDIN. \n"
+                   "A JSON Lines manifest with the exit code of each file is printed to STDOUT and \n"
+                   "the exit code of the first failed file (or 0) is returned."
+            )
+        parser.add_argument(
+            "--output-dir",
+            metavar = "DIR",
+            help = "Writes the XML output of each file in batch mode to DIR instead of embedding \n"
+                   "it in the manifest. Input files that would be written to the same output \n"
+                   "file are rejected (exit code 10). Can be used only together with '--batch'."
+            )
+        parser.add_argument(
+            "--jobs",
+            type = int,
+            metavar = "N",
+            help = "Distributes the files in batch mode among N worker processes (0 uses all \n"
+                   "available CPU cores). Can be used only together with '--batch'."
+            )
+
+        # Přidání argumentů pro mezipaměť výsledků
+        parser.add_argument(
+            "--cache",
+            metavar = "DIR",
+            help = "Stores the results (XML output or error) in the on-disk cache DIR keyed by the \n"
+                   "SHA-256 of the source code and the analyser version and reuses them for identical \n"
+                   "inputs. The cache can be shared by parallel runs."
+            )
+        parser.add_argument(
+            "--cache-size",
+            type = int,
+            metavar = "BYTES",
+            help = "Limits the size of the cache (default 64 MiB); the least recently used results \n"
+                   "are evicted. Can be used only together with '--cache'."
+            )
+
+        # Přidání argumentu pro serverový režim
+        parser.add_argument(
+            "--serve",
+            metavar = "SOCKET",
+            help = "Runs a server which keeps the analyser loaded and analyses SOL25 source code \n"
+                   "received over the Unix domain socket SOCKET until it is terminated (SIGTERM). \n"
+                   "This parameter cannot be combined with any other parameters."
+            )
+        return parser
+
     def parser_result(self) -> bool:
         """
         Zpracovává a vrací výsledky parsování argumentů.
@@ -87,11 +245,57 @@ class ArgumentParser:
         Návratová hodnota:
             - bool: True, pokud se tiskne nápověda (help), jinak False.
         """
+        # Bez argumentů zůstávají výchozí hodnoty a parser se vůbec nevytváří
+        if len(sys.argv) <= 1:
+            return False
+
+        self.parser = self.create_parser()
         args = self.parser.parse_args()
 
-        # argv[0] je název skriptu, argv[1] je první argument
-        if len(argv) > 2:
+        # Nápovědu nelze kombinovat s jinými parametry (argv[0] je název skriptu)
+        if args.help and len(sys.argv) > 2:
+            raise ScriptParameterError()
+
+        # Výstupní adresář a počet procesů lze zadat pouze v dávkovém režimu
+        if (args.output_dir is not None or args.jobs is not None) and args.batch is None:
+            raise ScriptParameterError()
+        if args.jobs is not None and args.jobs < 0:
+            raise ScriptParameterError()
+        self.batchPaths = args.batch
+
+        # Vstupní soubor, reprezentaci AST ani sloučený průchod nelze kombinovat s dávkovým režimem
+        if (args.input is not None or args.ast_backend is not None or args.fused) and args.batch is not None:
+            raise ScriptParameterError()
+        self.inputFile = args.input
+        self.astBackend = args.ast_backend
+        self.fusedPass = args.fused
+
+        # Kontrolu syntaxe lze kombinovat pouze se vstupním souborem
+        if args.check_syntax and (args.ast_backend is not None or args.fused or args.batch is not None or
+                                  args.cache is not None or args.serve is not None):
+            raise ScriptParameterError()
+        self.checkSyntax = args.check_syntax
+
+        # Zotavení z chyb nelze kombinovat s dávkovým režimem ani s mezipamětí
+        if args.max_errors is not None and (args.max_errors < 1 or args.batch is not None or
+                                            args.cache is not None or args.serve is not None):
+            raise ScriptParameterError()
+        self.maxErrors = args.max_errors
+        self.outputDirectory = args.output_dir
+        self.jobs = args.jobs
+
+        # Velikost mezipaměti lze zadat pouze společně s mezipamětí
+        if args.cache_size is not None and (args.cache is None or args.cache_size <= 0):
+            raise ScriptParameterError()
+        self.cacheDirectory = args.cache
+        self.cacheSize = args.cache_size
+
+        # Serverový režim nelze kombinovat s jinými parametry (výstupní adresář, počet
+        # procesů, velikost mezipaměti, kontrola syntaxe a zotavení z chyb už jsou odmítnuty výše)
+        if args.serve is not None and (args.input is not None or args.ast_backend is not None or
+                                       args.fused or args.batch is not None or args.cache is not None):
             raise ScriptParameterError()
+        self.serverSocket = args.serve
 
         if args.help:
             self.parser.print_help()
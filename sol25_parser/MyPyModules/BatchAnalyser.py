@@ -0,0 +1,491 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           BatchAnalyser.py                                           *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje dávkový režim analyzátoru kódu       *
+*                   v SOL25 (`parse.py --batch`). V jednom procesu se          *
+*                   analyzuje libovolný počet souborů, přičemž se sdílí jedna  *
+*                   instance parseru, jedna sada symbolů vestavěných tříd a    *
+*                   jeden generátor XML. Výsledky jednotlivých souborů se      *
+*                   zapisují do manifestu ve formátu JSON Lines. Parametrem    *
+*                   `--jobs` lze soubory rozdělit mezi více procesů, výsledky  *
+*                   lze sdílet přes mezipaměť na disku (`--cache`).            *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import json  # dumps()
+import os    # path, walk(), makedirs(), sched_getaffinity(), cpu_count()
+import sys   # stdout, stderr
+import time  # perf_counter()
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+# Import vlastních modulů
+from MyPyModules.CustomErrors import (CustomError, ExitCode, InputFileError,
+                                      InternalError, OutputFileError,
+                                      ScriptParameterError)
+from MyPyModules.LarkParser import LarkParser
+from MyPyModules.LiteralSpans import find_literal_spans
+from MyPyModules.ResultCache import ResultCache
+from MyPyModules.SemanticAnalyser import SemanticAnalyser
+from MyPyModules.XMLGenerator import XMLGenerator
+
+# Přípony souborů se zdrojovým kódem hledaných v adresářích a přípona XML výstupu
+SOURCE_FILE_EXTENSIONS = (".sol25", ".src")
+XML_FILE_EXTENSION = ".xml"
+
+# Počet dávek (chunků) připadajících na jeden pracovní proces kvůli vyvažování
+# zátěže a minimální velikost jedné dávky v bajtech zdrojového kódu
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_BYTES = 64 * 1024
+
+
+class BatchResult(NamedTuple):
+    """
+    Výsledek analýzy jednoho souboru v dávkovém režimu.
+
+    Atributy:
+        - path (str):         Cesta k analyzovanému souboru.
+        - exitCode (int):     Návratový kód, který by pro soubor vrátil 'parse.py'.
+        - XMLCode (str):      XML reprezentace programu (pouze při úspěchu).
+        - errorMessage (str): Zpráva popisující chybu (pouze při chybě).
+        - errorDetail (str):  Detailní popis chyby (pouze při chybě).
+    """
+    path: str
+    exitCode: int
+    XMLCode: str | None = None
+    errorMessage: str | None = None
+    errorDetail: str | None = None
+
+
+def result_from_exception(path: str, exception: Exception) -> BatchResult:
+    """
+    Převede výjimku vzniklou při analýze souboru na výsledek analýzy. Obecné
+    výjimky se stejně jako v `handle_exception()` převádí na interní chybu.
+
+    Parametry:
+        - path (str): Cesta k analyzovanému souboru.
+        - exception (Exception): Výjimka vzniklá při analýze.
+
+    Návratová hodnota:
+        - BatchResult: Výsledek analýzy s chybovým návratovým kódem.
+    """
+    if isinstance(exception, CustomError):
+        return BatchResult(path, exception.errorCode, None,
+                           exception.errorMessage, exception.errorDetail)
+    return BatchResult(path, InternalError.errorCode, None,
+                       InternalError.errorMessage, str(exception))
+
+
+def collect_source_files(paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    Sestaví seznam analyzovaných souborů. Adresáře se prochází rekurzivně
+    (v seřazeném pořadí) a vybírají se z nich soubory s příponou ze
+    `SOURCE_FILE_EXTENSIONS`, soubory zadané přímo se analyzují vždy.
+
+    Parametry:
+        - paths (List[str]): Cesty k souborům a adresářům.
+
+    Návratová hodnota:
+        - List[Tuple[str, str]]: Dvojice (cesta k souboru, relativní název
+                                 výstupního XML souboru).
+
+    Výjimky:
+        - InputFileError: Pokud zadaná cesta neexistuje.
+    """
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, subdirectories, files in os.walk(path):
+                subdirectories.sort()
+                for name in sorted(files):
+                    if name.endswith(SOURCE_FILE_EXTENSIONS):
+                        sourcePath = os.path.join(directory, name)
+                        outputName = os.path.relpath(sourcePath, path)
+                        sources.append((sourcePath, os.path.splitext(outputName)[0] + XML_FILE_EXTENSION))
+        elif os.path.isfile(path):
+            outputName = os.path.basename(path)
+            sources.append((path, os.path.splitext(outputName)[0] + XML_FILE_EXTENSION))
+        else:
+            raise InputFileError(f"Input path '{path}' doesn't exist.")
+    return sources
+
+
+def check_output_names(sources: List[Tuple[str, str]]):
+    """
+    Ověří, že se XML výstupy různých souborů nezapíší do stejného souboru
+    ve výstupním adresáři (např. stejně pojmenované soubory z různých
+    adresářů nebo 'foo.src' vedle 'foo.sol25'). Tentýž soubor zadaný
+    vícekrát kolizi nezpůsobí.
+
+    Parametry:
+        - sources (List[Tuple[str, str]]): Dvojice (cesta k souboru, relativní
+                                           název výstupního XML souboru).
+
+    Výjimky:
+        - ScriptParameterError: Pokud dva různé soubory mají stejný výstup.
+    """
+    sourcesByOutput = {}
+    for sourcePath, outputName in sources:
+        key = os.path.normcase(os.path.normpath(outputName))
+        previousPath = sourcesByOutput.setdefault(key, sourcePath)
+        if os.path.realpath(previousPath) != os.path.realpath(sourcePath):
+            raise ScriptParameterError(f"Input files '{previousPath}' and '{sourcePath}' "
+                                       f"would both be written to '{outputName}'.")
+
+
+class BatchAnalyser:
+    """
+    Třída `BatchAnalyser` provádí analýzu více souborů se zdrojovým kódem
+    v SOL25 v rámci jednoho procesu.
+
+    Atributy:
+        - _parser (LarkParser):      Sdílená instance parseru.
+        - _generator (XMLGenerator): Sdílená instance generátoru XML výstupu.
+        - _cache (ResultCache|None): Mezipaměť výsledků (volitelná).
+
+    Metody:
+        - analyse_code(SOL25Code:str) -> str: Analyzuje zdrojový kód a vrátí XML.
+        - analyse_cached_code(SOL25Code:str) -> str: Analyzuje kód s využitím mezipaměti.
+        - analyse_file(path:str) -> BatchResult: Analyzuje jeden soubor.
+        - analyse_files(paths:List[str]) -> Iterator[BatchResult]: Analyzuje soubory v daném pořadí.
+        - run(paths:List[str], outputDirectory:str, manifest) -> int: Provede celou dávku.
+    """
+
+    def __init__(self, cache: ResultCache = None):
+        """
+        Inicializuje sdílený parser a generátor XML (symboly vestavěných tříd
+        sdílí všechny analýzy, viz `Symtable.BUILTIN_CLASS_TABLE`).
+
+        Parametry:
+            - cache (ResultCache): Mezipaměť výsledků (výchozí None).
+        """
+        self._parser = LarkParser()
+        self._generator = XMLGenerator()
+        self._cache = cache
+
+    def analyse_code(self, SOL25Code: str) -> str:
+        """
+        Provede lexikální, syntaktickou a sémantickou analýzu zdrojového kódu
+        a vrátí XML výstup ve stejné podobě, jakou 'parse.py' tiskne na STDOUT.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - str: XML reprezentace programu.
+
+        Výjimky:
+            - InputFileError: Pokud je zdrojový kód prázdný.
+            - CustomError: Chyby lexikální, syntaktické a sémantické analýzy.
+        """
+        if not SOL25Code:
+            raise InputFileError()
+        # Předběžný průchod kódu sdílí lexer s generátorem XML (první komentář)
+        literalSpans = find_literal_spans(SOL25Code)
+        ASTRoot = self._parser.parse_code(SOL25Code, literalSpans)
+        SemanticAnalyser().analyse_semantic(ASTRoot)
+        return self._generator.generate_XML(ASTRoot, SOL25Code, literalSpans) + "\n"
+
+    def analyse_cached_code(self, SOL25Code: str) -> str:
+        """
+        Analyzuje zdrojový kód stejně jako `analyse_code()`, ale výsledek
+        (XML výstup nebo chybu) nejprve hledá v mezipaměti a po analýze ho
+        do ní uloží.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - str: XML reprezentace programu.
+
+        Výjimky:
+            - CustomError: Chyby analýzy (případně uložené v mezipaměti).
+        """
+        if self._cache is None or not SOL25Code:
+            return self.analyse_code(SOL25Code)
+        key = self._cache.get_key(SOL25Code)
+        XMLCode = self._cache.lookup(key)
+        if XMLCode is None:
+            try:
+                XMLCode = self.analyse_code(SOL25Code)
+            except Exception as e:
+                self._cache.store_error(key, e)
+                raise
+            self._cache.store_result(key, XMLCode)
+        return XMLCode
+
+    def analyse_file(self, path: str) -> BatchResult:
+        """
+        Načte a analyzuje jeden soubor. Chyby analýzy se nešíří dál, ale
+        zaznamenají se do výsledku.
+
+        Parametry:
+            - path (str): Cesta k analyzovanému souboru.
+
+        Návratová hodnota:
+            - BatchResult: Výsledek analýzy souboru.
+        """
+        try:
+            try:
+                # Konce řádků se stejně jako v režimu jednoho souboru nepřevádí
+                with open(path, encoding="utf-8", newline="") as sourceFile:
+                    SOL25Code = sourceFile.read()
+            except (OSError, UnicodeDecodeError) as e:
+                raise InputFileError(str(e))
+            return BatchResult(path, ExitCode.SUCCESS.value, self.analyse_cached_code(SOL25Code))
+        except Exception as e:
+            return result_from_exception(path, e)
+
+    def analyse_files(self, paths: List[str]) -> Iterator[BatchResult]:
+        """
+        Postupně analyzuje soubory v zadaném pořadí.
+
+        Parametry:
+            - paths (List[str]): Cesty k analyzovaným souborům.
+
+        Návratová hodnota:
+            - Iterator[BatchResult]: Výsledky v pořadí souborů.
+        """
+        for path in paths:
+            yield self.analyse_file(path)
+
+    def run(self, paths: List[str], outputDirectory: str = None, manifest = None) -> int:
+        """
+        Provede dávkovou analýzu souborů a adresářů (viz `run_batch()`).
+
+        Parametry:
+            - paths (List[str]): Cesty k analyzovaným souborům a adresářům.
+            - outputDirectory (str): Adresář pro XML výstupy (výchozí None).
+            - manifest (TextIO): Soubor pro zápis manifestu (výchozí STDOUT).
+
+        Návratová hodnota:
+            - int: Návratový kód dávky (viz `run_batch()`).
+        """
+        return run_batch(self.analyse_files, paths, outputDirectory, manifest)
+
+
+def run_batch(analyseFiles: Callable[[List[str]], Iterator[BatchResult]], paths: List[str],
+              outputDirectory: str = None, manifest = None) -> int:
+    """
+    Provede dávkovou analýzu souborů a adresářů. Pro každý soubor se do
+    manifestu zapíše jeden řádek JSON s cestou, návratovým kódem a buď
+    XML výstupem (klíč `xml`), nebo cestou k XML souboru ve výstupním
+    adresáři (klíč `output`). Neúspěšné analýzy obsahují klíče `message`
+    a `detail`. Propustnost se vypíše na STDERR.
+
+    Parametry:
+        - analyseFiles (Callable): Funkce, která pro seznam cest k souborům
+                                   vrací výsledky analýzy v pořadí souborů
+                                   (např. `BatchAnalyser.analyse_files`).
+        - paths (List[str]): Cesty k analyzovaným souborům a adresářům.
+        - outputDirectory (str): Adresář pro XML výstupy (výchozí None).
+        - manifest (TextIO): Soubor pro zápis manifestu (výchozí STDOUT).
+
+    Návratová hodnota:
+        - int: Návratový kód prvního neúspěšně analyzovaného souboru,
+               nebo 0, pokud byly všechny soubory analyzovány úspěšně.
+
+    Výjimky:
+        - InputFileError: Pokud zadaná cesta neexistuje.
+        - ScriptParameterError: Pokud by se výstupy dvou souborů zapsaly do
+                                stejného souboru ve výstupním adresáři.
+        - OutputFileError: Pokud nelze vytvořit výstupní adresář.
+    """
+    if manifest is None:
+        manifest = sys.stdout
+
+    sources = collect_source_files(paths)
+    if outputDirectory is not None:
+        check_output_names(sources)
+        try:
+            os.makedirs(outputDirectory, exist_ok = True)
+        except OSError as e:
+            raise OutputFileError(str(e))
+
+    batchExitCode = ExitCode.SUCCESS.value
+    start = time.perf_counter()
+    results = analyseFiles([sourcePath for sourcePath, _ in sources])
+    for (sourcePath, outputName), result in zip(sources, results):
+        record = {"path": result.path}
+        if result.XMLCode is not None and outputDirectory is not None:
+            outputPath = os.path.join(outputDirectory, outputName)
+            try:
+                os.makedirs(os.path.dirname(outputPath), exist_ok = True)
+                with open(outputPath, "w", encoding = "utf-8") as outputFile:
+                    outputFile.write(result.XMLCode)
+                record["output"] = outputPath
+            except OSError as e:
+                result = result_from_exception(sourcePath, OutputFileError(str(e)))
+        elif result.XMLCode is not None:
+            record["xml"] = result.XMLCode
+
+        record["exitCode"] = result.exitCode
+        if result.exitCode != ExitCode.SUCCESS.value:
+            record["message"] = result.errorMessage
+            record["detail"] = result.errorDetail
+            if batchExitCode == ExitCode.SUCCESS.value:
+                batchExitCode = result.exitCode
+        manifest.write(json.dumps(record, ensure_ascii = False) + "\n")
+
+    elapsed = time.perf_counter() - start
+    rate = len(sources) / elapsed if elapsed > 0 else 0.0
+    print(f"Analysed {len(sources)} files in {elapsed:.3f} s ({rate:.1f} files/s).",
+          file = sys.stderr)
+    return batchExitCode
+
+
+################################################################################
+#                                                                              #
+#                   PARALELNÍ DÁVKOVÁ ANALÝZA VÍCE PROCESY                     #
+#                                                                              #
+################################################################################
+
+# Instance `BatchAnalyser` pracovního procesu (vytváří se jednou na proces)
+_workerAnalyser = None
+
+def get_available_cpu_count() -> int:
+    """
+    Vrátí počet procesorových jader dostupných aktuálnímu procesu.
+
+    Návratová hodnota:
+        - int: Počet dostupných jader (alespoň 1).
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def init_worker(cache: ResultCache = None):
+    """
+    Inicializuje pracovní proces - vytvoří jeho parser a generátor XML,
+    které se sdílí mezi všemi dávkami procesu.
+
+    Parametry:
+        - cache (ResultCache): Mezipaměť výsledků (výchozí None).
+    """
+    global _workerAnalyser
+    _workerAnalyser = BatchAnalyser(cache)
+
+def analyse_chunk(paths: List[str]) -> List[BatchResult]:
+    """
+    Analyzuje jednu dávku souborů v pracovním procesu.
+
+    Parametry:
+        - paths (List[str]): Cesty k souborům dávky.
+
+    Návratová hodnota:
+        - List[BatchResult]: Výsledky v pořadí souborů dávky.
+    """
+    return [_workerAnalyser.analyse_file(path) for path in paths]
+
+def split_into_chunks(paths: List[str], jobs: int) -> List[List[str]]:
+    """
+    Rozdělí soubory do souvislých dávek podle jejich velikosti. Cílová
+    velikost dávky je taková, aby na každý proces připadlo přibližně
+    `CHUNKS_PER_WORKER` dávek, ale nejméně `MIN_CHUNK_BYTES` bajtů, takže
+    velké soubory tvoří menší dávky a malé soubory se sdružují do větších.
+
+    Parametry:
+        - paths (List[str]): Cesty k souborům v požadovaném pořadí.
+        - jobs (int): Počet pracovních procesů.
+
+    Návratová hodnota:
+        - List[List[str]]: Dávky souborů ve stejném pořadí jako `paths`.
+    """
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(0)  # chybu souboru nahlásí až pracovní proces
+    targetSize = max(sum(sizes) // (jobs * CHUNKS_PER_WORKER), MIN_CHUNK_BYTES)
+
+    chunks = []
+    chunk = []
+    chunkSize = 0
+    for path, size in zip(paths, sizes):
+        # Soubor, který by dávku přeplnil, začíná novou dávku.
+        if chunk and chunkSize + size > targetSize:
+            chunks.append(chunk)
+            chunk = []
+            chunkSize = 0
+        chunk.append(path)
+        chunkSize += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class ParallelBatchAnalyser:
+    """
+    Třída `ParallelBatchAnalyser` rozděluje dávkovou analýzu mezi více
+    pracovních procesů (`ProcessPoolExecutor`). Každý proces si vytvoří
+    vlastní `BatchAnalyser` pouze jednou (viz `init_worker()`), výsledky se
+    vrací ve stejném pořadí jako při sériové analýze.
+
+    Atributy:
+        - _jobs (int): Počet pracovních procesů.
+        - _cache (ResultCache|None): Mezipaměť výsledků sdílená pracovními procesy.
+
+    Metody:
+        - analyse_files(paths:List[str]) -> Iterator[BatchResult]: Analyzuje soubory paralelně.
+        - run(paths:List[str], outputDirectory:str, manifest) -> int: Provede celou dávku.
+    """
+
+    def __init__(self, jobs: int = 0, cache: ResultCache = None):
+        """
+        Inicializuje paralelní analyzátor. Parser se v hlavním procesu
+        nevytváří, analýzu provádí výhradně pracovní procesy.
+
+        Parametry:
+            - jobs (int): Počet pracovních procesů (0 = všechna dostupná jádra).
+            - cache (ResultCache): Mezipaměť výsledků (výchozí None).
+        """
+        self._jobs = jobs if jobs > 0 else get_available_cpu_count()
+        self._cache = cache
+
+    def analyse_files(self, paths: List[str]) -> Iterator[BatchResult]:
+        """
+        Analyzuje soubory v pracovních procesech. Výsledky se vrací průběžně
+        v pořadí souborů (nezávisle na pořadí dokončení dávek).
+
+        Parametry:
+            - paths (List[str]): Cesty k analyzovaným souborům.
+
+        Návratová hodnota:
+            - Iterator[BatchResult]: Výsledky v pořadí souborů.
+        """
+        if not paths:
+            return
+        chunks = split_into_chunks(paths, self._jobs)
+        workerCount = min(self._jobs, len(chunks))
+        with ProcessPoolExecutor(max_workers = workerCount, initializer = init_worker,
+                                 initargs = (self._cache,)) as executor:
+            for results in executor.map(analyse_chunk, chunks):
+                yield from results
+
+    def run(self, paths: List[str], outputDirectory: str = None, manifest = None) -> int:
+        """
+        Provede dávkovou analýzu souborů a adresářů v pracovních procesech
+        (viz `run_batch()`).
+
+        Parametry:
+            - paths (List[str]): Cesty k analyzovaným souborům a adresářům.
+            - outputDirectory (str): Adresář pro XML výstupy (výchozí None).
+            - manifest (TextIO): Soubor pro zápis manifestu (výchozí STDOUT).
+
+        Návratová hodnota:
+            - int: Návratový kód dávky (viz `run_batch()`).
+        """
+        return run_batch(self.analyse_files, paths, outputDirectory, manifest)
+
+### konec souboru 'BatchAnalyser.py' ###
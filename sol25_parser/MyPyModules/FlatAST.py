@@ -0,0 +1,352 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           FlatAST.py                                                 *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje plochou reprezentaci abstraktního    *
+*                   syntaktického stromu (AST) pro velmi velké programy. Uzly  *
+*                   jsou uloženy v paralelních typovaných polích (druh uzlu,   *
+*                   posun potomků, index do tabulky řetězců a index hodnoty),  *
+*                   místo objektů se vytváří jen krátkodobé pohledy, které     *
+*                   jsou podtřídami uzlů `ASTNodes`. Sémantický analyzátor     *
+*                   i generátor XML tak procházejí oba druhy AST stejně.       *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+from array import array
+
+# Import vlastních modulů
+from MyPyModules.AbstractSyntaxTree import ASTNodes
+
+# Druhy uzlů plochého AST
+PROGRAM_KIND = 0
+CLASS_KIND = 1
+METHOD_KIND = 2
+BLOCK_KIND = 3
+IDENTIFIER_KIND = 4
+LITERAL_KIND = 5
+ASSIGN_KIND = 6
+EXPRESSION_KIND = 7
+
+# Hodnota indexu, který u daného druhu uzlu nemá význam
+NO_INDEX = -1
+
+
+class FlatAST:
+    """
+    Třída `FlatAST` ukládá uzly AST do paralelních typovaných polí. Uzel je
+    určen svým indexem, potomci každého uzlu leží v poli `children` souvisle
+    od `childOffsets[index]` do `childOffsets[index + 1]` (uzly se vkládají
+    až po svých potomcích, tj. v post-order pořadí redukcí parseru).
+
+    Význam indexů podle druhu uzlu:
+        - ProgramNode:    potomci = třídy
+        - ClassNode:      string = identifikátor, value = identifikátor rodiče,
+                          potomci = metody
+        - MethodNode:     string = selektor, potomci = [blok]
+        - BlockNode:      value = počet parametrů, potomci = parametry
+                          (indexy řetězců) a poté příkazy
+        - IdentifierNode: string = identifikátor
+        - LiteralNode:    string = typ literálu, value = index hodnoty
+        - AssignNode:     potomci = [proměnná, výraz]
+        - ExpressionNode: string = selektor, potomci = [příjemce, argumenty...]
+
+    Atributy:
+        - kinds (array): Druh každého uzlu.
+        - childOffsets (array): Začátek potomků každého uzlu v poli `children`.
+        - strings (array): Index do tabulky řetězců (`stringTable`).
+        - values (array): Druhý index (rodič, počet parametrů, hodnota literálu).
+        - children (array): Indexy potomků (u bloku také indexy parametrů).
+        - stringTable (list): Tabulka řetězců (identifikátory, selektory, typy).
+        - literalValues (list): Tabulka hodnot literálů.
+
+    Metody:
+        - add_node(kind:int, string:str, value:int, children:list) -> int: Vloží uzel.
+        - intern_string(string:str) -> int: Vrátí index řetězce v tabulce řetězců.
+        - intern_literal(value) -> int: Vrátí index hodnoty literálu.
+        - get_children(index:int) -> array: Vrátí indexy potomků uzlu.
+        - view(index:int) -> ASTNodes.ASTAbstractNode: Vrátí pohled na uzel.
+        - finish(): Uvolní pomocné slovníky pro sestavování stromu.
+    """
+
+    def __init__(self):
+        """
+        Inicializuje prázdný plochý AST.
+        """
+        self.kinds = array("B")
+        self.childOffsets = array("i", [0])
+        self.strings = array("i")
+        self.values = array("i")
+        self.children = array("i")
+        self.stringTable = []
+        self.literalValues = []
+        self._stringIndices = {}
+        self._literalIndices = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def add_node(self, kind: int, string: str = None, value: int = NO_INDEX, children = ()) -> int:
+        """
+        Vloží uzel za všechny dosud vložené uzly.
+
+        Parametry:
+            - kind (int): Druh uzlu.
+            - string (str): Řetězec uzlu (identifikátor, selektor, typ), nebo None.
+            - value (int): Druhý index uzlu (viz popis třídy).
+            - children (Iterable[int]): Indexy potomků uzlu.
+
+        Návratová hodnota:
+            - int: Index vloženého uzlu.
+        """
+        self.kinds.append(kind)
+        self.strings.append(NO_INDEX if string is None else self.intern_string(string))
+        self.values.append(value)
+        self.children.extend(children)
+        self.childOffsets.append(len(self.children))
+        return len(self.kinds) - 1
+
+    def intern_string(self, string: str) -> int:
+        """
+        Vrátí index řetězce v tabulce řetězců (řetězec případně vloží).
+
+        Parametry:
+            - string (str): Řetězec.
+
+        Návratová hodnota:
+            - int: Index řetězce.
+        """
+        index = self._stringIndices.get(string)
+        if index is None:
+            index = self._stringIndices[string] = len(self.stringTable)
+            self.stringTable.append(string)
+        return index
+
+    def intern_literal(self, value) -> int:
+        """
+        Vrátí index hodnoty literálu v tabulce hodnot (hodnotu případně vloží).
+
+        Parametry:
+            - value (int | str): Hodnota literálu.
+
+        Návratová hodnota:
+            - int: Index hodnoty.
+        """
+        key = (type(value), value)
+        index = self._literalIndices.get(key)
+        if index is None:
+            index = self._literalIndices[key] = len(self.literalValues)
+            self.literalValues.append(value)
+        return index
+
+    def finish(self):
+        """
+        Ukončí sestavování stromu a uvolní slovníky pro vyhledávání indexů
+        řetězců a hodnot literálů (po sestavení už nejsou potřeba).
+        """
+        self._stringIndices = None
+        self._literalIndices = None
+
+    def get_children(self, index: int) -> array:
+        """
+        Vrátí indexy potomků uzlu.
+
+        Parametry:
+            - index (int): Index uzlu.
+
+        Návratová hodnota:
+            - array: Indexy potomků uzlu.
+        """
+        return self.children[self.childOffsets[index]:self.childOffsets[index + 1]]
+
+    def view(self, index: int) -> ASTNodes.ASTAbstractNode:
+        """
+        Vrátí pohled na uzel (podtřídu odpovídajícího uzlu `ASTNodes`).
+
+        Parametry:
+            - index (int): Index uzlu.
+
+        Návratová hodnota:
+            - ASTNodes.ASTAbstractNode: Pohled na uzel.
+        """
+        return VIEW_CLASSES[self.kinds[index]](self, index)
+
+
+################################################################################
+#                                                                              #
+#                           POHLEDY NA UZLY PLOCHÉHO AST                       #
+#                                                                              #
+################################################################################
+
+class FlatNodeView:
+    """
+    Společný předek pohledů na uzly plochého AST. Pohled drží pouze odkaz na
+    strom a index uzlu, atributy uzlu čte z polí stromu až při přístupu
+    (vlastnosti pohledu zakrývají sloty původní třídy uzlu).
+
+    Atributy:
+        - tree (FlatAST): Plochý AST, do kterého uzel patří.
+        - index (int): Index uzlu.
+    """
+    __slots__ = ()
+
+    def __init__(self, tree: FlatAST, index: int):
+        self.tree = tree
+        self.index = index
+
+    def _get_string(self) -> str:
+        return self.tree.stringTable[self.tree.strings[self.index]]
+
+    def _get_child(self, position: int) -> ASTNodes.ASTAbstractNode:
+        tree = self.tree
+        return tree.view(tree.children[tree.childOffsets[self.index] + position])
+
+    def _get_children(self, start: int = 0) -> list:
+        tree = self.tree
+        return [tree.view(index) for index in tree.children[tree.childOffsets[self.index] + start:
+                                                              tree.childOffsets[self.index + 1]]]
+
+
+class ProgramView(FlatNodeView, ASTNodes.ProgramNode):
+    __slots__ = ("tree", "index")
+
+    classNodeList = property(lambda self: self._get_children())
+
+
+class ClassView(FlatNodeView, ASTNodes.ClassNode):
+    __slots__ = ("tree", "index")
+
+    identifier = property(FlatNodeView._get_string)
+    perentIdentifier = property(lambda self: self.tree.stringTable[self.tree.values[self.index]])
+    methodNodeList = property(lambda self: self._get_children())
+
+
+class MethodView(FlatNodeView, ASTNodes.MethodNode):
+    __slots__ = ("tree", "index")
+
+    selector = property(FlatNodeView._get_string)
+    blockNode = property(lambda self: self._get_child(0))
+
+
+class BlockView(FlatNodeView, ASTNodes.BlockNode):
+    __slots__ = ("tree", "index")
+
+    @property
+    def parameterNodeList(self) -> list:
+        tree = self.tree
+        start = tree.childOffsets[self.index]
+        return [tree.stringTable[index] for index in tree.children[start:start + tree.values[self.index]]]
+
+    statementNodeList = property(lambda self: self._get_children(self.tree.values[self.index]))
+
+
+class IdentifierView(FlatNodeView, ASTNodes.IdentifierNode):
+    __slots__ = ("tree", "index")
+
+    identifier = property(FlatNodeView._get_string)
+
+
+class LiteralView(FlatNodeView, ASTNodes.LiteralNode):
+    __slots__ = ("tree", "index")
+
+    literalType = property(FlatNodeView._get_string)
+    literalValue = property(lambda self: self.tree.literalValues[self.tree.values[self.index]])
+
+
+class AssignView(FlatNodeView, ASTNodes.AssignNode):
+    __slots__ = ("tree", "index")
+
+    identifierNode = property(lambda self: self._get_child(0))
+    exprNode = property(lambda self: self._get_child(1))
+
+
+class ExpressionView(FlatNodeView, ASTNodes.ExpressionNode):
+    __slots__ = ("tree", "index")
+
+    selector = property(FlatNodeView._get_string)
+    receiver = property(lambda self: self._get_child(0))
+    argNodeList = property(lambda self: self._get_children(1))
+
+
+# Třída pohledu podle druhu uzlu
+VIEW_CLASSES = (ProgramView, ClassView, MethodView, BlockView, IdentifierView,
+                LiteralView, AssignView, ExpressionView)
+
+
+################################################################################
+#                                                                              #
+#                       SESTAVENÍ PLOCHÉHO AST PARSEREM                        #
+#                                                                              #
+################################################################################
+
+class FlatASTBuilder:
+    """
+    Továrna uzlů pro `LarkTransformer` (viz `LarkTransformer.nodeFactory`).
+    Metody mají stejné názvy a parametry jako konstruktory uzlů `ASTNodes`,
+    uzel ale vkládají do plochého AST a vrací pohled na něj. Pohledy existují
+    jen na zásobníku parseru, dokud je nespotřebuje redukce rodiče.
+
+    Atributy:
+        - tree (FlatAST): Právě sestavovaný plochý AST.
+
+    Metody:
+        - reset(): Začne sestavovat nový plochý AST.
+        - ProgramNode(), ClassNode(), MethodNode(), BlockNode(), IdentifierNode(),
+          LiteralNode(), AssignNode(), ExpressionNode(): Vloží uzel daného druhu.
+    """
+
+    def __init__(self):
+        """
+        Inicializuje továrnu s prázdným plochým AST.
+        """
+        self.tree = FlatAST()
+
+    def reset(self):
+        """
+        Ukončí sestavování předchozího plochého AST (strom zůstává platný pro
+        pohledy, které na něj odkazují) a začne sestavovat nový.
+        """
+        self.tree.finish()
+        self.tree = FlatAST()
+
+    def _add(self, kind: int, string: str = None, value: int = NO_INDEX, children = ()):
+        tree = self.tree
+        return tree.view(tree.add_node(kind, string, value, children))
+
+    def ProgramNode(self, classes: list) -> ProgramView:
+        return self._add(PROGRAM_KIND, children = [node.index for node in classes])
+
+    def ClassNode(self, identifier: str, parentIdentifier: str, methods: list) -> ClassView:
+        return self._add(CLASS_KIND, identifier, self.tree.intern_string(parentIdentifier),
+                         [node.index for node in methods])
+
+    def MethodNode(self, selector: str, blockNode: BlockView) -> MethodView:
+        return self._add(METHOD_KIND, selector, children = (blockNode.index,))
+
+    def BlockNode(self, parameters: list, statements: list) -> BlockView:
+        children = [self.tree.intern_string(parameter) for parameter in parameters]
+        children.extend(node.index for node in statements)
+        return self._add(BLOCK_KIND, value = len(parameters), children = children)
+
+    def IdentifierNode(self, identifier: str) -> IdentifierView:
+        return self._add(IDENTIFIER_KIND, identifier)
+
+    def LiteralNode(self, literalType: str, literalValue) -> LiteralView:
+        return self._add(LITERAL_KIND, literalType, self.tree.intern_literal(literalValue))
+
+    def AssignNode(self, identifier: IdentifierView, expression) -> AssignView:
+        return self._add(ASSIGN_KIND, children = (identifier.index, expression.index))
+
+    def ExpressionNode(self, receiver, selector: str, args: list) -> ExpressionView:
+        children = [receiver.index]
+        children.extend(node.index for node in args)
+        return self._add(EXPRESSION_KIND, selector, children = children)
+
+### konec souboru 'FlatAST.py' ###
@@ -0,0 +1,354 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           FusedAnalyser.py                                           *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje sloučený průchod AST (`parse.py      *
+*                   --fused`), který během jediného průchodu kontroluje        *
+*                   sémantiku a generuje XML do vyrovnávací paměti. Při        *
+*                   sémantické chybě se rozpracovaný výstup zahodí, výstup     *
+*                   i návratové kódy jsou tak stejné jako při dvou průchodech  *
+*                   (`SemanticAnalyser` a `XMLGenerator`).                     *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import io  # StringIO()
+
+# Import vlastních modulů
+from MyPyModules.AbstractSyntaxTree import ASTNodes
+from MyPyModules.CustomErrors import InternalError
+from MyPyModules.LiteralSpans import LiteralSpans
+from MyPyModules.SemanticAnalyser import (
+    NODE_KINDS, BLOCK_KIND, EXPRESSION_KIND, IDENTIFIER_KIND, LITERAL_KIND,
+    SemanticAnalyser, get_node_kind)
+from MyPyModules.XMLGenerator import XML_INDENT, XMLGenerator, write_start_tag
+
+# Odsazení elementů <class>, <method> a <block> těla metody
+CLASS_INDENT = XML_INDENT
+METHOD_INDENT = CLASS_INDENT + XML_INDENT
+METHOD_BLOCK_INDENT = METHOD_INDENT + XML_INDENT
+
+# Položka zásobníku pro výstup z lokálního rámce bloku
+EXIT_SCOPE_ITEM = ("scope", None, None, 0, True)
+
+
+#######################################################################
+# Sémantické kontroly probíhají ve stejném pořadí jako v
+# `SemanticAnalyser` (třídy, metody a tělo metody do hloubky), liší se
+# jen tím, že každý navštívený uzel se zároveň zapíše do XML. Podstromy,
+# které sémantická analýza neprochází (argumenty zprávy, jejímž
+# příjemcem je blok nebo jiná zpráva), se pouze zapíší. XML výstup
+# se vrátí (resp. zapíše) až po úspěšném dokončení všech kontrol.
+#######################################################################
+class FusedAnalyser(SemanticAnalyser):
+    """
+    Třída `FusedAnalyser` provádí sémantickou analýzu AST a zároveň
+    generuje XML výstup během jediného průchodu stromem.
+
+    Atributy:
+        - _generator (XMLGenerator): Generátor elementů listových uzlů a hlavičky.
+        - _write (callable | None): Metoda `write()` vyrovnávací paměti průchodu.
+        - _pendingError (InternalError | None): Chyba generování XML, která se
+                                                vyvolá až po sémantických kontrolách.
+
+    Metody:
+        - generate_XML(ASTRoot, SOL25Code, literalSpans) -> str: Zkontroluje program a vrátí XML.
+        - write_XML(ASTRoot, SOL25Code, sink, literalSpans): Zkontroluje program a zapíše XML.
+        - visit_class_node: Návštěvník uzlu třídy (zapíše element <class>).
+        - visit_method_node: Návštěvník uzlu metody (zapíše element <method>).
+        - visit_block_node: Návštěvník uzlu bloku těla metody.
+        - _visit_and_write_subtree: Iterativně zkontroluje a zapíše podstrom.
+    """
+
+    def __init__(self, maxErrors: int | None = None):
+        """
+        Inicializuje sémantický analyzátor a generátor XML.
+
+        Parametry:
+            - maxErrors (int | None): Sbírací režim sémantické analýzy
+                                      (viz `SemanticAnalyser`).
+        """
+        super().__init__(maxErrors)
+        self._generator = XMLGenerator()
+        self._write = None
+        self._pendingError = None
+
+    def generate_XML(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str,
+                     literalSpans:LiteralSpans | None = None) -> str:
+        """
+        Zkontroluje sémantiku programu a vygeneruje jeho XML reprezentaci
+        během jediného průchodu AST.
+
+        Parametry:
+            - ASTRoot (ASTNodes.ProgramNode): Kořenový uzel AST.
+            - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu (viz
+                                                  `XMLGenerator.generate_XML()`).
+
+        Návratová hodnota:
+            - str: Hezky formátovaná XML reprezentace programu v SOL25.
+
+        Výjimky:
+            - CustomError: Sémantická chyba (stejná jako při samostatné analýze).
+        """
+        buffer = io.StringIO()
+        self._write = buffer.write
+        self._pendingError = None
+        try:
+            hasClasses = self._generator.generate_program_start_tag(ASTRoot, SOL25Code, self._write,
+                                                                   literalSpans)
+            self.analyse_semantic(ASTRoot)
+            if self._pendingError is not None:
+                raise self._pendingError
+            if hasClasses:
+                self._write("</program>\n")
+        finally:
+            self._write = None
+        return buffer.getvalue()
+
+    def write_XML(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, sink,
+                  literalSpans:LiteralSpans | None = None):
+        """
+        Zkontroluje sémantiku programu a zapíše jeho XML reprezentaci do
+        souboru. Při chybě se do souboru nezapíše nic.
+
+        Parametry:
+            - ASTRoot (ASTNodes.ProgramNode): Kořenový uzel AST.
+            - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+            - sink (TextIO): Textový soubor (objekt s metodou `write()`).
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
+        """
+        sink.write(self.generate_XML(ASTRoot, SOL25Code, literalSpans))
+
+    def visit_class_node(self, node:ASTNodes.ClassNode):
+        """
+        Návštěvník uzlu třídy, zapíše element <class> s elementy metod.
+
+        Parametry:
+            - node (ASTNodes.ClassNode): Uzel třídy.
+        """
+        attributes = {
+            "name": node.identifier,
+            "parent": node.perentIdentifier
+        }
+        hasMethods = write_start_tag(self._write, CLASS_INDENT, "class", attributes, node.methodNodeList)
+        super().visit_class_node(node)
+        if hasMethods:
+            self._write(f"{CLASS_INDENT}</class>\n")
+
+    def visit_method_node(self, node:ASTNodes.MethodNode):
+        """
+        Návštěvník uzlu metody, zapíše element <method> s tělem metody.
+
+        Parametry:
+            - node (ASTNodes.MethodNode): Uzel metody.
+        """
+        write_start_tag(self._write, METHOD_INDENT, "method", {"selector": node.selector}, True)
+        super().visit_method_node(node)
+        self._write(f"{METHOD_INDENT}</method>\n")
+
+    def visit_block_node(self, node:ASTNodes.BlockNode):
+        """
+        Návštěvník uzlu bloku těla metody (vnořené bloky zpracovává
+        `_visit_and_write_subtree`).
+
+        Parametry:
+            - node (ASTNodes.BlockNode): Uzel bloku.
+        """
+        self._visit_and_write_subtree(("block", node, METHOD_BLOCK_INDENT, 0, True))
+
+    def _visit_and_write_subtree(self, rootItem:tuple):
+        """
+        Projde podstrom pomocí explicitního zásobníku, zkontroluje jeho
+        sémantiku a zapíše jeho XML. Položkou zásobníku je text k zápisu
+        (uzavírací tag), nebo pětice (akce, uzel, odsazení, pořadí, kontrola):
+            - "block", "assign", "expr", "send": zápis elementu a kontrola uzlu,
+            - "selector": kontrola selektoru zprávy (místo odsazení nese
+                          identifikátor příjemce),
+            - "scope": výstup z lokálního rámce bloku.
+        Příznak kontroly je nepravdivý u podstromů, které `SemanticAnalyser`
+        neprochází. Listové uzly (identifikátory a literály) se zkontrolují
+        a zapíší rovnou, R-hodnota přiřazení a obsah elementu <expr> se
+        zpracují bez uložení na zásobník.
+
+        Parametry:
+            - rootItem (tuple): Položka pro kořen procházeného podstromu.
+        """
+        write = self._write
+        generateVariableTag = self._generator.generate_variable_tag
+        generateLiteralTag = self._generator.generate_literal_tag
+        scopeManager = self._symtable.scopeManager
+        getNodeKind = NODE_KINDS.get
+        visitIdentifier = self.visit_identifier_node
+        visitLiteral = self.visit_literal_node
+        stack, pop, push = self._stack
+        base = len(stack)
+        push(rootItem)
+
+        while len(stack) > base:
+            item = pop()
+            if type(item) is str:
+                write(item)  # uzavírací tag
+                continue
+
+            tag, node, indent, order, check = item
+
+            if tag == "assign":
+                if check:
+                    self._check_assign_target(node)
+                write_start_tag(write, indent, "assign", {"order": str(order)}, True)
+                push(f"{indent}</assign>\n")
+                indent += XML_INDENT
+                generateVariableTag(node.identifierNode, write, indent)
+
+                # R-hodnotu zpracujeme hned (bez zásobníku)
+                tag = "expr"
+                node = node.exprNode
+
+            if tag == "expr":
+                # Element <expr> a v něm podelement podle druhu výrazu
+                write(f"{indent}<expr>\n")
+                kind = getNodeKind(type(node))
+                if kind is None:
+                    kind = get_node_kind(type(node))
+                if kind == IDENTIFIER_KIND:
+                    if check:
+                        visitIdentifier(node)
+                    generateVariableTag(node, write, indent + XML_INDENT)
+                    write(f"{indent}</expr>\n")
+                    continue
+                if kind == LITERAL_KIND:
+                    if check:
+                        visitLiteral(node)
+                    generateLiteralTag(node, write, indent + XML_INDENT)
+                    write(f"{indent}</expr>\n")
+                    continue
+                if kind != EXPRESSION_KIND and kind != BLOCK_KIND:
+                    if check:
+                        node.visit_by(self)  # jiný typ uzlu
+                    # Dvouprůchodový generátor by selhal až po sémantické analýze
+                    if self._pendingError is None:
+                        self._pendingError = InternalError(
+                            f"Uknown expression node type '{node}' was detected while "
+                            f"generating XML output ."
+                        )
+                    continue
+                push(f"{indent}</expr>\n")
+                tag = "send" if kind == EXPRESSION_KIND else "block"
+                indent += XML_INDENT
+
+            if tag == "send":
+                write_start_tag(write, indent, "send", {"selector": node.selector}, True)
+                push(f"{indent}</send>\n")
+                childIndent = indent + XML_INDENT
+                argumentIndent = childIndent + XML_INDENT
+
+                # Listový příjemce se zkontroluje hned, u bloku nebo zprávy
+                # se kontroluje jen příjemce (ne argumenty ani selektor).
+                receiver = node.receiver
+                receiverKind = getNodeKind(type(receiver))
+                if receiverKind is None:
+                    receiverKind = get_node_kind(type(receiver))
+                argumentCheck = check
+                receiverId = None
+                if receiverKind == LITERAL_KIND:
+                    if check:
+                        visitLiteral(receiver)
+                    receiverId = receiver.literalType
+                elif receiverKind == IDENTIFIER_KIND:
+                    if check:
+                        visitIdentifier(receiver)
+                    receiverId = receiver.identifier
+                elif receiverKind == BLOCK_KIND or receiverKind == EXPRESSION_KIND:
+                    argumentCheck = False
+                else:
+                    receiverId = str(receiver)
+
+                # Listového příjemce a argumenty (identifikátory a literály) na
+                # začátku seznamu zapíšeme rovnou, ostatní se uloží na zásobník.
+                argNodeList = node.argNodeList
+                leafCount = 0
+                if receiverKind == LITERAL_KIND or receiverKind == IDENTIFIER_KIND:
+                    write(f"{childIndent}<expr>\n")
+                    if receiverKind == IDENTIFIER_KIND:
+                        generateVariableTag(receiver, write, argumentIndent)
+                    else:
+                        generateLiteralTag(receiver, write, argumentIndent)
+                    write(f"{childIndent}</expr>\n")
+                    for arg in argNodeList:
+                        argKind = getNodeKind(type(arg))
+                        if argKind is None:
+                            argKind = get_node_kind(type(arg))
+                        if argKind != IDENTIFIER_KIND and argKind != LITERAL_KIND:
+                            break
+                        leafCount += 1
+                        write(f'{childIndent}<arg order="{leafCount}">\n{argumentIndent}<expr>\n')
+                        if argKind == IDENTIFIER_KIND:
+                            if argumentCheck:
+                                visitIdentifier(arg)
+                            generateVariableTag(arg, write, argumentIndent + XML_INDENT)
+                        else:
+                            if argumentCheck:
+                                visitLiteral(arg)
+                            generateLiteralTag(arg, write, argumentIndent + XML_INDENT)
+                        write(f"{argumentIndent}</expr>\n{childIndent}</arg>\n")
+                    if leafCount == len(argNodeList):
+                        if argumentCheck and node.selector:
+                            self._check_selector(node, receiverId)
+                        continue
+
+                # Selektor se kontroluje až po průchodu všemi argumenty.
+                if argumentCheck and node.selector:
+                    push(("selector", node, receiverId, 0, True))
+                for argumentOrder in range(len(argNodeList), leafCount, -1):
+                    push(f"{childIndent}</arg>\n")
+                    push(("expr", argNodeList[argumentOrder - 1], argumentIndent, 0, argumentCheck))
+                    push(f'{childIndent}<arg order="{argumentOrder}">\n')
+                if receiverKind != LITERAL_KIND and receiverKind != IDENTIFIER_KIND:
+                    push(("expr", receiver, childIndent, 0, check and not argumentCheck))
+
+            elif tag == "block":
+                if check:
+                    self._enter_block_scope(node)
+
+                arity = len(node.parameterNodeList) if node.parameterNodeList else 0
+                hasChildren = node.parameterNodeList or node.statementNodeList
+                if not write_start_tag(write, indent, "block", {"arity": str(arity)}, hasChildren):
+                    if check:
+                        scopeManager.exit_current_scope()
+                    continue
+
+                childIndent = indent + XML_INDENT
+                parameterOrder = 1
+                for param in node.parameterNodeList:
+                    attributes = {"order": str(parameterOrder),
+                                  "name": param
+                                  }
+                    write_start_tag(write, childIndent, "parameter", attributes, False)
+                    parameterOrder += 1
+
+                # Příkazy bloku, po nich výstup z rámce a uzavírací tag
+                push(f"{indent}</block>\n")
+                if check:
+                    push(EXIT_SCOPE_ITEM)
+                statementNodeList = node.statementNodeList
+                for statementOrder in range(len(statementNodeList), 0, -1):
+                    push(("assign", statementNodeList[statementOrder - 1], childIndent, statementOrder, check))
+
+            elif tag == "selector":
+                self._check_selector(node, indent)
+
+            elif tag == "scope":
+                scopeManager.exit_current_scope()
+
+            else:
+                raise InternalError(f"Unknown action '{tag}' on the traversal stack.")
+
+### konec souboru 'FusedAnalyser.py' ###
@@ -0,0 +1,392 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           IncrementalAnalyser.py                                     *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje inkrementální analýzu opakovaně      *
+*                   upravovaného zdrojového kódu v SOL25 (např. z editoru).    *
+*                   Znovu se parsují pouze změněné definice tříd, nezměněné    *
+*                   uzly `ClassNode` se používají opakovaně a těla tříd se     *
+*                   kontrolují jen tehdy, pokud se změnilo něco, na čem jejich *
+*                   sémantická kontrola závisí. XML elementy nezměněných tříd  *
+*                   se generují jen jednou. Výsledek je vždy shodný s úplnou   *
+*                   analýzou.                                                  *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import io         # StringIO()
+import re         # compile()
+import threading  # Lock()
+from typing import Callable, Dict, FrozenSet, List, Tuple
+
+# Import vlastních modulů
+from MyPyModules.AbstractSyntaxTree import ASTNodes
+from MyPyModules.CustomErrors import InputFileError
+from MyPyModules.LarkParser import LarkParser
+from MyPyModules.LiteralSpans import LiteralSpans
+from MyPyModules.SemanticAnalyser import SemanticAnalyser
+from MyPyModules.Symtable import BUILTIN_CLASS_TABLE
+from MyPyModules.XMLGenerator import XMLGenerator
+
+# Znaky mimo bílé znaky lexikálního analyzátoru (viz `%import common.WS`),
+# znaky, které mění stav rozdělování kódu, a zbytek řetězcového literálu
+NON_WHITESPACE_REGEX = re.compile(r"[^ \t\f\r\n]")
+SPLIT_SPECIAL_REGEX = re.compile(r"[\"'{}]")
+STRING_REST_REGEX = re.compile(r"(?:[^'\\]|\\.)*'", re.DOTALL)
+
+
+def split_class_regions(SOL25Code: str) -> List[str] | None:
+    """
+    Rozdělí zdrojový kód na úseky jednotlivých definic tříd. Úsek začíná
+    prvním znakem mimo bílé znaky a komentáře na nejvyšší úrovni a končí
+    složenou závorkou, která uzavře definici třídy. Komentáře a řetězcové
+    literály se přeskakují, aby se v nich závorky nepočítaly.
+
+    Parametry:
+        - SOL25Code (str): Zdrojový kód v SOL25.
+
+    Návratová hodnota:
+        - List[str] | None: Texty úseků v pořadí výskytu, nebo None, pokud
+                            kód nelze spolehlivě rozdělit (neuzavřený
+                            komentář, řetězec nebo třída, přebytečná '}').
+    """
+    regions = []
+    regionStart = None
+    depth = 0
+    position = 0
+    while True:
+        if regionStart is None:
+            match = NON_WHITESPACE_REGEX.search(SOL25Code, position)
+            if match is None:
+                return regions
+            position = match.start()
+            if SOL25Code[position] != '"':
+                regionStart = position
+        else:
+            # Uvnitř třídy stačí přeskočit na nejbližší zajímavý znak
+            match = SPLIT_SPECIAL_REGEX.search(SOL25Code, position)
+            if match is None:
+                return None  # kód končí rozepsanou třídou
+            position = match.start()
+
+        character = SOL25Code[position]
+        if character == '"':
+            # Komentář (může obsahovat apostrofy i závorky)
+            end = SOL25Code.find('"', position + 1)
+            if end < 0:
+                return None
+            position = end + 1
+            continue
+        if character == "'":
+            # Řetězcový literál (escape sekvence začínají zpětným lomítkem)
+            match = STRING_REST_REGEX.match(SOL25Code, position + 1)
+            if match is None:
+                return None
+            position = match.end()
+            continue
+        if character == "{":
+            depth += 1
+        elif character == "}":
+            depth -= 1
+            if depth < 0:
+                return None
+            if depth == 0:
+                regions.append(SOL25Code[regionStart:position + 1])
+                regionStart = None
+        position += 1
+
+
+def collect_class_references(classNode: ASTNodes.ClassNode) -> FrozenSet[str]:
+    """
+    Sesbírá identifikátory tříd, na které se odkazuje tělo třídy (třídy
+    použité v těle metod a třídy literálů, kterým se zasílají zprávy).
+
+    Parametry:
+        - classNode (ASTNodes.ClassNode): Uzel třídy.
+
+    Návratová hodnota:
+        - FrozenSet[str]: Identifikátory odkazovaných tříd.
+    """
+    references = set()
+    stack = [methodNode.blockNode for methodNode in classNode.methodNodeList]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ASTNodes.BlockNode):
+            stack.extend(node.statementNodeList)
+        elif isinstance(node, ASTNodes.AssignNode):
+            stack.append(node.exprNode)
+        elif isinstance(node, ASTNodes.ExpressionNode):
+            stack.append(node.receiver)
+            stack.extend(node.argNodeList)
+        elif isinstance(node, ASTNodes.IdentifierNode):
+            if node.identifier[0].isupper():
+                references.add(node.identifier)
+        elif isinstance(node, ASTNodes.LiteralNode):
+            references.add(node.literalType)
+    return frozenset(references)
+
+
+class IncrementalSemanticAnalyser(SemanticAnalyser):
+    """
+    Sémantický analyzátor, který u tříd s nezměněnými závislostmi
+    nekontroluje těla metod a pouze vloží jejich metody do tabulky symbolů
+    (ve stejném pořadí jako úplná analýza). Globální kontroly (definice
+    tříd, třída 'Main', cyklická dědičnost) se provádí vždy.
+
+    Atributy:
+        - _reusableClasses (set): Uzly tříd, jejichž kontrolu lze převzít.
+        - passedClasses (set): Uzly tříd, které byly v tomto běhu úplně
+                               zkontrolovány bez chyby.
+    """
+
+    def __init__(self, reusableClasses: set):
+        """
+        Inicializuje analyzátor.
+
+        Parametry:
+            - reusableClasses (set): Uzly tříd, jejichž kontrolu lze převzít.
+        """
+        super().__init__()
+        self._reusableClasses = reusableClasses
+        self.passedClasses = set()
+
+    def visit_class_node(self, node: ASTNodes.ClassNode):
+        """
+        Návštěvník uzlu třídy.
+
+        Parametry:
+            - node (ASTNodes.ClassNode): Uzel třídy.
+        """
+        if node in self._reusableClasses:
+            for methodNode in node.methodNodeList:
+                self._symtable.classManager.insert_method_symbol(
+                    node.identifier, methodNode.selector, methodNode.blockNode
+                    )
+            return
+        super().visit_class_node(node)
+        self.passedClasses.add(node)
+
+
+class IncrementalXMLGenerator(XMLGenerator):
+    """
+    Generátor XML, který si pamatuje vygenerované elementy <class> podle
+    uzlu třídy, takže se pro nezměněné třídy pouze zkopírují.
+
+    Atributy:
+        - _classFragments (dict): Elementy <class> podle uzlu třídy.
+    """
+
+    def __init__(self):
+        """
+        Inicializuje prázdnou mezipaměť elementů tříd.
+        """
+        self._classFragments: Dict[ASTNodes.ClassNode, str] = {}
+
+    def write_XML(self, ASTRoot: ASTNodes.ProgramNode, SOL25Code: str, sink,
+                  literalSpans: LiteralSpans | None = None):
+        """
+        Zapíše XML reprezentaci programu a z mezipaměti odstraní elementy
+        tříd, které už v programu nejsou.
+        """
+        super().write_XML(ASTRoot, SOL25Code, sink, literalSpans)
+        self._classFragments = {classNode: self._classFragments[classNode]
+                                for classNode in ASTRoot.classNodeList
+                                if classNode in self._classFragments}
+
+    def generate_class_tag(self, classNode: ASTNodes.ClassNode, write, indent: str):
+        """
+        Zapíše XML element <class> (viz `XMLGenerator.generate_class_tag()`).
+        """
+        fragment = self._classFragments.get(classNode)
+        if fragment is None:
+            buffer = io.StringIO()
+            super().generate_class_tag(classNode, buffer.write, indent)
+            fragment = self._classFragments[classNode] = buffer.getvalue()
+        write(fragment)
+
+
+class IncrementalAnalyser:
+    """
+    Třída `IncrementalAnalyser` analyzuje postupně se měnící verze jednoho
+    zdrojového kódu v SOL25 a vrací stejné výsledky jako úplná analýza
+    (`BatchAnalyser.analyse_code()`).
+
+    Z předchozích běhů si pamatuje uzly tříd podle textu jejich definice
+    a uzly tříd, jejichž kontrola prošla, spolu s klíčem jejich závislostí.
+    Kontrola těla třídy C závisí na hierarchii tříd, na které se C odkazuje
+    (včetně C samotné a všech předků), a na metodách těch z nich, které jsou
+    v kódu definovány před C (metody se do tabulky symbolů vkládají v pořadí
+    tříd). Pokud se klíč nezměnil, výsledek kontroly se převezme.
+
+    Atributy:
+        - _parseCode (Callable): Funkce parsující kód na `ProgramNode`.
+        - _generator (IncrementalXMLGenerator): Generátor XML výstupu.
+        - _lock (threading.Lock): Zámek chránící stav mezi běhy.
+        - _regionCache (dict): Uzly tříd podle textu definice (z minulého běhu).
+        - _references (dict): Odkazované třídy podle uzlu třídy.
+        - _passedClasses (dict): Klíče závislostí zkontrolovaných uzlů tříd.
+        - parsedClassCount (int): Počet tříd parsovaných v posledním běhu.
+        - checkedClassCount (int): Počet tříd zkontrolovaných v posledním běhu.
+
+    Metody:
+        - analyse_code(SOL25Code:str) -> str: Analyzuje novou verzi kódu a vrátí XML.
+    """
+
+    def __init__(self, parseCode: Callable[[str], ASTNodes.ProgramNode] = None):
+        """
+        Inicializuje inkrementální analyzátor.
+
+        Parametry:
+            - parseCode (Callable): Funkce parsující kód (výchozí je
+                                    `LarkParser().parse_code`).
+        """
+        self._parseCode = parseCode if parseCode is not None else LarkParser().parse_code
+        self._generator = IncrementalXMLGenerator()
+        self._lock = threading.Lock()
+        self._regionCache: Dict[str, ASTNodes.ClassNode] = {}
+        self._references: Dict[ASTNodes.ClassNode, FrozenSet[str]] = {}
+        self._passedClasses: Dict[ASTNodes.ClassNode, Tuple] = {}
+        self.parsedClassCount = 0
+        self.checkedClassCount = 0
+
+    def analyse_code(self, SOL25Code: str) -> str:
+        """
+        Analyzuje novou verzi zdrojového kódu a vrátí XML výstup ve stejné
+        podobě, jakou 'parse.py' tiskne na STDOUT.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - str: XML reprezentace programu.
+
+        Výjimky:
+            - InputFileError: Pokud je zdrojový kód prázdný.
+            - CustomError: Chyby lexikální, syntaktické a sémantické analýzy.
+        """
+        if not SOL25Code:
+            raise InputFileError()
+        with self._lock:
+            classNodes = self._parse_classes(SOL25Code)
+            for classNode in classNodes:
+                if classNode not in self._references:
+                    self._references[classNode] = collect_class_references(classNode)
+            self._references = {classNode: self._references[classNode] for classNode in classNodes}
+
+            # Kontrola převezme výsledky tříd, jejichž závislosti se nezměnily.
+            dependencyKeys = self._get_dependency_keys(classNodes)
+            reusableClasses = {classNode for classNode, key in zip(classNodes, dependencyKeys)
+                               if self._passedClasses.get(classNode) == key}
+
+            ASTRoot = ASTNodes.ProgramNode(classNodes)
+            analyser = IncrementalSemanticAnalyser(reusableClasses)
+            try:
+                analyser.analyse_semantic(ASTRoot)
+            finally:
+                # Třídy, ke kterým se kontrola po chybě nedostala, si ponechají
+                # klíč z dřívějšího úspěšného běhu.
+                passedClasses = {}
+                for classNode, key in zip(classNodes, dependencyKeys):
+                    if classNode in reusableClasses or classNode in analyser.passedClasses:
+                        passedClasses[classNode] = key
+                    elif classNode in self._passedClasses:
+                        passedClasses[classNode] = self._passedClasses[classNode]
+                self._passedClasses = passedClasses
+                self.checkedClassCount = len(analyser.passedClasses)
+            return self._generator.generate_XML(ASTRoot, SOL25Code) + "\n"
+
+    def _parse_classes(self, SOL25Code: str) -> List[ASTNodes.ClassNode]:
+        """
+        Získá uzly tříd nové verze kódu. Nezměněné definice tříd se převezmou
+        z minulého běhu, změněné se parsují samostatně. Pokud kód nelze
+        rozdělit na definice tříd nebo některá z nich neprojde parserem,
+        parsuje se celý kód, aby chyba odpovídala úplné analýze.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - List[ASTNodes.ClassNode]: Uzly tříd v pořadí definic.
+        """
+        regions = split_class_regions(SOL25Code)
+        if regions is not None:
+            regionCache = {}
+            classNodes = []
+            parsedClassCount = 0
+            for region in regions:
+                classNode = regionCache.get(region) or self._regionCache.get(region)
+                if classNode is None:
+                    try:
+                        regionClassNodes = self._parseCode(region).classNodeList
+                    except Exception:
+                        break
+                    if len(regionClassNodes) != 1:
+                        break
+                    classNode = regionClassNodes[0]
+                    parsedClassCount += 1
+                regionCache[region] = classNode
+                classNodes.append(classNode)
+            else:
+                self._regionCache = regionCache
+                self.parsedClassCount = parsedClassCount
+                return classNodes
+
+        # Úplné parsování (chybu nebo výsledek nelze přiřadit k úsekům)
+        classNodes = list(self._parseCode(SOL25Code).classNodeList)
+        self._regionCache = {}
+        self.parsedClassCount = len(classNodes)
+        return classNodes
+
+    def _get_dependency_keys(self, classNodes: List[ASTNodes.ClassNode]) -> List[Tuple]:
+        """
+        Sestaví klíče závislostí sémantické kontroly jednotlivých tříd. Klíč
+        třídy C obsahuje pro každou třídu z uzávěru (C, odkazované třídy
+        a všichni jejich předci) její existenci, rodiče a uzel třídy, pokud
+        je definována nejpozději na pozici C (jinak její metody při kontrole
+        C ještě nejsou v tabulce symbolů).
+
+        Parametry:
+            - classNodes (List[ASTNodes.ClassNode]): Uzly tříd v pořadí definic.
+
+        Návratová hodnota:
+            - List[Tuple]: Klíče závislostí v pořadí tříd.
+        """
+        # Model tabulky symbolů po `set_class_as_defined()` všech tříd
+        parents = {identifier: classSymbol.parentIdentifier
+                   for identifier, classSymbol in BUILTIN_CLASS_TABLE.items()}
+        positions = {}
+        for classNode in classNodes:
+            parents.setdefault(classNode.perentIdentifier, None)
+        for position, classNode in enumerate(classNodes):
+            if classNode.identifier not in BUILTIN_CLASS_TABLE:
+                parents[classNode.identifier] = classNode.perentIdentifier
+                positions.setdefault(classNode.identifier, position)
+
+        dependencyKeys = []
+        for position, classNode in enumerate(classNodes):
+            closure = set()
+            stack = [classNode.identifier, *self._references[classNode]]
+            while stack:
+                identifier = stack.pop()
+                if identifier in closure:
+                    continue
+                closure.add(identifier)
+                if parents.get(identifier):
+                    stack.append(parents[identifier])
+
+            key = []
+            for identifier in sorted(closure):
+                definedAt = positions.get(identifier)
+                methodsNode = classNodes[definedAt] if definedAt is not None and definedAt <= position else None
+                key.append((identifier, identifier in parents, parents.get(identifier), methodsNode))
+            dependencyKeys.append(tuple(key))
+        return dependencyKeys
+
+### konec souboru 'IncrementalAnalyser.py' ###
@@ -7,24 +7,42 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            18.02.2025                                                 *
-* Poslední změna:   23.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento soubor obsahuje implementaci parseru pro jazyk       *
 *                   SOL25 pomocí knihovny Lark. Parser zahrnuje definici       *
 *                   gramatiky, transformace parse stromu na abstraktní         *
-*                   syntaktický strom (AST) a zpracování chyb.                 *
+*                   syntaktický strom (AST) a zpracování chyb. Sestavené LALR  *
+*                   tabulky se ukládají do mezipaměti na disku, aby se při     *
+*                   každém spuštění nemusely znovu počítat. Pokud je sestaven  *
+*                   samostatný parser (viz `build_standalone_parser()`),       *
+*                   knihovna 'lark' se vůbec neimportuje. AST se standardně    *
+*                   staví přímo během redukcí LALR parseru bez mezilehlého     *
+*                   parse stromu. Identifikátory a selektory se internují,     *
+*                   takže se opakované názvy v AST sdílí jedním řetězcem.      *
+*                   Místo kontextového lexeru knihovny 'lark' se standardně    *
+*                   používá ručně psaný lexer SOL25 (viz 'SOL25Lexer.py').     *
+*                   Pro pouhou kontrolu syntaxe se AST vůbec nestaví (viz      *
+*                   `SyntaxChecker`). Při zotavení z chyb parser po chybě      *
+*                   pokračuje a sebere více chyb (viz `ErrorCollector`).       *
 ********************************************************************************
 """
 
 # Import modulů standardní knihovny
+import hashlib         # sha256()
+import importlib.util  # spec_from_file_location(), module_from_spec()
+import os              # path, environ, makedirs(), replace(), remove()
+import pickle          # dump(), load()
+import re              # compile()
+import sys             # version_info, modules
+from sys import intern # intern() (bez hledání atributu v transformeru, benchmark jej nahrazuje)
+import tempfile        # mkstemp()
 from typing import Any, List
 
-# Import modulů instalovaných pomocí 'pip'
-from lark import Lark, Transformer, UnexpectedCharacters, UnexpectedToken, visitors
-
 # Import vlastních modulů
 from MyPyModules.AbstractSyntaxTree import ASTNodes
-from MyPyModules.CustomErrors import InternalError, LexicalError, SyntacticError
+from MyPyModules.CustomErrors import CustomError, InternalError, LexicalError, SyntacticError
+from MyPyModules.LiteralSpans import LiteralSpans, find_literal_spans
 
 ################################################################################
 #                                                                              #
@@ -192,6 +210,198 @@ SOL25_GRAMMAR = r"""
     %ignore WS
 """
 
+################################################################################
+#                                                                              #
+#           VOLBA BĚHOVÉHO PROSTŘEDÍ PARSERU (SAMOSTATNÝ MODUL / LARK)         #
+#                                                                              #
+################################################################################
+
+# Výchozí umístění samostatného (vygenerovaného) parseru gramatiky SOL25
+STANDALONE_MODULE_NAME = "SOL25StandaloneParser"
+STANDALONE_MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      f"{STANDALONE_MODULE_NAME}.py")
+
+# Proměnná prostředí s cestou k samostatnému parseru (prázdná hodnota jej vypne)
+STANDALONE_PATH_ENVIRONMENT = "SOL25_STANDALONE_PATH"
+
+
+def get_grammar_sha256() -> str:
+    """
+    Vypočítá SHA-256 otisk samotného textu gramatiky SOL25. Otisk se ukládá do
+    samostatného parseru, aby se po změně gramatiky nepoužil zastaralý modul.
+
+    Návratová hodnota:
+        - str: Hexadecimální SHA-256 otisk gramatiky.
+    """
+    return hashlib.sha256(SOL25_GRAMMAR.encode("utf-8")).hexdigest()
+
+
+def load_standalone_module():
+    """
+    Načte samostatný parser vygenerovaný funkcí `build_standalone_parser()`.
+    Modul se použije pouze tehdy, pokud existuje a byl vygenerován pro
+    aktuální znění gramatiky.
+
+    Návratová hodnota:
+        - module | None: Načtený modul, nebo `None`, pokud jej nelze použít.
+    """
+    modulePath = os.environ.get(STANDALONE_PATH_ENVIRONMENT, STANDALONE_MODULE_PATH)
+    if not modulePath or not os.path.isfile(modulePath):
+        return None
+
+    # Modul načítáme přímo ze souboru, aby mohl ležet i mimo balíček 'MyPyModules'
+    specification = importlib.util.spec_from_file_location(STANDALONE_MODULE_NAME, modulePath)
+    module = importlib.util.module_from_spec(specification)
+    sys.modules[STANDALONE_MODULE_NAME] = module
+    try:
+        specification.loader.exec_module(module)
+    except Exception:
+        del sys.modules[STANDALONE_MODULE_NAME]
+        return None
+
+    if getattr(module, "SOL25_GRAMMAR_SHA256", None) != get_grammar_sha256():
+        del sys.modules[STANDALONE_MODULE_NAME]
+        return None
+    return module
+
+
+# Samostatný parser, pokud je k dispozici (jinak `None`)
+StandaloneParser = load_standalone_module()
+
+# Třídy parseru a výjimek pocházejí buď ze samostatného modulu, nebo z knihovny 'lark'
+if StandaloneParser is not None:
+    Lark                 = StandaloneParser.Lark
+    Lexer                = StandaloneParser.Lexer
+    Token                = StandaloneParser.Token
+    Transformer          = StandaloneParser.Transformer
+    UnexpectedCharacters = StandaloneParser.UnexpectedCharacters
+    UnexpectedToken      = StandaloneParser.UnexpectedToken
+    VisitError           = StandaloneParser.VisitError
+    LARK_VERSION         = StandaloneParser.__version__
+else:
+    # Import modulů instalovaných pomocí 'pip'
+    from lark import Lark, Token, Transformer, UnexpectedCharacters, UnexpectedToken
+    from lark import __version__ as LARK_VERSION
+    from lark.exceptions import VisitError
+    from lark.lexer import Lexer
+
+
+def build_standalone_parser(outputPath: str = STANDALONE_MODULE_PATH):
+    """
+    Vygeneruje samostatný LALR parser gramatiky SOL25 v čistém Pythonu (pomocí
+    nástroje `lark.tools.standalone`). Na konec modulu se připíše otisk
+    gramatiky, podle kterého se při načítání pozná zastaralý modul. Zápis
+    probíhá atomicky přes dočasný soubor. Vyžaduje nainstalovanou knihovnu 'lark'.
+
+    Parametry:
+        - outputPath (str): Cesta k vygenerovanému modulu.
+    """
+    from lark import Lark as DynamicLark
+    from lark.tools.standalone import gen_standalone
+
+    larkParser = DynamicLark(SOL25_GRAMMAR, parser = "lalr", start = "start")
+    descriptor, temporaryPath = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(outputPath)),
+                                                 prefix = STANDALONE_MODULE_NAME, suffix = ".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding = "utf-8") as moduleFile:
+            gen_standalone(larkParser, out = moduleFile)
+            moduleFile.write(f"\nSOL25_GRAMMAR_SHA256 = {get_grammar_sha256()!r}\n")
+        os.replace(temporaryPath, outputPath)
+    except BaseException:
+        os.remove(temporaryPath)
+        raise
+
+################################################################################
+#                                                                              #
+#               MEZIPAMĚŤ PŘEDKOMPILOVANÝCH LALR TABULEK NA DISKU              #
+#                                                                              #
+################################################################################
+
+# Výchozí adresář mezipaměti (stejně jako '.pyc' soubory leží v '__pycache__')
+LALR_CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+
+# Prefix názvu souboru s uloženým parserem
+LALR_CACHE_PREFIX = "sol25_lalr_"
+
+
+def get_grammar_fingerprint() -> str:
+    """
+    Vypočítá otisk gramatiky SOL25, podle kterého se pozná, zda lze soubor
+    v mezipaměti použít. Otisk zahrnuje text gramatiky, verzi knihovny 'lark'
+    a verzi interpretu (formát 'pickle' se mezi verzemi může lišit).
+
+    Návratová hodnota:
+        - str: Hexadecimální SHA-256 otisk gramatiky.
+    """
+    fingerprint = SOL25_GRAMMAR + LARK_VERSION + str(sys.version_info[:2])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def get_cache_path(cacheDirectory: str) -> str:
+    """
+    Vrátí cestu k souboru mezipaměti pro aktuální otisk gramatiky. Změna
+    gramatiky nebo verze 'lark' tak automaticky vede k jinému souboru.
+
+    Parametry:
+        - cacheDirectory (str): Adresář mezipaměti.
+
+    Návratová hodnota:
+        - str: Cesta k souboru s uloženým parserem.
+    """
+    return os.path.join(cacheDirectory, f"{LALR_CACHE_PREFIX}{get_grammar_fingerprint()}.pickle")
+
+
+def load_cached_parser(cachePath: str, transformer: Any = None) -> Lark | None:
+    """
+    Načte předkompilovaný parser z mezipaměti. Poškozený nebo nekompatibilní
+    soubor se považuje za chybějící, takže volající parser sestaví znovu.
+
+    Parametry:
+        - cachePath (str): Cesta k souboru mezipaměti.
+        - transformer (Any): Transformer volaný během redukcí (volitelný).
+
+    Návratová hodnota:
+        - Lark | None: Načtený parser, nebo `None`, pokud jej nelze použít.
+    """
+    try:
+        with open(cachePath, "rb") as cacheFile:
+            # Hlavička souboru obsahuje otisk gramatiky, pro kterou byl parser sestaven
+            fingerprint = cacheFile.readline().rstrip(b"\n").decode("ascii")
+            if fingerprint != get_grammar_fingerprint():
+                return None
+            parserData = pickle.load(cacheFile)
+            return Lark._load_from_dict(parserData["data"], parserData["memo"], transformer = transformer)
+    # Soubor neexistuje, nelze jej přečíst nebo je poškozený => sestavíme znovu
+    except Exception:
+        return None
+
+
+def save_cached_parser(larkParser: Lark, cachePath: str):
+    """
+    Atomicky uloží sestavený parser do mezipaměti. Parser se nejprve zapíše do
+    dočasného souboru ve stejném adresáři a poté se přejmenuje pomocí
+    `os.replace()`, takže souběžně běžící procesy vidí buď celý starý, nebo
+    celý nový soubor. Chyba zápisu není fatální, parser pouze nebude uložen.
+
+    Parametry:
+        - larkParser (Lark): Sestavený LALR parser.
+        - cachePath (str): Cesta k souboru mezipaměti.
+    """
+    temporaryPath = None
+    try:
+        cacheDirectory = os.path.dirname(cachePath)
+        os.makedirs(cacheDirectory, exist_ok = True)
+        descriptor, temporaryPath = tempfile.mkstemp(dir = cacheDirectory, prefix = LALR_CACHE_PREFIX,
+                                                     suffix = ".tmp")
+        with os.fdopen(descriptor, "wb") as cacheFile:
+            cacheFile.write(get_grammar_fingerprint().encode("ascii") + b"\n")
+            larkParser.save(cacheFile, exclude_options = ("transformer",))
+        os.replace(temporaryPath, cachePath)
+    except (OSError, pickle.PicklingError):
+        # Mezipaměť je pouze optimalizace, dočasný soubor po sobě uklidíme
+        if temporaryPath is not None and os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+
 
 # Zdroj (manuál): lark-parser.readthedocs.io/en/stable/visitors.html
 # noinspection PyMethodMayBeStatic
@@ -231,7 +441,9 @@ class LarkTransformer(Transformer):
         - token (Token): Token reprezentující daný terminál.
 
     Návratové hodnoty:
-        - str: Řetězce reprezentující indetifikátory či selektory.
+        - str: Řetězce reprezentující indetifikátory či selektory. Jsou
+               internované (`sys.intern()`), takže stejné názvy sdílí jeden
+               objekt a vyhledávání v tabulce symbolů končí porovnáním identity.
         - ASTNodes: Specifický uzel AST, který je výsledkem daného pravidla.
         - list: Seznamy řetězců (str) nebo specifických uzlů AST (ASTNodes).
     """
@@ -241,9 +453,12 @@ class LarkTransformer(Transformer):
         Inicializuje instanci třídy `LarkTransformer`.
 
         Atributy:
+            - nodeFactory (Any): Továrna uzlů AST (výchozí `ASTNodes`, pro plochý
+                                 AST `FlatAST.FlatASTBuilder`).
             - _keywords (set): Množina klíčových slov jazyka SOL25.
         """
         super().__init__()
+        self.nodeFactory = ASTNodes
         self._keywords = {"class", "self", "super", "nil", "true", "false"}
         self._reserved_words = {"Main", "run"}
 
@@ -256,7 +471,7 @@ class LarkTransformer(Transformer):
         """
         Program -> Class Program | ε
         """
-        return ASTNodes.ProgramNode(args)
+        return self.nodeFactory.ProgramNode(args)
 
     def class_definition(self, args) -> ASTNodes.ClassNode:
         """
@@ -271,7 +486,7 @@ class LarkTransformer(Transformer):
         # Raději zajístíme, že výstupem args[2] je skutečně seznam metod
         if not isinstance(classMethodList, list):
             classMethodList = [classMethodList]
-        return ASTNodes.ClassNode(classIdentifier, parentClass, classMethodList)
+        return self.nodeFactory.ClassNode(classIdentifier, parentClass, classMethodList)
 
     def method_definition(self, args) -> List[ASTNodes.MethodNode]:
         """
@@ -283,7 +498,7 @@ class LarkTransformer(Transformer):
         for i in range(0, len(args), 2):
             methodSelector = args[i]  # args[2k]
             methodBlock = args[i + 1]  # args[2k+1]
-            methodList.append(ASTNodes.MethodNode(methodSelector, methodBlock))
+            methodList.append(self.nodeFactory.MethodNode(methodSelector, methodBlock))
         return methodList
 
     def selector(self, args) -> str:
@@ -293,14 +508,14 @@ class LarkTransformer(Transformer):
         """
         # Bezparametrický selektor '<id>' (tj. `args` není seznam)
         if len(args) == 1:
-            return str(args[0])  # vracíme `args` jako řetězec
+            return str(args[0])  # vracíme `args` jako (internovaný) řetězec
 
         # Parametrický selektor '<id:>' (tj. `args` je seznam)
         # args = [selector, [selector_tail]]
         else:
             selectorHead = str(args[0])  # první selektor
             selectorTail = "".join(args[1])  # seznam dalších slektorů
-            return selectorHead + selectorTail
+            return intern(selectorHead + selectorTail)
 
     def selector_tail(self, args) -> List[str]:
         """
@@ -317,7 +532,7 @@ class LarkTransformer(Transformer):
         """
         blockParameterList = args[0] if len(args) > 0 else []
         blockStatementList = args[1] if len(args) > 1 else []
-        return ASTNodes.BlockNode(blockParameterList, blockStatementList)
+        return self.nodeFactory.BlockNode(blockParameterList, blockStatementList)
 
     def block_parameter(self, args) -> List[str]:
         """
@@ -338,8 +553,8 @@ class LarkTransformer(Transformer):
         for i in range(0, len(args) - 1, 2):
             assignToVariable = args[i]      # args[2k]   -> str
             expression       = args[i + 1]  # args[2k+1] -> Any
-            variableNode     = ASTNodes.IdentifierNode(str(assignToVariable))
-            assignNode       = ASTNodes.AssignNode(variableNode, expression)
+            variableNode     = self.nodeFactory.IdentifierNode(str(assignToVariable))
+            assignNode       = self.nodeFactory.AssignNode(variableNode, expression)
             blockStatementList.append(assignNode)
             if variableNode.identifier in self._reserved_words:
                 raise SyntacticError(f"Identifier can't be reserved word '{assignToVariable}'.")
@@ -357,7 +572,7 @@ class LarkTransformer(Transformer):
             expressionTail = args[1]
             # Buď je `expressionTail` jednoduché volání metody bez argumentů (tj. řetězec)
             if isinstance(expressionTail, str) and len(expressionTail) > 0:
-                return ASTNodes.ExpressionNode(expressionBase, expressionTail, [])
+                return self.nodeFactory.ExpressionNode(expressionBase, expressionTail, [])
             # Nebo je `expressionTail` seznam ve tvaru [<id:>1, ExprBase1, ..., <id:>N, ExprBaseN]
             elif isinstance(expressionTail, list):
                 if len(expressionTail) == 0:
@@ -370,8 +585,8 @@ class LarkTransformer(Transformer):
                     selectors.append(str(expressionTail[i]))
                     args.append(expressionTail[i + 1])
 
-                # Konkatenace selektorů do jednoho řetězce
-                concatenated = "".join(selectors)
+                # Konkatenace selektorů do jednoho (internovaného) řetězce
+                concatenated = intern("".join(selectors))
 
                 if ((isinstance(expressionBase, ASTNodes.LiteralNode) or
                     isinstance(expressionBase, ASTNodes.IdentifierNode) or
@@ -380,7 +595,7 @@ class LarkTransformer(Transformer):
                    ):
                     return expressionBase
                 else:
-                    return ASTNodes.ExpressionNode(expressionBase, concatenated, args)
+                    return self.nodeFactory.ExpressionNode(expressionBase, concatenated, args)
 
             # Pro neočekávané hodnoty (ani str, ani list) vyhodíme výjimku
             else:
@@ -414,7 +629,7 @@ class LarkTransformer(Transformer):
             if args[0] in self._reserved_words:
                 raise SyntacticError(f"Identifier can't be reserved word '{args[0]}'.")
             else:
-                return ASTNodes.IdentifierNode(args[0])  # <id> | <Cid>
+                return self.nodeFactory.IdentifierNode(args[0])  # <id> | <Cid>
         else:
             return args[0]  # <int> | <str> | Block | ( Expr )
 
@@ -426,57 +641,50 @@ class LarkTransformer(Transformer):
         """
         Vytvoří uzel AST pro literál typu Integer.
         """
-        return ASTNodes.LiteralNode("Integer", int(token))
+        return self.nodeFactory.LiteralNode("Integer", int(token))
 
     def STRING_LITERAL(self, token) -> ASTNodes.LiteralNode:
         """
         Vytvoří uzel AST pro literál typu String.
         """
-        value = str(token)
-        # Provedeme úpravy hodnoty literálu kvůli následné XML reprezentaci.
-        modifiedValue = (value.strip("'")
-                            .replace("&", "&amp;")
-                            .replace("<", "&lt;")
-                            .replace(">", "&gt;")
-                            .replace("'", "&apos;")
-                            .replace('"', "&quot;"))
-        return ASTNodes.LiteralNode("String", modifiedValue)
+        # Hodnota literálu se uchovává bez escapování, to provádí až XMLGenerator.
+        return self.nodeFactory.LiteralNode("String", str(token).strip("'"))
 
     def NIL(self, token) -> ASTNodes.LiteralNode:
         """
         Vytvoří uzel AST pro literál typu Nil.
         """
-        return ASTNodes.LiteralNode("Nil", "nil")
+        return self.nodeFactory.LiteralNode("Nil", "nil")
 
     def TRUE(self, token) -> ASTNodes.LiteralNode:
         """
         Vytvoří uzel AST pro literál typu bool s hodnotou 'true'.
         """
-        return ASTNodes.LiteralNode("True", "true")
+        return self.nodeFactory.LiteralNode("True", "true")
 
     def FALSE(self, token) -> ASTNodes.LiteralNode:
         """
         Vytvoří uzel AST pro literál typu bool s hodnotou 'false'.
         """
-        return ASTNodes.LiteralNode("False", "false")
+        return self.nodeFactory.LiteralNode("False", "false")
 
     def SELF(self, token) -> ASTNodes.IdentifierNode:
         """
         Vytvoří uzel AST pro pseudoproměnnou `self`.
         """
-        return ASTNodes.IdentifierNode("self")
+        return self.nodeFactory.IdentifierNode("self")
 
     def SUPER(self, token) -> ASTNodes.IdentifierNode:
         """
         Vytvoří uzel AST pro pseudoproměnnou `super`.
         """
-        return ASTNodes.IdentifierNode("super")
+        return self.nodeFactory.IdentifierNode("super")
 
     def ID(self, token) -> str:
         """
         Vrátí identifikátor <id> a zkontroluje, že se nejedná o klíčové slovo.
         """
-        identifier = str(token)
+        identifier = intern(str(token))
         if identifier in self._keywords:
             raise SyntacticError(f"Identifier can't be keyword '{identifier}'.")
         return identifier
@@ -486,7 +694,7 @@ class LarkTransformer(Transformer):
         Vrátí identifikátor z původního tokenu <id:> a zkontroluje,
         že se nejedná o klíčové slovo.
         """
-        identifier = str(token)
+        identifier = intern(str(token))
 
         return identifier
 
@@ -495,7 +703,7 @@ class LarkTransformer(Transformer):
         Vrátí identifikátor z původního tokenu <:id> a zkontroluje,
         že se nejedná o klíčové slovo. Identifikátor je vrácen bez uvozující dvojtečky.
         """
-        identifier = str(token)[1:]
+        identifier = intern(str(token)[1:])
         if identifier in self._keywords or identifier in self._reserved_words:
             raise SyntacticError(f"Selector can't be keyword '{identifier}'.")
         return identifier
@@ -505,12 +713,397 @@ class LarkTransformer(Transformer):
         Vrátí identifikátor třidy <Cid> a zkontroluje, že se nejedná
         o klíčové slovo.
         """
-        identifier = str(token)
+        identifier = intern(str(token))
         if identifier in self._keywords:
             raise SyntacticError(f"Class identifier can't be keyword '{identifier}'.")
         return identifier
 
 
+class DeferredErrorTransformer:
+    """
+    Obálka nad `LarkTransformer` pro sestavení AST přímo během redukcí LALR
+    parseru (bez mezilehlého parse stromu). Metody transformeru se volají při
+    posunu tokenu a při redukci pravidla, tj. ve stejném pořadí (post-order,
+    zleva doprava) jako při `LarkTransformer.transform()`.
+
+    Chyba vyhozená transformerem se pouze zaznamená a parser pokračuje dál jako
+    pouhý rozpoznávač. Případná pozdější lexikální nebo syntaktická chyba tak má
+    přednost stejně jako při transformaci hotového parse stromu a výsledný
+    návratový kód se mezi oběma režimy neliší.
+
+    Atributy:
+        - firstError (CustomError | None): První chyba vyhozená transformerem.
+    """
+
+    def __init__(self, transformer: LarkTransformer):
+        """
+        Obalí všechny metody transformeru pojmenované podle pravidel a terminálů.
+
+        Parametry:
+            - transformer (LarkTransformer): Obalovaný transformer.
+        """
+        self.firstError = None
+        for name in vars(type(transformer)):
+            if not name.startswith("_"):
+                setattr(self, name, self._wrap(getattr(transformer, name)))
+
+    def _wrap(self, callback):
+        """
+        Vytvoří obálku metody transformeru, která zaznamená první chybu.
+
+        Parametry:
+            - callback (callable): Metoda transformeru.
+
+        Návratová hodnota:
+            - callable: Obalená metoda.
+        """
+        def deferred_callback(args):
+            # Po první chybě už AST nestavíme, jen necháme parser dokončit rozpoznávání
+            if self.firstError is not None:
+                return None
+            try:
+                return callback(args)
+            except CustomError as e:
+                self.firstError = e
+                return None
+        return deferred_callback
+
+    def reset(self):
+        """
+        Zapomene zaznamenanou chybu před parsováním dalšího zdrojového kódu.
+        """
+        self.firstError = None
+
+    def stop(self, error: CustomError):
+        """
+        Zastaví stavbu AST (po lexikální či syntaktické chybě při zotavení
+        z chyb už AST nevznikne), jako by transformer vyhodil chybu `error`.
+
+        Parametry:
+            - error (CustomError): Chyba, kvůli které se stavba AST zastavuje.
+        """
+        if self.firstError is None:
+            self.firstError = error
+
+
+class SyntaxChecker(DeferredErrorTransformer):
+    """
+    Sada metod volaných během redukcí LALR parseru pro pouhou kontrolu
+    syntaxe (režim `--check-syntax`). AST se nestaví, pravidla vrací `None`
+    a terminály bez kontroly zůstávají tokeny. Zachovány jsou jen kontroly
+    `LarkTransformer`, které ovlivňují návratový kód: klíčová slova v `ID`,
+    `SELECTOR_ID` a `CID` a rezervovaná slova v `block_statement` a
+    `expression_base`. Chyby se stejně jako v `DeferredErrorTransformer`
+    pouze zaznamenají, takže pozdější lexikální či syntaktická chyba má
+    přednost a první zaznamenaná chyba odpovídá chybě při stavbě AST.
+
+    Atributy:
+        - firstError (CustomError | None): První chyba vyhozená kontrolami.
+    """
+
+    # Terminály, jejichž metody v `LarkTransformer` kontrolují klíčová slova
+    CHECKED_TERMINALS = ("ID", "SELECTOR_ID", "CID")
+
+    # Pravidla, která kontrolují rezervovaná slova
+    CHECKED_RULES = ("block_statement", "expression_base")
+
+    def __init__(self, transformer: LarkTransformer):
+        """
+        Převezme kontroly terminálů z transformeru, ostatní pravidla nahradí
+        prázdnými metodami.
+
+        Parametry:
+            - transformer (LarkTransformer): Transformer s kontrolami terminálů.
+        """
+        self.firstError = None
+        self._reserved_words = transformer._reserved_words
+        for name in vars(type(transformer)):
+            if name.islower() and not name.startswith("_"):
+                setattr(self, name, self._skip_rule)
+        for name in self.CHECKED_TERMINALS:
+            setattr(self, name, self._wrap(getattr(transformer, name)))
+        self.block_statement = self._wrap(self._check_block_statement)
+        self.expression_base = self._wrap(self._check_expression_base)
+
+    @staticmethod
+    def _skip_rule(args) -> None:
+        """
+        Pravidlo bez kontroly nic nestaví.
+        """
+        return None
+
+    def skip_unchecked_rules(self, callbacks: dict):
+        """
+        Nahradí v tabulce metod LALR parseru metody pravidel bez kontroly
+        přímo prázdnou metodou, takže se pro ně nevolají ani obálky knihovny
+        'lark' filtrující potomky pravidla. Ponechají se kontrolovaná pravidla
+        a jejich pomocná pravidla opakování (`__<pravidlo>_star_<n>`), jejichž
+        potomci se vkládají do potomků kontrolovaného pravidla.
+
+        Parametry:
+            - callbacks (dict): Metody LALR parseru podle pravidel (a terminálů).
+        """
+        checkedPrefixes = tuple(ruleName + "_" for ruleName in self.CHECKED_RULES)
+        for rule in callbacks:
+            if isinstance(rule, str):
+                continue  # terminál
+            ruleName = str(rule.origin.name).lstrip("_")
+            if ruleName not in self.CHECKED_RULES and not ruleName.startswith(checkedPrefixes):
+                callbacks[rule] = self._skip_rule
+
+    def _check_block_statement(self, args) -> None:
+        """
+        BlockStat -> <id> := Expr . BlockStat | ε
+        (přiřazovaná proměnná nesmí být rezervovaným slovem)
+        """
+        for assignToVariable in args[::2]:
+            if assignToVariable in self._reserved_words:
+                raise SyntacticError(f"Identifier can't be reserved word '{assignToVariable}'.")
+        return None
+
+    def _check_expression_base(self, args) -> None:
+        """
+        ExprBase -> <int> | <str> | <id> | <Cid> | Block | ( Expr )
+        (identifikátor nesmí být rezervovaným slovem)
+        """
+        if args[0] in self._reserved_words:
+            raise SyntacticError(f"Identifier can't be reserved word '{args[0]}'.")
+        return None
+
+
+class ErrorCollector:
+    """
+    Obsluha chyb LALR parseru (`on_error`) pro zotavení z chyb. Zaznamená
+    každou lexikální a syntaktickou chybu s řádkem a sloupcem a parser nechá
+    pokračovat. Po lexikální chybě se přeskočí chybný znak. Po syntaktické
+    chybě se parser synchronizuje (panic mode): zahodí se vstup až po nejbližší
+    '.', ']', '}' nebo klíčové slovo 'class' ve stejné úrovni zanoření závorek
+    a ze zásobníku parseru se odeberou stavy až po příkaz bloku, seznam metod
+    třídy, resp. seznam tříd, kde parser může pokračovat. Chyba, která
+    bezprostředně (jen přes bílé znaky) navazuje na předchozí, se považuje za
+    její následek a nezapočítává se.
+
+    Atributy:
+        - errors (list): Zaznamenané chyby jako dvojice (třída chyby, popis).
+    """
+
+    # Synchronizační body: hledaný znak (resp. klíčové slovo) -> (terminál, který
+    # musí přijmout stav obnovený ze zásobníku, zda se synchronizační bod přeskočí)
+    SYNC_POINTS = {
+        ".":     ("_RIGHT_SQUARE_BRACKET", True),
+        "]":     ("_RIGHT_SQUARE_BRACKET", False),
+        "}":     ("_RIGHT_CURLY_BRACKET",  False),
+        "class": ("_CLASS",                False),
+    }
+
+    # Terminály synchronizačních bodů, které se parseru předají jako token
+    SYNC_TERMINALS = {"]": "_RIGHT_SQUARE_BRACKET", "}": "_RIGHT_CURLY_BRACKET", "class": "_CLASS"}
+
+    # Závorky, oddělovače, začátky komentářů a literálů a klíčové slovo 'class'
+    # (ne jako součást identifikátoru nebo selektoru)
+    SYNC_PATTERN = re.compile(r"""[.()\[\]{}"']|(?<![:A-Za-z0-9_])class(?![:A-Za-z0-9_])""")
+
+    def __init__(self, SOL25Code: str, maxErrors: int, builder: DeferredErrorTransformer | None,
+                 literalSpans: LiteralSpans):
+        """
+        Inicializuje obsluhu chyb jednoho parsování.
+
+        Parametry:
+            - SOL25Code (str): Parsovaný kód v jazyce SOL25.
+            - maxErrors (int): Počet chyb, po jehož dosažení parsování skončí.
+            - builder (DeferredErrorTransformer | None): Stavba AST zastavovaná
+                                                         při první chybě.
+            - literalSpans (LiteralSpans): Předběžný průchod parsovaného kódu
+                                           (synchronizace přeskočí komentáře
+                                           a řetězcové literály).
+        """
+        self.errors = []
+        self._code = SOL25Code
+        self._spanEnds = literalSpans.ends
+        self._maxErrors = maxErrors
+        self._builder = builder
+        self._lastErrorEnd = None
+        self._lastException = None
+
+    def handle(self, exception: Exception) -> bool:
+        """
+        Zaznamená chybu a připraví parser na pokračování.
+
+        Parametry:
+            - exception (UnexpectedCharacters | UnexpectedToken): Chyba parseru.
+
+        Návratová hodnota:
+            - bool: `True`, pokud má parser pokračovat.
+        """
+        self._lastException = exception
+        if isinstance(exception, UnexpectedCharacters):
+            start = end = exception.pos_in_stream
+            end += 1
+            self._record(LexicalError, start, end, exception.line, exception.column,
+                         f"unexpected character {self._code[start]!r}")
+            return len(self.errors) < self._maxErrors
+
+        token = exception.token
+        if token.type == "$END":
+            line = self._code.count("\n") + 1
+            column = len(self._code) - self._code.rfind("\n")
+            self._record(SyntacticError, len(self._code), len(self._code), line, column,
+                         "unexpected end of input")
+            return False
+        self._record(SyntacticError, token.start_pos, token.end_pos, token.line, token.column,
+                     f"unexpected token {str(token)!r}")
+        if len(self.errors) >= self._maxErrors:
+            return False
+        return self._synchronize(exception.interactive_parser, token)
+
+    def handle_final(self, exception: Exception):
+        """
+        Zaznamená chybu, kterou parser vyhodil bez zavolání `handle()`
+        (např. opakovaný neočekávaný konec vstupu).
+
+        Parametry:
+            - exception (UnexpectedCharacters | UnexpectedToken): Chyba parseru.
+        """
+        if exception is not self._lastException and len(self.errors) < self._maxErrors:
+            self.handle(exception)
+
+    def _record(self, errorClass: type, start: int, end: int, line: int, column: int, description: str):
+        """
+        Zaznamená chybu, pokud nenavazuje na předchozí chybu.
+
+        Parametry:
+            - errorClass (type): Třída chyby (`LexicalError` nebo `SyntacticError`).
+            - start (int): Pozice začátku chyby.
+            - end (int): Pozice konce chyby.
+            - line (int): Číslo řádku chyby.
+            - column (int): Číslo sloupce chyby.
+            - description (str): Popis chyby.
+        """
+        isConsequence = (self._lastErrorEnd is not None and self._lastErrorEnd <= start and
+                         not self._code[self._lastErrorEnd:start].strip())
+        self._lastErrorEnd = end
+        if isConsequence:
+            return
+        self.errors.append((errorClass, f"line {line}, column {column}: {description}"))
+        if self._builder is not None:
+            self._builder.stop(errorClass())
+
+    def _synchronize(self, interactiveParser: Any, token: Token) -> bool:
+        """
+        Najde první synchronizační bod od chybného tokenu (včetně), pro který
+        je na zásobníku parseru stav, v němž lze pokračovat. Ze zásobníku
+        odebere stavy nad ním a lexer přesune na synchronizační bod (za něj,
+        jde-li o '.'). Je-li synchronizačním bodem samotný chybný token, předá
+        se parseru přímo, protože jej lexer už přečetl.
+
+        Parametry:
+            - interactiveParser (InteractiveParser): Parser ve stavu před chybným tokenem.
+            - token (Token): Chybný token.
+
+        Návratová hodnota:
+            - bool: `True`, pokud se parser synchronizoval, `False`, pokud
+                    do konce vstupu žádný vhodný synchronizační bod není.
+        """
+        spanEnds = self._spanEnds
+        search = self.SYNC_PATTERN.search
+        depth = 0
+        position = token.start_pos
+        while (match := search(self._code, position)) is not None:
+            symbol = match.group()
+            position = match.end()
+            if symbol in "\"'":
+                position = spanEnds.get(match.start(), -1)
+                if position == -1:
+                    return False  # neuzavřený komentář nebo literál
+            elif symbol in "([{":
+                depth += 1
+            elif depth > 0 and symbol in ")]}":
+                depth -= 1
+            elif depth == 0 and symbol in self.SYNC_POINTS:
+                terminalName, skipSymbol = self.SYNC_POINTS[symbol]
+                if self._restore_state(interactiveParser, terminalName, token):
+                    self._move_lexer(interactiveParser, token, match.start(), match.end() if skipSymbol else match.start())
+                    return True
+        return False
+
+    def _restore_state(self, interactiveParser: Any, terminalName: str, token: Token) -> bool:
+        """
+        Odebere ze zásobníku parseru stavy až po nejbližší stav, který přijme
+        terminál `terminalName`. Pokud takový stav na zásobníku není, parser
+        se nezmění.
+
+        Parametry:
+            - interactiveParser (InteractiveParser): Parser ve stavu před chybným tokenem.
+            - terminalName (str): Terminál, který musí obnovený stav přijmout.
+            - token (Token): Chybný token (pro polohu zkušebního tokenu).
+
+        Návratová hodnota:
+            - bool: `True`, pokud byl stav obnoven.
+        """
+        parserState = interactiveParser.parser_state
+        states = parserState.parse_conf.parse_table.states
+        stateStack = parserState.state_stack
+        probe = Token.new_borrow_pos(terminalName, "", token)
+        for index in range(len(stateStack) - 1, -1, -1):
+            if terminalName not in states[stateStack[index]]:
+                continue
+            # Hodnoty zásobníku se nekopírují, AST se po chybě už nestaví
+            attempt = interactiveParser.copy(deepcopy_values = False)
+            del attempt.parser_state.state_stack[index + 1:]
+            del attempt.parser_state.value_stack[index:]
+            try:
+                attempt.feed_token(probe)
+            except UnexpectedToken:
+                continue
+            del stateStack[index + 1:]
+            del parserState.value_stack[index:]
+            return True
+        return False
+
+    def _move_lexer(self, interactiveParser: Any, token: Token, syncStart: int, position: int):
+        """
+        Přesune lexer na pozici `position` (přeskočený vstup se nelexuje).
+        Pokud je synchronizačním bodem samotný chybný token, který už lexer
+        přečetl, předá se parseru přímo.
+
+        Parametry:
+            - interactiveParser (InteractiveParser): Parser s obnoveným stavem.
+            - token (Token): Chybný token.
+            - syncStart (int): Pozice začátku synchronizačního bodu.
+            - position (int): Pozice, od které má lexer pokračovat.
+        """
+        lineCounter = interactiveParser.lexer_thread.state.line_ctr
+        if syncStart == token.start_pos and position == syncStart:
+            value = self._code[token.start_pos:token.end_pos]
+            interactiveParser.feed_token(Token.new_borrow_pos(self.SYNC_TERMINALS[value], value, token))
+        elif position > lineCounter.char_pos:
+            lineCounter.feed(self._code[lineCounter.char_pos:position])
+
+    def raise_errors(self):
+        """
+        Vyvolá chybu třídy první zaznamenané chyby, jejíž detail obsahuje
+        všechny zaznamenané chyby (každou na samostatném řádku).
+
+        Výjimky:
+            - LexicalError | SyntacticError: Podle první zaznamenané chyby.
+        """
+        errorClass = self.errors[0][0]
+        raise errorClass("\n".join(description for _, description in self.errors))
+
+
+# Reprezentace AST: strom objektů `ASTNodes`, nebo plochý AST v typovaných
+# polích (viz 'FlatAST.py'), procházený přes pohledy se stejným rozhraním
+OBJECT_AST_BACKEND = "object"
+FLAT_AST_BACKEND = "flat"
+AST_BACKENDS = (OBJECT_AST_BACKEND, FLAT_AST_BACKEND)
+
+# Lexikální analyzátor: ručně psaný lexer SOL25 (viz 'SOL25Lexer.py'), nebo
+# kontextový lexer knihovny 'lark'
+SOL25_LEXER = "sol25"
+LARK_LEXER = "lark"
+LEXERS = (SOL25_LEXER, LARK_LEXER)
+
+
 class LarkParser:
     """
     Třída `LarkParser` je zodpovědná za parsování kódu v jazyce SOL25 pomocí
@@ -521,37 +1114,191 @@ class LarkParser:
         - _larkParser (Lark): Instance 'Lark' parseru inicializovaná gramatikou SOL25.
         - _ASTBuilder (LarkTransformer): Instance třídy LarkTransformer pro
                                          transformaci parse stromu na AST.
+        - _inlineBuilder (DeferredErrorTransformer | None): Obálka transformeru
+                                         volaná během redukcí (režim bez stromu).
+        - _flatBuilder (FlatASTBuilder | None): Továrna uzlů plochého AST (pouze
+                                         pro `astBackend = FLAT_AST_BACKEND`).
+        - _maxErrors (int | None): Počet chyb sbíraných při zotavení z chyb
+                                   (`None` ukončí parsování první chybou).
+        - _SOL25Lexer (SOL25Lexer | None): Lexer SOL25 zapojený do parseru
+                                           (`None` s lexerem knihovny 'lark').
+
+    (Pozn. s `syntaxOnly = True` je `_inlineBuilder` instancí `SyntaxChecker`
+     a parser pouze rozpoznává syntaxi bez stavby AST.)
     """
 
-    def __init__(self):
-        self._larkParser = Lark(SOL25_GRAMMAR, parser = "lalr", start = "start")
+    def __init__(self, cacheDirectory: str | None = LALR_CACHE_DIRECTORY, buildParseTree: bool = False,
+                 astBackend: str = OBJECT_AST_BACKEND, lexer: str = SOL25_LEXER, syntaxOnly: bool = False,
+                 maxErrors: int | None = None):
+        """
+        Inicializuje parser. Pokud je zadán adresář mezipaměti, pokusí se
+        nejprve načíst předkompilované LALR tabulky a sestavuje je pouze
+        tehdy, když v mezipaměti chybí nebo jsou neplatné.
+
+        Parametry:
+            - cacheDirectory (str | None): Adresář mezipaměti, `None` ji vypne.
+            - buildParseTree (bool): `True` sestaví nejprve celý parse strom a
+                                     ten poté transformuje na AST (původní
+                                     dvouprůchodový režim).
+            - astBackend (str): Reprezentace AST (`OBJECT_AST_BACKEND` nebo
+                                `FLAT_AST_BACKEND`).
+            - lexer (str): Lexikální analyzátor (`SOL25_LEXER` nebo `LARK_LEXER`).
+            - syntaxOnly (bool): `True` pouze zkontroluje syntaxi (včetně kontrol
+                                 klíčových a rezervovaných slov) bez stavby AST
+                                 a `parse_code()` vrací `None`.
+            - maxErrors (int | None): Zotavení z chyb: parser po lexikální či
+                                      syntaktické chybě pokračuje a sebere až
+                                      `maxErrors` chyb s řádkem a sloupcem
+                                      (viz `ErrorCollector`).
+
+        Výjimky:
+            - InternalError: Pokud je zadána neznámá reprezentace AST,
+                             neznámý lexikální analyzátor, kontrola syntaxe
+                             s parse stromem nebo nekladný počet chyb.
+        """
         self._ASTBuilder = LarkTransformer()
+        self._flatBuilder = None
+        if astBackend == FLAT_AST_BACKEND:
+            from MyPyModules.FlatAST import FlatASTBuilder
+            self._flatBuilder = self._ASTBuilder.nodeFactory = FlatASTBuilder()
+        elif astBackend != OBJECT_AST_BACKEND:
+            raise InternalError(f"Unknown AST backend '{astBackend}'.")
+        if lexer not in LEXERS:
+            raise InternalError(f"Unknown lexer '{lexer}'.")
+        if syntaxOnly and buildParseTree:
+            raise InternalError("Syntax check can't build a parse tree.")
+        if maxErrors is not None and maxErrors < 1:
+            raise InternalError(f"Invalid maximum number of errors '{maxErrors}'.")
+        self._maxErrors = maxErrors
+        self._SOL25Lexer = None
+        if syntaxOnly:
+            self._inlineBuilder = SyntaxChecker(self._ASTBuilder)
+        else:
+            self._inlineBuilder = None if buildParseTree else DeferredErrorTransformer(self._ASTBuilder)
+        self._larkParser = self._create_lark_parser(cacheDirectory, self._inlineBuilder)
+
+        # Kontrola syntaxe nepotřebuje ani obálky pravidel bez kontroly (tabulka
+        # metod je neveřejný atribut 'lark', bez ní zůstanou obálky zachovány)
+        if syntaxOnly:
+            try:
+                callbacks = self._larkParser.parser.parser.parser.callbacks
+            except AttributeError:
+                callbacks = None
+            if callbacks is not None:
+                self._inlineBuilder.skip_unchecked_rules(callbacks)
+
+        # Lexer SOL25 nahradí kontextový lexer až v hotovém parseru, takže se
+        # LALR tabulky v mezipaměti i samostatný parser použijí beze změny
+        if lexer == SOL25_LEXER:
+            self._install_SOL25_lexer()
+
+    def _install_SOL25_lexer(self):
+        """
+        Nahradí kontextový lexer parseru lexerem SOL25. Tabulky LALR parseru
+        a konfigurace lexeru se čtou z neveřejných atributů knihovny 'lark',
+        pokud je jiná verze knihovny nemá, zůstane kontextový lexer 'lark'.
+        """
+        from MyPyModules.SOL25Lexer import SOL25Lexer
+        try:
+            frontend = self._larkParser.parser
+            lexerConf = frontend.lexer_conf
+            states = frontend.parser._parse_table.states
+        except AttributeError:
+            return
+        self._SOL25Lexer = frontend.lexer = SOL25Lexer(lexerConf, states)
+
+    @staticmethod
+    def _create_lark_parser(cacheDirectory: str | None, transformer: Any = None) -> Lark:
+        """
+        Vytvoří LALR parser ze samostatného modulu, pokud je k dispozici. Jinak
+        jej načte z mezipaměti, případně jej sestaví a do mezipaměti uloží.
+
+        Parametry:
+            - cacheDirectory (str | None): Adresář mezipaměti, `None` ji vypne.
+            - transformer (Any): Transformer volaný během redukcí (volitelný).
 
-    def parse_code(self, SOL25Code) -> ASTNodes.ProgramNode:
+        Návratová hodnota:
+            - Lark: Instance LALR parseru pro gramatiku SOL25.
+        """
+        if StandaloneParser is not None:
+            return StandaloneParser.Lark_StandAlone(transformer = transformer)
+
+        # Načtení z mezipaměti využívá neveřejnou metodu 'Lark._load_from_dict()',
+        # bez ní (jiná verze 'lark') se parser vždy sestaví znovu
+        if cacheDirectory is None or not hasattr(Lark, "_load_from_dict"):
+            return Lark(SOL25_GRAMMAR, parser = "lalr", start = "start", transformer = transformer)
+
+        cachePath = get_cache_path(cacheDirectory)
+        larkParser = load_cached_parser(cachePath, transformer)
+        if larkParser is None:
+            larkParser = Lark(SOL25_GRAMMAR, parser = "lalr", start = "start", transformer = transformer)
+            save_cached_parser(larkParser, cachePath)
+        return larkParser
+
+    def parse_code(self, SOL25Code, literalSpans: LiteralSpans | None = None) -> ASTNodes.ProgramNode:
         """
         Parsuje zadaný kód v jazyce SOL25 a převádí jej na abstraktní
         syntaktický strom (AST).
 
         Parametry:
             - SOL25Code (str): Kód v jazyce SOL25, který má být parsován.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu (viz
+                                                  `find_literal_spans()`), který
+                                                  volající předá i generátoru XML.
+                                                  Při `None` jej parser provede
+                                                  sám, pokud jej potřebuje.
 
         Návratová hodnota:
-            - ASTNodes.ASTProgram: Kořenový uzel vygenerovaného AST.
+            - ASTNodes.ASTProgram: Kořenový uzel vygenerovaného AST (`None`
+                                   při pouhé kontrole syntaxe).
 
         Výjimky:
             - LexicalError: Pokud se v kódu vyskytují neočekávané znaky.
             - SyntacticError: Pokud se v kódu vyskytují neočekávané tokeny.
+                              (Při zotavení z chyb je třída výjimky dána první
+                              chybou a detail obsahuje všechny sebrané chyby.)
             - Exception: Pro jakékoli jiné výjimky, které nastanou během
                          parsování nebo transformace.
         """
+        if literalSpans is None and (self._SOL25Lexer is not None or self._maxErrors is not None):
+            literalSpans = find_literal_spans(SOL25Code)
+
+        # Lexer i obsluha chyb dostanou předběžný průchod jen po dobu tohoto
+        # parsování, parser si po něm zdrojový kód nedrží.
+        if self._SOL25Lexer is not None:
+            self._SOL25Lexer.literalSpans = literalSpans
+
+        # Plochý AST se sestavuje vždy do nového stromu, po parsování na něj
+        # odkazuje už jen vrácený kořen (ne továrna uzlů).
+        if self._flatBuilder is not None:
+            self._flatBuilder.reset()
+        try:
+            return self._parse_code(SOL25Code, literalSpans)
+        finally:
+            if self._SOL25Lexer is not None:
+                self._SOL25Lexer.literalSpans = None
+            if self._flatBuilder is not None:
+                self._flatBuilder.reset()
+
+    def _parse_code(self, SOL25Code, literalSpans: LiteralSpans | None) -> ASTNodes.ProgramNode:
+        """
+        Parsuje kód v SOL25 buď přímo během redukcí, nebo přes parse strom
+        (viz `parse_code()`).
+
+        Parametry:
+            - SOL25Code (str): Kód v jazyce SOL25, který má být parsován.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
+
+        Návratová hodnota:
+            - ASTNodes.ProgramNode: Kořenový uzel vygenerovaného AST.
+        """
+        if self._inlineBuilder is not None:
+            return self._parse_without_tree(SOL25Code, literalSpans)
+
         # Parsování kódu SOL25 a generování lark parse stromu
         try:
-            larkParseTree = self._larkParser.parse(SOL25Code)
-        except UnexpectedCharacters as e:
-            raise LexicalError() from e
-        except UnexpectedToken as e:
-            raise SyntacticError() from e
-        except Exception:
+            larkParseTree = self._run_lark_parser(SOL25Code, literalSpans)
+        except:
             raise
 
         # Transformace lark parse stromu na abstraktní syntaktický strom (AST)
@@ -559,11 +1306,71 @@ class LarkParser:
             ASTRoot = self._ASTBuilder.transform(larkParseTree)
             return ASTRoot
         # Pokud během transofrmace selhala kontrola regulárním výrazem
-        except visitors.VisitError as e:
+        except VisitError as e:
             raise SyntacticError(str(e.orig_exc.errorDetail)) from e
         # Pokud během transformace došlo k jakékoliv jiné chybě
         except Exception:
             raise
 
-### konec souboru 'LarkParser.py' ###
+    def _parse_without_tree(self, SOL25Code, literalSpans: LiteralSpans | None) -> ASTNodes.ProgramNode:
+        """
+        Parsuje kód v SOL25 a staví AST přímo během redukcí LALR parseru, takže
+        nevzniká mezilehlý parse strom. Chyby transformeru se hlásí stejně jako
+        v režimu s parse stromem (viz `DeferredErrorTransformer`).
+
+        Parametry:
+            - SOL25Code (str): Kód v jazyce SOL25, který má být parsován.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
+
+        Návratová hodnota:
+            - ASTNodes.ProgramNode: Kořenový uzel vygenerovaného AST.
+        """
+        self._inlineBuilder.reset()
+        try:
+            ASTRoot = self._run_lark_parser(SOL25Code, literalSpans)
+        except:
+            raise
+
+        # Pokud během stavby AST selhala některá z kontrol transformeru
+        if self._inlineBuilder.firstError is not None:
+            error = self._inlineBuilder.firstError
+            raise SyntacticError(str(error.errorDetail)) from error
+        return ASTRoot
+
+    def _run_lark_parser(self, SOL25Code, literalSpans: LiteralSpans | None) -> Any:
+        """
+        Spustí LALR parser a převede jeho chyby na vlastní výjimky. Při
+        zotavení z chyb parser po chybě pokračuje a vyvolá se až výjimka se
+        všemi sebranými chybami.
 
+        Parametry:
+            - SOL25Code (str): Kód v jazyce SOL25, který má být parsován.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu (při
+                                                  zotavení z chyb vždy zadaný).
+
+        Návratová hodnota:
+            - Any: Výsledek parseru (parse strom, nebo kořen AST).
+
+        Výjimky:
+            - LexicalError: Pokud se v kódu vyskytují neočekávané znaky.
+            - SyntacticError: Pokud se v kódu vyskytují neočekávané tokeny.
+        """
+        if self._maxErrors is None:
+            try:
+                return self._larkParser.parse(SOL25Code)
+            except UnexpectedCharacters as e:
+                raise LexicalError() from e
+            except UnexpectedToken as e:
+                raise SyntacticError() from e
+
+        collector = ErrorCollector(SOL25Code, self._maxErrors, self._inlineBuilder, literalSpans)
+        result = None
+        try:
+            result = self._larkParser.parse(SOL25Code, on_error = collector.handle)
+        except (UnexpectedCharacters, UnexpectedToken) as e:
+            collector.handle_final(e)
+        if collector.errors:
+            collector.raise_errors()
+        return result
+
+### konec souboru 'LarkParser.py' ###
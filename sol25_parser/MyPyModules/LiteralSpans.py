@@ -0,0 +1,112 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           LiteralSpans.py                                            *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje předběžný průchod zdrojovým kódem,   *
+*                   který jediným během vyhledá všechny komentáře a řetězcové  *
+*                   literály. Uvozovky a apostrofy se hledají metodou          *
+*                   `str.find()`, takže se obsah dlouhých komentářů a          *
+*                   literálů neprochází znak po znaku. Lexer SOL25 pak úseky   *
+*                   přeskakuje a generátor XML z nich získá první komentář.    *
+*                   Modul neimportuje parser ani knihovnu 'lark'.              *
+********************************************************************************
+"""
+
+
+class LiteralSpans:
+    """
+    Třída `LiteralSpans` uchovává výsledek předběžného průchodu jednoho
+    zdrojového kódu.
+
+    Atributy:
+        - text (str): Prohledaný zdrojový kód (výsledek platí jen pro tento objekt).
+        - ends (dict): Konec (pozice za uzavírajícím znakem) každého komentáře
+                       a řetězcového literálu podle pozice jeho začátku.
+        - firstComment (str | None): Text prvního komentáře bez uvozovek.
+    """
+    __slots__ = ("text", "ends", "firstComment")
+
+    def __init__(self, text:str, ends:dict, firstComment:str | None):
+        self.text = text
+        self.ends = ends
+        self.firstComment = firstComment
+
+
+def scan_literal_spans(SOL25Code:str, stopAtComment:bool = False) -> tuple:
+    """
+    Vyhledá komentáře a řetězcové literály v pořadí výskytu. Uvozovka uvnitř
+    literálu ani apostrof uvnitř komentáře úsek nezačínají. Literál končí
+    prvním apostrofem, kterému nepředchází lichý počet zpětných lomítek
+    (platnost escape sekvencí kontroluje až lexer). Neuzavřený komentář nebo
+    literál (lexikální chyba) průchod ukončí.
+
+    Parametry:
+        - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+        - stopAtComment (bool): `True` ukončí průchod za prvním komentářem.
+
+    Návratová hodnota:
+        - tuple: Dvojice (konce úseků podle jejich začátků, text prvního komentáře).
+    """
+    find = SOL25Code.find
+    ends = {}
+    firstComment = None
+    nextComment = find('"')
+    nextString = find("'")
+
+    while nextComment != -1 or nextString != -1:
+        if nextString == -1 or (nextComment != -1 and nextComment < nextString):
+            start = nextComment
+            end = find('"', start + 1)
+            if end == -1:
+                break
+            end += 1
+            ends[start] = end
+            if firstComment is None:
+                firstComment = SOL25Code[start + 1:end - 1]
+                if stopAtComment:
+                    break
+            nextComment = find('"', end)
+            if 0 <= nextString < end:
+                nextString = find("'", end)
+        else:
+            start = nextString
+            end = find("'", start + 1)
+            while end != -1 and SOL25Code[end - 1] == "\\":
+                backslashStart = end - 1
+                while SOL25Code[backslashStart - 1] == "\\":
+                    backslashStart -= 1
+                if (end - backslashStart) % 2 == 0:
+                    break
+                end = find("'", end + 1)
+            if end == -1:
+                break
+            end += 1
+            ends[start] = end
+            nextString = find("'", end)
+            if 0 <= nextComment < end:
+                nextComment = find('"', end)
+    return ends, firstComment
+
+
+def find_literal_spans(SOL25Code:str) -> LiteralSpans:
+    """
+    Vyhledá všechny komentáře a řetězcové literály zdrojového kódu. Výsledek
+    se nikde neukládá, volající jej předá lexeru, obsluze chyb parseru
+    i generátoru XML (viz `LarkParser.parse_code()`).
+
+    Parametry:
+        - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+
+    Návratová hodnota:
+        - LiteralSpans: Úseky komentářů a literálů a první komentář.
+    """
+    return LiteralSpans(SOL25Code, *scan_literal_spans(SOL25Code))
+
+### konec souboru 'LiteralSpans.py' ###
@@ -0,0 +1,440 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           ParseServer.py                                             *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje serverový režim analyzátoru kódu     *
+*                   v SOL25 (`parse.py --serve SOCKET`). Server drží v paměti  *
+*                   připravený parser, symboly vestavěných tříd a generátor    *
+*                   XML a přijímá zdrojové kódy přes unixový socket, čímž      *
+*                   odpadá režie spouštění interpretu pro každý soubor.        *
+*                   Upravované dokumenty (příkaz UPDATE) se analyzují          *
+*                   inkrementálně.                                             *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import json          # dumps()
+import os            # path.exists(), remove()
+import signal        # signal(), SIGTERM
+import socket        # socket(), AF_UNIX, SHUT_WR
+import socketserver  # ThreadingUnixStreamServer, BaseRequestHandler
+import threading     # Lock()
+import time          # perf_counter()
+from collections import OrderedDict
+from typing import Tuple
+
+# Import vlastních modulů
+from MyPyModules.AbstractSyntaxTree import ASTNodes
+from MyPyModules.CustomErrors import (CustomError, ExitCode, InputFileError,
+                                      InternalError, OutputFileError,
+                                      ScriptParameterError)
+from MyPyModules.IncrementalAnalyser import IncrementalAnalyser
+from MyPyModules.LarkParser import LarkParser
+from MyPyModules.LiteralSpans import LiteralSpans, find_literal_spans
+from MyPyModules.SemanticAnalyser import SemanticAnalyser
+from MyPyModules.XMLGenerator import XMLGenerator
+
+################################################################################
+#                                                                              #
+#                       PROTOKOL KOMUNIKACE SE SERVEREM                        #
+#                                                                              #
+################################################################################
+# ==============================================================================
+# Požadavek: '<příkaz>\n<data>', klient po odeslání uzavře zápis (SHUT_WR)
+#          : PARSE - data jsou zdrojový kód v SOL25 kódovaný v UTF-8
+#          : UPDATE - data jsou '<název dokumentu>\n<zdrojový kód>', kód se
+#            analyzuje inkrementálně vůči předchozí verzi téhož dokumentu
+#          : STATS - data jsou prázdná, odpovědí je histogram latencí v JSON
+# Odpověď:   '<návratový kód>\n<výstup>', poté server spojení uzavře
+#          : při úspěchu je výstupem XML stejné jako na STDOUT 'parse.py'
+#          : při chybě je výstupem hláška, kterou 'parse.py' tiskne na STDERR
+# ==============================================================================
+
+PARSE_COMMAND = b"PARSE"
+UPDATE_COMMAND = b"UPDATE"
+STATS_COMMAND = b"STATS"
+
+# Maximální velikost zdrojového kódu v bajtech, maximální délka příkazu
+# a názvu dokumentu a časový limit spojení v sekundách
+MAX_REQUEST_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 1024
+REQUEST_TIMEOUT = 10.0
+
+# Počet dokumentů, pro které si server drží stav inkrementální analýzy
+MAX_DOCUMENTS = 64
+
+# Horní meze košů histogramu latencí v milisekundách (poslední koš je neomezený)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class LatencyHistogram:
+    """
+    Třída `LatencyHistogram` sbírá latence zpracování požadavků PARSE.
+
+    Atributy:
+        - _counts (list): Počty požadavků v jednotlivých koších.
+        - _totalMs (float): Součet všech latencí v milisekundách.
+        - _lock (threading.Lock): Zámek pro souběžný zápis z více vláken.
+
+    Metody:
+        - record(latencyMs:float): Zaznamená latenci jednoho požadavku.
+        - snapshot() -> dict: Vrátí aktuální stav histogramu.
+    """
+
+    def __init__(self):
+        """
+        Inicializuje prázdný histogram.
+        """
+        self._counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._totalMs = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latencyMs: float):
+        """
+        Zaznamená latenci jednoho požadavku do odpovídajícího koše.
+
+        Parametry:
+            - latencyMs (float): Latence požadavku v milisekundách.
+        """
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latencyMs <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._totalMs += latencyMs
+
+    def snapshot(self) -> dict:
+        """
+        Vrátí aktuální stav histogramu. Koš s mezí `le` obsahuje počet
+        požadavků s latencí v intervalu (předchozí mez, `le`] milisekund,
+        poslední koš (`le` je None) obsahuje všechny delší požadavky.
+
+        Návratová hodnota:
+            - dict: Počet požadavků, součet latencí a koše histogramu.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            totalMs = self._totalMs
+        bounds = list(LATENCY_BUCKETS_MS) + [None]
+        return {
+            "requests": sum(counts),
+            "totalMs": round(totalMs, 3),
+            "buckets": [{"le": bound, "count": count} for bound, count in zip(bounds, counts)]
+        }
+
+
+class ParseRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Obsluha jednoho spojení se serverem (viz protokol výše).
+
+    Metody:
+        - handle(): Načte požadavek, zpracuje ho a odešle odpověď.
+        - read_request() -> bytes | None: Načte požadavek až do uzavření zápisu klientem.
+    """
+
+    def handle(self):
+        """
+        Načte požadavek, zpracuje ho a odešle odpověď.
+        """
+        self.request.settimeout(REQUEST_TIMEOUT)
+        try:
+            request = self.read_request()
+        except OSError:
+            return  # klient se odpojil nebo vypršel časový limit
+
+        if request is None:
+            detail = f"Request exceeds the limit of {self.server.maxRequestSize} bytes."
+            exitCode, output = self.server.format_error(InputFileError(detail))
+        else:
+            command, _, payload = request.partition(b"\n")
+            if command == PARSE_COMMAND:
+                exitCode, output = self.server.handle_parse(payload)
+            elif command == UPDATE_COMMAND:
+                documentName, _, payload = payload.partition(b"\n")
+                exitCode, output = self.server.handle_parse(payload, documentName)
+            elif command == STATS_COMMAND:
+                exitCode = ExitCode.SUCCESS.value
+                output = json.dumps(self.server.histogram.snapshot()) + "\n"
+            else:
+                detail = f"Unknown request '{command.decode('utf-8', 'replace')}'."
+                exitCode, output = self.server.format_error(ScriptParameterError(detail))
+
+        try:
+            self.request.sendall(f"{exitCode}\n{output}".encode("utf-8"))
+        except OSError:
+            pass  # klient se odpojil dříve, než přečetl odpověď
+
+    def read_request(self) -> bytes | None:
+        """
+        Načte požadavek až do uzavření zápisu klientem. Data nad maximální
+        velikost se dočtou a zahodí (čtení omezuje časový limit spojení),
+        aby klient mohl požadavek dokončit a přečíst chybovou odpověď.
+
+        Návratová hodnota:
+            - bytes | None: Data požadavku, nebo None, pokud požadavek
+                            překročil maximální velikost.
+        """
+        limit = self.server.maxRequestSize + MAX_HEADER_SIZE
+        chunks = []
+        received = 0
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                return b"".join(chunks) if received <= limit else None
+            received += len(chunk)
+            if received <= limit:
+                chunks.append(chunk)
+            elif chunks:
+                chunks = []  # zbytek požadavku se jen dočte
+
+
+class ParseServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Třída `ParseServer` zpracovává požadavky souběžně, každé spojení obsluhuje
+    samostatné vlákno. Parser je sdílený a chráněný zámkem (parsování
+    probíhá pod GIL, takže souběžné parsování by nic nezrychlilo), sémantická
+    analýza a generování XML probíhají mimo zámek.
+
+    Atributy:
+        - maxRequestSize (int): Maximální velikost zdrojového kódu v bajtech.
+        - histogram (LatencyHistogram): Histogram latencí požadavků PARSE.
+        - _parser (LarkParser): Sdílená instance parseru.
+        - _parserLock (threading.Lock): Zámek sdíleného parseru.
+        - _generator (XMLGenerator): Sdílená (reentrantní) instance generátoru XML.
+        - _documents (OrderedDict): Inkrementální analyzátory dokumentů (LRU).
+        - _documentsLock (threading.Lock): Zámek slovníku dokumentů.
+
+    Metody:
+        - create_semantic_analyser() -> SemanticAnalyser: Vytvoří analyzátor pro jeden požadavek.
+        - parse_code(SOL25Code:str, literalSpans:LiteralSpans) -> ProgramNode: Parsuje kód sdíleným parserem.
+        - get_document_analyser(documentName:bytes) -> IncrementalAnalyser: Vrátí analyzátor dokumentu.
+        - analyse_code(SOL25Code:str) -> str: Analyzuje zdrojový kód a vrátí XML.
+        - handle_parse(payload:bytes, documentName:bytes) -> Tuple[int, str]: Zpracuje požadavek PARSE/UPDATE.
+        - format_error(exception:Exception) -> Tuple[int, str]: Převede výjimku na odpověď.
+    """
+    daemon_threads = True
+
+    def __init__(self, socketPath: str, maxRequestSize: int = MAX_REQUEST_SIZE):
+        """
+        Připraví parser a generátor XML a otevře unixový socket.
+
+        Parametry:
+            - socketPath (str): Cesta k unixovému socketu.
+            - maxRequestSize (int): Maximální velikost zdrojového kódu v bajtech.
+
+        Výjimky:
+            - OutputFileError: Pokud nelze socket vytvořit.
+        """
+        self.maxRequestSize = maxRequestSize
+        self.histogram = LatencyHistogram()
+        self._parser = LarkParser()
+        self._parserLock = threading.Lock()
+        self._generator = XMLGenerator()
+        self._documents = OrderedDict()
+        self._documentsLock = threading.Lock()
+
+        remove_stale_socket(socketPath)
+        try:
+            super().__init__(socketPath, ParseRequestHandler)
+        except OSError as e:
+            raise OutputFileError(str(e))
+
+    def create_semantic_analyser(self) -> SemanticAnalyser:
+        """
+        Vytvoří sémantický analyzátor pro jeden požadavek (symboly
+        vestavěných tříd sdílí všechny analyzátory odkazem).
+
+        Návratová hodnota:
+            - SemanticAnalyser: Nová instance sémantického analyzátoru.
+        """
+        return SemanticAnalyser()
+
+    def parse_code(self, SOL25Code: str, literalSpans: LiteralSpans | None = None) -> ASTNodes.ProgramNode:
+        """
+        Parsuje zdrojový kód sdíleným parserem (pod zámkem).
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu (viz
+                                                  `LarkParser.parse_code()`).
+
+        Návratová hodnota:
+            - ASTNodes.ProgramNode: Kořenový uzel AST.
+        """
+        with self._parserLock:
+            return self._parser.parse_code(SOL25Code, literalSpans)
+
+    def get_document_analyser(self, documentName: bytes) -> IncrementalAnalyser:
+        """
+        Vrátí inkrementální analyzátor dokumentu, případně ho vytvoří.
+        Server si drží nejvýše `MAX_DOCUMENTS` naposledy použitých dokumentů.
+
+        Parametry:
+            - documentName (bytes): Název dokumentu.
+
+        Návratová hodnota:
+            - IncrementalAnalyser: Analyzátor dokumentu.
+        """
+        with self._documentsLock:
+            analyser = self._documents.get(documentName)
+            if analyser is None:
+                analyser = IncrementalAnalyser(self.parse_code)
+                self._documents[documentName] = analyser
+                if len(self._documents) > MAX_DOCUMENTS:
+                    self._documents.popitem(last = False)
+            else:
+                self._documents.move_to_end(documentName)
+            return analyser
+
+    def analyse_code(self, SOL25Code: str) -> str:
+        """
+        Provede analýzu zdrojového kódu a vrátí XML výstup ve stejné podobě,
+        jakou 'parse.py' tiskne na STDOUT.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - str: XML reprezentace programu.
+
+        Výjimky:
+            - InputFileError: Pokud je zdrojový kód prázdný.
+            - CustomError: Chyby lexikální, syntaktické a sémantické analýzy.
+        """
+        if not SOL25Code:
+            raise InputFileError()
+        # Předběžný průchod patří jen tomuto požadavku (sdílený parser ani
+        # generátor si jej po analýze nedrží)
+        literalSpans = find_literal_spans(SOL25Code)
+        ASTRoot = self.parse_code(SOL25Code, literalSpans)
+        self.create_semantic_analyser().analyse_semantic(ASTRoot)
+        return self._generator.generate_XML(ASTRoot, SOL25Code, literalSpans) + "\n"
+
+    def handle_parse(self, payload: bytes, documentName: bytes = None) -> Tuple[int, str]:
+        """
+        Zpracuje požadavek PARSE (nebo UPDATE, je-li zadán název dokumentu).
+        Do histogramu se zaznamenává jen latence požadavků PARSE.
+
+        Parametry:
+            - payload (bytes): Zdrojový kód v SOL25 kódovaný v UTF-8.
+            - documentName (bytes): Název dokumentu pro inkrementální analýzu.
+
+        Návratová hodnota:
+            - Tuple[int, str]: Návratový kód a výstup odpovědi.
+        """
+        start = time.perf_counter()
+        try:
+            if len(payload) > self.maxRequestSize:
+                raise InputFileError(f"Request exceeds the limit of {self.maxRequestSize} bytes.")
+            try:
+                SOL25Code = payload.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise InputFileError(str(e))
+            if documentName is None:
+                response = (ExitCode.SUCCESS.value, self.analyse_code(SOL25Code))
+            else:
+                analyser = self.get_document_analyser(documentName)
+                response = (ExitCode.SUCCESS.value, analyser.analyse_code(SOL25Code))
+        except Exception as e:
+            response = self.format_error(e)
+        if documentName is None:
+            self.histogram.record((time.perf_counter() - start) * 1000)
+        return response
+
+    def format_error(self, exception: Exception) -> Tuple[int, str]:
+        """
+        Převede výjimku na návratový kód a hlášku, kterou by pro ni vytiskla
+        funkce `handle_exception()`.
+
+        Parametry:
+            - exception (Exception): Výjimka vzniklá při zpracování požadavku.
+
+        Návratová hodnota:
+            - Tuple[int, str]: Návratový kód a chybová hláška.
+        """
+        if isinstance(exception, CustomError):
+            return exception.errorCode, f"{exception}\n"
+        return InternalError.errorCode, f"{exception}\n"
+
+
+def remove_stale_socket(socketPath: str):
+    """
+    Odstraní soubor socketu, který zůstal po ukončeném serveru. Socket, na
+    kterém server stále naslouchá, se neodstraní.
+
+    Parametry:
+        - socketPath (str): Cesta k unixovému socketu.
+
+    Výjimky:
+        - OutputFileError: Pokud na socketu již naslouchá jiný server.
+    """
+    if not os.path.exists(socketPath):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socketPath)
+    except OSError:
+        os.remove(socketPath)
+        return
+    finally:
+        probe.close()
+    raise OutputFileError(f"Socket '{socketPath}' is already in use.")
+
+
+def send_request(socketPath: str, command: bytes, payload: bytes = b"") -> Tuple[int, str]:
+    """
+    Odešle požadavek serveru a vrátí jeho odpověď (klient pro integrace
+    a testy).
+
+    Parametry:
+        - socketPath (str): Cesta k unixovému socketu serveru.
+        - command (bytes): Příkaz požadavku (PARSE_COMMAND, UPDATE_COMMAND nebo STATS_COMMAND).
+        - payload (bytes): Data požadavku.
+
+    Návratová hodnota:
+        - Tuple[int, str]: Návratový kód a výstup odpovědi.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socketPath)
+        client.sendall(command + b"\n" + payload)
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := client.recv(65536):
+            chunks.append(chunk)
+    exitCode, _, output = b"".join(chunks).decode("utf-8").partition("\n")
+    return int(exitCode), output
+
+
+def run_server(socketPath: str):
+    """
+    Spustí server a obsluhuje požadavky, dokud není proces ukončen signálem
+    SIGTERM nebo SIGINT. Po ukončení se soubor socketu odstraní.
+
+    Parametry:
+        - socketPath (str): Cesta k unixovému socketu.
+    """
+    server = ParseServer(socketPath)
+
+    def stop_server(signum, frame):
+        raise SystemExit(ExitCode.SUCCESS.value)
+
+    signal.signal(signal.SIGTERM, stop_server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socketPath):
+            os.remove(socketPath)
+
+### konec souboru 'ParseServer.py' ###
@@ -0,0 +1,291 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           ResultCache.py                                             *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje mezipaměť výsledků analýzy na disku  *
+*                   (`parse.py --cache DIR`). Klíčem je SHA-256 otisk          *
+*                   zdrojového kódu a verze analyzátoru, hodnotou XML výstup   *
+*                   nebo návratový kód a detail chyby. Modul záměrně           *
+*                   neimportuje parser ani knihovnu 'lark', takže zásah do     *
+*                   mezipaměti nemusí analyzátor vůbec načítat.                *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import hashlib         # sha256()
+import importlib.util  # find_spec()
+import json            # dumps(), loads()
+import os              # path, scandir(), makedirs(), replace(), remove(), utime()
+import tempfile        # mkstemp()
+import time            # time()
+
+# Import vlastních modulů
+from MyPyModules.CustomErrors import (CustomError, LexicalError, SyntacticError,
+                                      SemanticMainRunError, SemanticUndefinedSymbolError,
+                                      SemanticArityError, SemanticVariableCollisionError,
+                                      SemanticOtherError)
+
+# Výchozí maximální velikost mezipaměti v bajtech
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+# Po překročení maximální velikosti se mezipaměť zmenší na tento podíl,
+# aby se adresář neprocházel znovu při každém dalším zápisu.
+EVICTION_TARGET_RATIO = 0.9
+
+# Přípona záznamu, přípona dočasného souboru a stáří (v sekundách), po kterém
+# se dočasný soubor považuje za pozůstatek přerušeného zápisu
+ENTRY_SUFFIX = ".json"
+TEMPORARY_SUFFIX = ".tmp"
+STALE_TEMPORARY_AGE = 3600
+
+# Verze formátu záznamů (součást otisku analyzátoru)
+CACHE_FORMAT_VERSION = "1"
+
+# Ukládají se pouze chyby, které jsou jednoznačně dané zdrojovým kódem.
+CACHEABLE_ERRORS = {errorClass.errorCode: errorClass for errorClass in (
+    LexicalError, SyntacticError, SemanticMainRunError, SemanticUndefinedSymbolError,
+    SemanticArityError, SemanticVariableCollisionError, SemanticOtherError)}
+
+# Otisk analyzátoru (počítá se nejvýše jednou za běh procesu)
+_analyserFingerprint = None
+
+
+def get_analyser_fingerprint() -> bytes:
+    """
+    Vypočítá otisk verze analyzátoru: zdrojové kódy všech modulů
+    v 'MyPyModules' (včetně gramatiky) a hlavní modul knihovny 'lark'
+    (obsahuje její verzi). Knihovna se přitom neimportuje, pouze se
+    vyhledá její soubor.
+
+    Návratová hodnota:
+        - bytes: SHA-256 otisk analyzátoru.
+    """
+    global _analyserFingerprint
+    if _analyserFingerprint is not None:
+        return _analyserFingerprint
+
+    digest = hashlib.sha256(CACHE_FORMAT_VERSION.encode("ascii"))
+    moduleDirectory = os.path.dirname(os.path.abspath(__file__))
+    modulePaths = [os.path.join(moduleDirectory, name)
+                   for name in sorted(os.listdir(moduleDirectory)) if name.endswith(".py")]
+    try:
+        larkSpecification = importlib.util.find_spec("lark")
+    except ValueError:
+        larkSpecification = None
+    if larkSpecification is not None and larkSpecification.origin:
+        modulePaths.append(larkSpecification.origin)
+
+    for modulePath in modulePaths:
+        with open(modulePath, "rb") as moduleFile:
+            digest.update(os.path.basename(modulePath).encode("utf-8") + b"\0")
+            digest.update(moduleFile.read())
+    _analyserFingerprint = digest.digest()
+    return _analyserFingerprint
+
+
+class ResultCache:
+    """
+    Třída `ResultCache` ukládá výsledky analýzy do adresáře na disku. Každý
+    záznam je samostatný soubor pojmenovaný podle klíče, zapisuje se atomicky
+    (dočasný soubor + `os.replace()`), takže mezipaměť mohou sdílet souběžně
+    běžící procesy. Čas poslední úpravy souboru slouží jako čas posledního
+    použití, při překročení maximální velikosti se odstraní nejdéle
+    nepoužité záznamy (LRU).
+
+    Atributy:
+        - directory (str): Adresář mezipaměti.
+        - maxSize (int): Maximální velikost záznamů v bajtech.
+        - _estimatedSize (int | None): Odhad velikosti mezipaměti (poslední
+                                       průchod adresářem + vlastní zápisy).
+
+    Metody:
+        - get_key(SOL25Code:str) -> str: Vypočítá klíč zdrojového kódu.
+        - lookup(key:str) -> str | None: Vrátí uložený XML výstup nebo vyvolá uloženou chybu.
+        - store_result(key:str, XMLCode:str): Uloží XML výstup.
+        - store_error(key:str, exception:Exception): Uloží chybu analýzy.
+        - evict(): Zmenší mezipaměť pod maximální velikost.
+    """
+
+    def __init__(self, directory: str, maxSize: int = DEFAULT_CACHE_SIZE):
+        """
+        Inicializuje mezipaměť v zadaném adresáři (adresář se vytvoří až
+        při prvním zápisu).
+
+        Parametry:
+            - directory (str): Adresář mezipaměti.
+            - maxSize (int): Maximální velikost záznamů v bajtech.
+        """
+        self.directory = directory
+        self.maxSize = maxSize
+        self._estimatedSize = None
+
+    def get_key(self, SOL25Code: str) -> str:
+        """
+        Vypočítá klíč záznamu ze zdrojového kódu a otisku analyzátoru.
+
+        Parametry:
+            - SOL25Code (str): Zdrojový kód v SOL25.
+
+        Návratová hodnota:
+            - str: Hexadecimální SHA-256 klíč.
+        """
+        digest = hashlib.sha256(get_analyser_fingerprint())
+        digest.update(SOL25Code.encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
+    def lookup(self, key: str) -> str | None:
+        """
+        Vyhledá záznam v mezipaměti a označí ho jako naposledy použitý.
+        Poškozený nebo nečitelný záznam se považuje za chybějící.
+
+        Parametry:
+            - key (str): Klíč záznamu.
+
+        Návratová hodnota:
+            - str | None: Uložený XML výstup, nebo None, pokud záznam chybí.
+
+        Výjimky:
+            - CustomError: Uložená chyba analýzy (stejná jako při analýze).
+        """
+        entryPath = self._get_entry_path(key)
+        try:
+            with open(entryPath, encoding = "utf-8") as entryFile:
+                entry = json.loads(entryFile.read())
+            exitCode = entry["exitCode"]
+            XMLCode = entry.get("xml")
+            errorDetail = entry.get("detail")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if exitCode == 0 and isinstance(XMLCode, str):
+            self._touch_entry(entryPath)
+            return XMLCode
+        if isinstance(exitCode, int) and exitCode in CACHEABLE_ERRORS:
+            self._touch_entry(entryPath)
+            raise CACHEABLE_ERRORS[exitCode](errorDetail)
+        return None
+
+    def store_result(self, key: str, XMLCode: str):
+        """
+        Uloží XML výstup úspěšné analýzy.
+
+        Parametry:
+            - key (str): Klíč záznamu.
+            - XMLCode (str): XML výstup analýzy.
+        """
+        self._write_entry(key, {"exitCode": 0, "xml": XMLCode})
+
+    def store_error(self, key: str, exception: Exception):
+        """
+        Uloží chybu analýzy, pokud je jednoznačně daná zdrojovým kódem
+        (lexikální, syntaktická a sémantické chyby), ostatní se neukládají.
+
+        Parametry:
+            - key (str): Klíč záznamu.
+            - exception (Exception): Výjimka vzniklá při analýze.
+        """
+        if isinstance(exception, CustomError) and exception.errorCode in CACHEABLE_ERRORS:
+            self._write_entry(key, {"exitCode": exception.errorCode, "detail": exception.errorDetail})
+
+    def evict(self):
+        """
+        Projde adresář mezipaměti, odstraní pozůstatky přerušených zápisů
+        a při překročení maximální velikosti odstraní nejdéle nepoužité
+        záznamy, dokud velikost neklesne na `EVICTION_TARGET_RATIO` maxima.
+        """
+        entries = []
+        totalSize = 0
+        now = time.time()
+        try:
+            with os.scandir(self.directory) as directoryEntries:
+                for directoryEntry in directoryEntries:
+                    try:
+                        status = directoryEntry.stat()
+                        if directoryEntry.name.endswith(ENTRY_SUFFIX):
+                            entries.append((status.st_mtime_ns, status.st_size, directoryEntry.path))
+                            totalSize += status.st_size
+                        elif (directoryEntry.name.endswith(TEMPORARY_SUFFIX)
+                              and now - status.st_mtime > STALE_TEMPORARY_AGE):
+                            os.remove(directoryEntry.path)
+                    except OSError:
+                        continue  # záznam mezitím odstranil jiný proces
+        except OSError:
+            return
+
+        if totalSize > self.maxSize:
+            entries.sort()
+            targetSize = self.maxSize * EVICTION_TARGET_RATIO
+            for _, size, entryPath in entries:
+                if totalSize <= targetSize:
+                    break
+                try:
+                    os.remove(entryPath)
+                except OSError:
+                    pass
+                totalSize -= size
+        self._estimatedSize = totalSize
+
+    def _get_entry_path(self, key: str) -> str:
+        """
+        Vrátí cestu k souboru záznamu.
+
+        Parametry:
+            - key (str): Klíč záznamu.
+
+        Návratová hodnota:
+            - str: Cesta k souboru záznamu.
+        """
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _touch_entry(self, entryPath: str):
+        """
+        Označí záznam jako naposledy použitý (nastaví čas poslední úpravy).
+
+        Parametry:
+            - entryPath (str): Cesta k souboru záznamu.
+        """
+        try:
+            os.utime(entryPath)
+        except OSError:
+            pass  # záznam mezitím odstranil jiný proces
+
+    def _write_entry(self, key: str, entry: dict):
+        """
+        Atomicky zapíše záznam a případně zmenší mezipaměť. Chyba zápisu
+        není fatální, výsledek pouze nebude uložen.
+
+        Parametry:
+            - key (str): Klíč záznamu.
+            - entry (dict): Obsah záznamu.
+        """
+        data = json.dumps(entry, ensure_ascii = False).encode("utf-8")
+        if len(data) > self.maxSize:
+            return
+
+        temporaryPath = None
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            descriptor, temporaryPath = tempfile.mkstemp(dir = self.directory, prefix = key,
+                                                         suffix = TEMPORARY_SUFFIX)
+            with os.fdopen(descriptor, "wb") as entryFile:
+                entryFile.write(data)
+            os.replace(temporaryPath, self._get_entry_path(key))
+        except OSError:
+            # Mezipaměť je pouze optimalizace, dočasný soubor po sobě uklidíme
+            if temporaryPath is not None and os.path.exists(temporaryPath):
+                os.remove(temporaryPath)
+            return
+
+        # Adresář se prochází jen tehdy, když by odhad velikosti překročil maximum.
+        if self._estimatedSize is None or self._estimatedSize + len(data) > self.maxSize:
+            self.evict()
+        else:
+            self._estimatedSize += len(data)
+
+### konec souboru 'ResultCache.py' ###
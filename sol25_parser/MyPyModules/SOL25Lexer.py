@@ -0,0 +1,378 @@
+"""
+********************************************************************************
+* Název projektu:   Projekt do předmětu IPP 2024/2025:                         *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           SOL25Lexer.py                                              *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Tento soubor obsahuje ručně psaný lexikální analyzátor     *
+*                   jazyka SOL25, který se do LALR parseru knihovny 'lark'     *
+*                   zapojí místo jejího kontextového lexeru. Druh tokenu se    *
+*                   určí jediným vyhledáním prvního znaku v tabulce, konec     *
+*                   tokenu pak jedním jednoduchým regulárním výrazem. Konce    *
+*                   komentářů a řetězcových literálů zná lexer předem z        *
+*                   předběžného průchodu (viz 'LiteralSpans.py'). Tokeny,      *
+*                   jejich pozice i lexikální a syntaktické chyby jsou stejné  *
+*                   jako u kontextového lexeru knihovny 'lark'.                *
+********************************************************************************
+"""
+
+# Import modulů standardní knihovny
+import re  # compile()
+
+# Import vlastních modulů
+from MyPyModules.LarkParser import Lexer, Token, UnexpectedCharacters, UnexpectedToken
+from MyPyModules.LiteralSpans import find_literal_spans
+
+# Bílé znaky (terminál 'WS')
+WHITESPACE_PATTERN = re.compile(r"[ \t\f\r\n]+")
+
+# Komentář (terminál 'COMMENT'), pokud jej nenašel předběžný průchod
+COMMENT_PATTERN = re.compile(r'"[^"]*"')
+
+# Pokračování tokenů, jejichž první znak už určila tabulka prvních znaků
+IDENTIFIER_TAIL_PATTERN = re.compile(r"[A-Za-z0-9_]*")
+CLASS_IDENTIFIER_TAIL_PATTERN = re.compile(r"[A-Za-z0-9]*")
+INT_LITERAL_PATTERN = re.compile(r"[+-]?\d+")
+STRING_LITERAL_PATTERN = re.compile(r"'(?:\\(?:[n'\\])|[^'\\])*'")
+
+# Druhy prvních znaků tokenu
+OTHER_START = 0
+IDENTIFIER_START = 1
+CLASS_IDENTIFIER_START = 2
+INT_LITERAL_START = 3
+STRING_LITERAL_START = 4
+COLON_START = 5
+PUNCTUATION_START = 6
+IGNORED_START = 7
+
+# Jednoznakové terminály gramatiky SOL25 (kromě ':', viz `COLON_START`)
+PUNCTUATION_TERMINALS = {
+    ";": "_SEMICOLON",
+    "(": "_LEFT_ROUND_BRACKET",
+    ")": "_RIGHT_ROUND_BRACKET",
+    "{": "_LEFT_CURLY_BRACKET",
+    "}": "_RIGHT_CURLY_BRACKET",
+    "[": "_LEFT_SQUARE_BRACKET",
+    "]": "_RIGHT_SQUARE_BRACKET",
+    "|": "_PIPE",
+    ".": "_DOT",
+}
+
+# Klíčová slova, tj. řetězcové terminály, které celé odpovídají i terminálu 'ID'
+KEYWORD_TERMINALS = {
+    "class": "_CLASS",
+    "self": "SELF",
+    "super": "SUPER",
+    "nil": "NIL",
+    "true": "TRUE",
+    "false": "FALSE",
+}
+KEYWORD_TERMINAL_NAMES = frozenset(KEYWORD_TERMINALS.values())
+
+# Terminály, které parser nedostává (bílé znaky a komentáře)
+IGNORED_TERMINALS = frozenset({"WS", "COMMENT"})
+
+# Tabulka druhů prvních znaků (znaky, které v ní chybí, jsou `OTHER_START`)
+FIRST_CHARACTER_KINDS = {}
+for character in "abcdefghijklmnopqrstuvwxyz_":
+    FIRST_CHARACTER_KINDS[character] = IDENTIFIER_START
+for character in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    FIRST_CHARACTER_KINDS[character] = CLASS_IDENTIFIER_START
+for character in "0123456789+-":
+    FIRST_CHARACTER_KINDS[character] = INT_LITERAL_START
+for character in PUNCTUATION_TERMINALS:
+    FIRST_CHARACTER_KINDS[character] = PUNCTUATION_START
+FIRST_CHARACTER_KINDS["'"] = STRING_LITERAL_START
+FIRST_CHARACTER_KINDS[":"] = COLON_START
+for character in ' \t\f\r\n"':
+    FIRST_CHARACTER_KINDS[character] = IGNORED_START
+
+# Znaky, kterými může pokračovat terminál 'SELECTOR_ID' za dvojtečkou
+SELECTOR_ID_STARTS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+
+
+class SOL25Lexer(Lexer):
+    """
+    Třída `SOL25Lexer` je lexikální analyzátor jazyka SOL25 s rozhraním
+    lexeru knihovny 'lark'. Stejně jako kontextový lexer knihovny 'lark'
+    rozpoznává v každém stavu LALR parseru pouze terminály, které parser
+    v daném stavu přijímá (např. 'x:=' je v příkazu '<id> :=', ale v
+    zasílání zprávy '<id:> ='). Pokud ve stavu žádný terminál neodpovídá,
+    vstup se zkusí rozpoznat všemi terminály: úspěch znamená syntaktickou
+    chybu (`UnexpectedToken`), jinak jde o lexikální chybu
+    (`UnexpectedCharacters`).
+
+    Atributy:
+        - literalSpans (LiteralSpans | None): Předběžný průchod právě parsovaného
+                                              kódu (nastavuje jej `LarkParser`
+                                              jen po dobu jednoho parsování).
+        - _contexts (dict): Množina přijímaných terminálů pro každý stav parseru.
+        - _rootAccepts (frozenset): Množina všech terminálů gramatiky.
+        - _terminalsByName (dict): Definice terminálů podle názvu (pro chybová hlášení).
+
+    Metody:
+        - __init__(lexerConf, states): Připraví množiny terminálů stavů parseru.
+        - lex(lexerState, parserState): Generuje tokeny pro parser.
+        - _match(text, position, accepts): Rozpozná jeden token.
+        - _raise_error(lexerState, parserState, accepts, position, line, lineStart):
+                Vyvolá lexikální nebo syntaktickou chybu.
+    """
+
+    def __init__(self, lexerConf, states):
+        """
+        Připraví množiny terminálů přijímaných v jednotlivých stavech parseru.
+
+        Parametry:
+            - lexerConf (LexerConf): Konfigurace lexeru parseru 'lark'.
+            - states (dict): Akce LALR parseru pro každý stav (klíči jsou
+                             názvy terminálů a neterminálů).
+        """
+        self.literalSpans = None
+        self._terminalsByName = lexerConf.terminals_by_name
+        self._rootAccepts = frozenset(self._terminalsByName)
+        contextsByAccepts = {}
+        self._contexts = {}
+        for state, actions in states.items():
+            accepts = self._rootAccepts.intersection(actions)
+            self._contexts[state] = contextsByAccepts.setdefault(accepts, accepts)
+
+    def lex(self, lexerState, parserState):
+        """
+        Generuje tokeny od aktuální pozice `lexerState`. Pozice a číslo řádku
+        se po každém tokenu zapisují zpět do `lexerState.line_ctr`, aby šlo
+        v lexikální analýze pokračovat i po zotavení parseru z chyby.
+
+        Parametry:
+            - lexerState (LexerState): Zdrojový text a aktuální pozice v něm.
+            - parserState (ParserState | None): Stav parseru, `None` rozpoznává
+                                                všechny terminály gramatiky.
+
+        Návratová hodnota:
+            - Iterator[Token]: Tokeny zdrojového textu (bez bílých znaků a komentářů).
+
+        Výjimky:
+            - UnexpectedCharacters: Pokud znaky neodpovídají žádnému terminálu.
+            - UnexpectedToken: Pokud token neodpovídá stavu parseru.
+        """
+        text = lexerState.text
+        length = len(text)
+        lineCounter = lexerState.line_ctr
+        position = lineCounter.char_pos
+        line = lineCounter.line
+        lineStart = lineCounter.line_start_pos
+        get_kind = FIRST_CHARACTER_KINDS.get
+        skip_whitespace = WHITESPACE_PATTERN.match
+        literalSpans = self.literalSpans
+        if literalSpans is None or literalSpans.text is not text:
+            literalSpans = find_literal_spans(text)
+        literalEnds = literalSpans.ends
+        match_identifier_tail = IDENTIFIER_TAIL_PATTERN.match
+        match = self._match
+        contexts = self._contexts
+        rootAccepts = self._rootAccepts
+
+        while position < length:
+            character = text[position]
+
+            # Bílé znaky a komentáře se přeskočí (samotná mezera bez regulárního výrazu,
+            # komentář až za konec nalezený předběžným průchodem)
+            if character == " ":
+                position += 1
+                continue
+            kind = get_kind(character, OTHER_START)
+            if kind == IGNORED_START:
+                if character == '"':
+                    end = literalEnds.get(position)
+                    # Za neuzavřeným literálem předběžný průchod skončil (lexer
+                    # pokračuje dál jen při zotavení z chyb)
+                    if end is None:
+                        comment = COMMENT_PATTERN.match(text, position)
+                        end = position if comment is None else comment.end()
+                else:
+                    end = skip_whitespace(text, position).end()
+                if end != position:
+                    newlineCount = text.count("\n", position, end)
+                    if newlineCount:
+                        line += newlineCount
+                        lineStart = text.rindex("\n", position, end) + 1
+                    position = end
+                    continue
+
+            accepts = rootAccepts if parserState is None else contexts[parserState.position]
+            # Nejčastější tokeny (oddělovače, identifikátory a literály) se rozpoznají
+            # přímo, ostatní a chybové případy řeší `_match()`
+            if kind == PUNCTUATION_START and PUNCTUATION_TERMINALS[character] in accepts:
+                tokenType = PUNCTUATION_TERMINALS[character]
+                end = position + 1
+            elif kind == IDENTIFIER_START and "ID" in accepts:
+                end = match_identifier_tail(text, position + 1).end()
+                if "ID_SELECTOR" in accepts and text.startswith(":", end):
+                    tokenType = "ID_SELECTOR"
+                    end += 1
+                else:
+                    tokenType = KEYWORD_TERMINALS.get(text[position:end], "ID")
+                    if tokenType not in accepts:
+                        tokenType = "ID"
+            # Literál bez escape sekvencí končí tam, kde jej našel předběžný průchod
+            elif (kind == STRING_LITERAL_START and position in literalEnds and "STRING_LITERAL" in accepts
+                  and text.find("\\", position, literalEnds[position]) == -1):
+                tokenType = "STRING_LITERAL"
+                end = literalEnds[position]
+            else:
+                result = match(text, position, accepts)
+                if result is None:
+                    self._raise_error(lexerState, parserState, accepts, position, line, lineStart)
+                tokenType, end = result
+            value = text[position:end]
+            column = position - lineStart + 1
+
+            # Jediný víceřádkový token je řetězcový literál
+            if kind == STRING_LITERAL_START and "\n" in value:
+                token = Token(tokenType, value, position, line, column)
+                line += value.count("\n")
+                lineStart = position + value.rindex("\n") + 1
+                token.end_line = line
+                token.end_column = end - lineStart + 1
+                token.end_pos = end
+            else:
+                token = Token(tokenType, value, position, line, column, line, column + end - position, end)
+            position = end
+
+            lineCounter.char_pos = position
+            lineCounter.line = line
+            lineCounter.line_start_pos = lineStart
+            lineCounter.column = position - lineStart + 1
+            lexerState.last_token = token
+            yield token
+
+        lineCounter.char_pos = position
+        lineCounter.line = line
+        lineCounter.line_start_pos = lineStart
+        lineCounter.column = position - lineStart + 1
+
+    def _match(self, text, position, accepts):
+        """
+        Rozpozná jeden token začínající na pozici `position`. Mezi terminály
+        se stejným prvním znakem rozhoduje stejné pořadí jako v knihovně
+        'lark' (delší vzor má přednost, klíčové slovo se z 'ID' rozpozná až
+        podle celé hodnoty).
+
+        Parametry:
+            - text (str): Zdrojový text.
+            - position (int): Pozice prvního znaku tokenu.
+            - accepts (frozenset): Názvy terminálů, které lze rozpoznat.
+
+        Návratová hodnota:
+            - tuple | None: Dvojice (název terminálu, konec tokenu), nebo `None`.
+        """
+        character = text[position]
+        kind = FIRST_CHARACTER_KINDS.get(character, OTHER_START)
+
+        if kind == IDENTIFIER_START:
+            end = IDENTIFIER_TAIL_PATTERN.match(text, position + 1).end()
+            if "ID_SELECTOR" in accepts and text.startswith(":", end):
+                return "ID_SELECTOR", end + 1
+            if "ID" in accepts:
+                keyword = KEYWORD_TERMINALS.get(text[position:end])
+                if keyword is not None and keyword in accepts:
+                    return keyword, end
+                return "ID", end
+            # Bez terminálu 'ID' se klíčové slovo rozpozná i jako prefix identifikátoru
+            for keywordValue, keyword in KEYWORD_TERMINALS.items():
+                if keyword in accepts and text.startswith(keywordValue, position):
+                    return keyword, position + len(keywordValue)
+            return None
+
+        if kind == PUNCTUATION_START:
+            terminal = PUNCTUATION_TERMINALS[character]
+            return (terminal, position + 1) if terminal in accepts else None
+
+        if kind == COLON_START:
+            nextCharacter = text[position + 1:position + 2]
+            if "SELECTOR_ID" in accepts and nextCharacter in SELECTOR_ID_STARTS:
+                return "SELECTOR_ID", IDENTIFIER_TAIL_PATTERN.match(text, position + 2).end()
+            if "_WALRUS" in accepts and nextCharacter == "=":
+                return "_WALRUS", position + 2
+            return ("_COLON", position + 1) if "_COLON" in accepts else None
+
+        if kind == CLASS_IDENTIFIER_START:
+            if "CID" in accepts:
+                return "CID", CLASS_IDENTIFIER_TAIL_PATTERN.match(text, position + 1).end()
+            return None
+
+        # Terminál 'INT_LITERAL' ('\d') přijímá i desítkové číslice mimo ASCII
+        if kind == INT_LITERAL_START or (kind == OTHER_START and character.isdecimal()):
+            literal = INT_LITERAL_PATTERN.match(text, position)
+            if literal is not None and "INT_LITERAL" in accepts:
+                return "INT_LITERAL", literal.end()
+            return None
+
+        if kind == STRING_LITERAL_START:
+            literal = STRING_LITERAL_PATTERN.match(text, position)
+            if literal is not None and "STRING_LITERAL" in accepts:
+                return "STRING_LITERAL", literal.end()
+            return None
+
+        return None
+
+    def _raise_error(self, lexerState, parserState, accepts, position, line, lineStart):
+        """
+        Vyvolá chybu na pozici, kde žádný terminál přijímaný ve stavu parseru
+        neodpovídá vstupu. Stejně jako kontextový lexer knihovny 'lark' zkusí
+        vstup rozpoznat všemi terminály gramatiky.
+
+        Parametry:
+            - lexerState (LexerState): Zdrojový text a aktuální pozice v něm.
+            - parserState (ParserState | None): Stav parseru.
+            - accepts (frozenset): Názvy terminálů přijímaných ve stavu parseru.
+            - position (int): Pozice chyby.
+            - line (int): Číslo řádku pozice chyby.
+            - lineStart (int): Pozice začátku řádku.
+
+        Výjimky:
+            - UnexpectedToken: Pokud na pozici začíná jiný terminál gramatiky.
+            - UnexpectedCharacters: Pokud na pozici nezačíná žádný terminál.
+        """
+        text = lexerState.text
+        lineCounter = lexerState.line_ctr
+        lineCounter.char_pos = position
+        lineCounter.line = line
+        lineCounter.line_start_pos = lineStart
+        lineCounter.column = position - lineStart + 1
+        # Klíčová slova rozpoznávaná přes 'ID' 'lark' mezi očekávané terminály nepočítá
+        allowed = accepts - IGNORED_TERMINALS
+        if "ID" in accepts:
+            allowed = allowed - KEYWORD_TERMINAL_NAMES
+        allowed = allowed or {"<END-OF-FILE>"}
+        lastToken = lexerState.last_token
+
+        result = None
+        if parserState is not None:
+            result = self._match(text, position, self._rootAccepts)
+        if result is None:
+            raise UnexpectedCharacters(text, position, line, lineCounter.column, allowed = allowed,
+                                       token_history = lastToken and [lastToken], state = parserState,
+                                       terminals_by_name = self._terminalsByName)
+
+        # Token rozpoznaný všemi terminály se stejně jako v 'lark' považuje za přečtený
+        tokenType, end = result
+        value = text[position:end]
+        token = Token(tokenType, value, position, line, lineCounter.column)
+        lineCounter.char_pos = end
+        newlineCount = value.count("\n")
+        if newlineCount:
+            lineCounter.line += newlineCount
+            lineCounter.line_start_pos = position + value.rindex("\n") + 1
+        lineCounter.column = end - lineCounter.line_start_pos + 1
+        token.end_line = lineCounter.line
+        token.end_column = lineCounter.column
+        token.end_pos = end
+        raise UnexpectedToken(token, allowed, state = parserState, token_history = [lastToken],
+                              terminals_by_name = self._terminalsByName)
+
+### konec souboru 'SOL25Lexer.py' ###
@@ -7,24 +7,64 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            19.02.2025                                                 *
-* Poslední změna:   24.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento soubor implementuje sémantický analyzátor pro jazyk  *
 *                   SOL25. Analyzátor prochází abstraktní syntaktický strom    *
 *                   (AST) a kontroluje sémantické chyby (např. nedefinované    *
 *                   symboly, kolize proměnných, nesprávný počet parametrů      *
-*                   metod a další).                                            *
+*                   metod a další). Ve sbíracím režimu analyzátor chyby pouze  *
+*                   zaznamenává a nahlásí je všechny najednou.                 *
 ********************************************************************************
 """
 
 # Import vlastních modulů
 from MyPyModules.AbstractSyntaxTree import ASTNodes, ASTNodeVisitor
 from MyPyModules.CustomErrors import (
-    SemanticArityError, SemanticMainRunError, SemanticOtherError,
+    CustomError, SemanticArityError, SemanticMainRunError, SemanticOtherError,
     SemanticUndefinedSymbolError, SemanticVariableCollisionError)
 from MyPyModules.Symtable import Symtable
 
 
+#######################################################################
+# Druhy položek zásobníku iterativního průchodu (`_visit_subtree`).
+# Druh se určuje podle typu položky a pro každý typ se vypočítá jen
+# jednou, takže průchod nemusí u každého uzlu volat řadu `isinstance()`
+# (typy pohledů plochého AST se zařadí podle své nadtřídy z `ASTNodes`).
+#######################################################################
+EXPRESSION_KIND = 1
+IDENTIFIER_KIND = 2
+LITERAL_KIND = 3
+ASSIGN_KIND = 4
+BLOCK_KIND = 5
+SEND_CHECK_KIND = 6
+OTHER_KIND = 0
+
+NODE_KINDS = {type(None): OTHER_KIND, tuple: SEND_CHECK_KIND}
+
+def get_node_kind(nodeType: type) -> int:
+    """
+    Určí (a uloží) druh položky zásobníku podle jejího typu.
+
+    Parametry:
+        - nodeType (type): Typ uzlu AST nebo značky.
+
+    Návratová hodnota:
+        - int: Druh položky (`*_KIND`).
+    """
+    for nodeClass, kind in ((ASTNodes.ExpressionNode, EXPRESSION_KIND),
+                            (ASTNodes.IdentifierNode, IDENTIFIER_KIND),
+                            (ASTNodes.LiteralNode, LITERAL_KIND),
+                            (ASTNodes.AssignNode, ASSIGN_KIND),
+                            (ASTNodes.BlockNode, BLOCK_KIND)):
+        if issubclass(nodeType, nodeClass):
+            break
+    else:
+        kind = OTHER_KIND
+    NODE_KINDS[nodeType] = kind
+    return kind
+
+
 class SemanticAnalyser(ASTNodeVisitor):
     """
     Třída `SemanticAnalyser` provádí sémantickou analýzu AST.
@@ -32,10 +72,18 @@ class SemanticAnalyser(ASTNodeVisitor):
     Atributy:
         - _symtable: Instance tabulky symbolů.
         - _currentClass: Kontext aktuálně analyzované třídy.
+        - _stack: Zásobník iterativního průchodu a jeho metody `pop` a `append`
+                  (vytváří se jednou pro celou analýzu).
+        - _maxErrors: Počet hlášených chyb ve sbíracím režimu (`None` ukončí
+                      analýzu první chybou).
+        - _errors: Zaznamenané chyby jako trojice (poloha, pořadí, chyba),
+                   `None` mimo sbírací režim.
+        - _errorLocation: Poloha kontrolované části programu jako dvojice
+                          (pořadí třídy, 0 = hlavička třídy / 1 = tělo třídy).
 
     Metody:
         - __init__: Inicializuje sémantický analyzátor a tabulku symbolů.
-        - analyse_semantic: Spustí rekurzivní sémantickou analýzu programu.
+        - analyse_semantic: Spustí sémantickou analýzu programu.
         - visit_program_node: Návštěvník uzlu programu.
         - visit_class_node: Návštěvník uzlu třídy.
         - visit_method_node: Návštěvník uzlu metody.
@@ -44,29 +92,52 @@ class SemanticAnalyser(ASTNodeVisitor):
         - visit_expression_node: Návštěvník uzlu výrazu.
         - visit_identifier_node: Návštěvník uzlu proměnné.
         - visit_literal_node: Návštěvník uzlu literálu.
+        - _visit_subtree: Iterativně projde podstrom bloku, přiřazení nebo výrazu.
+        - _enter_block_scope: Vstoupí do rámce bloku a definuje jeho parametry.
+        - _check_assign_target: Zkontroluje a definuje cíl přiřazení.
+        - _check_selector: Zkontroluje selektor zaslané zprávy.
         - _handle_class_method: Zpracuje volání třídní metody.
         - _handle_instance_method: Zpracuje volání instanční metody.
         - _check_combined_selector: Zkontroluje složený selektor metod.
         - _get_expected_param_count: Získá očekávaný počet parametrů pro složený selektor.
+        - _report_error: Vyvolá, nebo ve sbíracím režimu zaznamená chybu.
+        - _raise_collected_errors: Vyvolá zaznamenané chyby.
     """
 
-    def __init__(self):
+    def __init__(self, maxErrors: int | None = None):
         """
         Inicializuje sémantický analyzátor a tabulku symbolů.
+
+        Parametry:
+            - maxErrors (int | None): Sbírací režim: analýza po chybě pokračuje
+                                      a nahlásí až `maxErrors` chyb v pořadí
+                                      podle zdrojového kódu (výchozí `None`,
+                                      tj. analýzu ukončí první chyba).
         """
         self._symtable = Symtable()
         self._currentClass = None
+        self._maxErrors = maxErrors
+        self._errors = None
+        self._errorLocation = (0, 0)
+        # Zásobník iterativního průchodu sdílí všechna volání `_visit_subtree()`
+        # (každé zpracuje jen položky nad svou počáteční výškou zásobníku).
+        stack = []
+        self._stack = (stack, stack.pop, stack.append)
 
     def analyse_semantic(self, programNode: ASTNodes.ProgramNode):
         """
-        Spustí rekurzivní sémantickou analýzu programu od kořene AST.
+        Spustí sémantickou analýzu programu od kořene AST.
 
         Parametry:
             - programNode (ASTNodes.ProgramNode): Kořenový uzel AST (programu).
 
         Výjimky:
             - SemanticMainRunError: Pokud chybí třída 'Main' nebo metoda 'run'.
+            - CustomError: Ve sbíracím režimu chyba třídy první chyby podle
+                           zdrojového kódu s výpisem všech chyb v detailu.
         """
+        self._errors = None if self._maxErrors is None else []
+
         # Načteme vestavěné třídy a metody
         self._symtable.classManager.load_builtin_symbols()
 
@@ -74,17 +145,52 @@ class SemanticAnalyser(ASTNodeVisitor):
         self.visit_program_node(programNode)
 
         # Kontrola existence povinné třídy 'Main' a metody 'run'
+        # (chyby celého programu se řadí za chyby všech tříd)
+        self._errorLocation = (len(programNode.classNodeList), 0)
         mainClass = self._symtable.classManager.get_class_symbol("Main")
         if mainClass is None:
-            raise SemanticMainRunError("Class 'Main' is missing.")
-
-        runMethod = self._symtable.classManager.get_method_symbol("Main", "run")
-        if runMethod is None:
-            raise SemanticMainRunError("Class 'Main' is missing method 'run'.")
+            self._report_error(SemanticMainRunError("Class 'Main' is missing."))
+        else:
+            runMethod = self._symtable.classManager.get_method_symbol("Main", "run")
+            if runMethod is None:
+                self._report_error(SemanticMainRunError("Class 'Main' is missing method 'run'."))
 
         # Kontrola cyklické dědičnosti
         self.check_cyclic_inheritance()
 
+        if self._errors:
+            self._raise_collected_errors()
+
+    def _report_error(self, error: CustomError):
+        """
+        Ohlásí sémantickou chybu. Mimo sbírací režim ji vyvolá, jinak ji
+        zaznamená s polohou kontrolované části programu a analýza pokračuje.
+
+        Parametry:
+            - error (CustomError): Sémantická chyba.
+
+        Výjimky:
+            - CustomError: Mimo sbírací režim předaná chyba.
+        """
+        if self._errors is None:
+            raise error
+        self._errors.append((self._errorLocation, len(self._errors), error))
+
+    def _raise_collected_errors(self):
+        """
+        Seřadí zaznamenané chyby podle zdrojového kódu (třídy v pořadí
+        definice, hlavička třídy před jejím tělem, uvnitř třídy v pořadí
+        průchodu) a vyvolá chybu třídy první z nich. Detail obsahuje až
+        `_maxErrors` chyb, každou na samostatném řádku s jejím kódem.
+
+        Výjimky:
+            - CustomError: Chyba třídy první zaznamenané chyby.
+        """
+        self._errors.sort(key = lambda entry: entry[:2])
+        details = [f"error {error.errorCode}: {error.errorDetail}"
+                   for _, _, error in self._errors[:self._maxErrors]]
+        raise type(self._errors[0][2])("\n".join(details))
+
     def visit_program_node(self, node: ASTNodes.ProgramNode):
         """
         Návštěvník uzlu programu.
@@ -92,13 +198,34 @@ class SemanticAnalyser(ASTNodeVisitor):
         Parametry:
             - node (ASTNodes.ProgramNode): Uzel reprezentující celý program.
         """
-        for classNode in node.classNodeList:
-            self._symtable.classManager.set_class_as_defined(classNode)
+        classManager = self._symtable.classManager
+        for classIndex, classNode in enumerate(node.classNodeList):
+            self._errorLocation = (classIndex, 0)
+            try:
+                classManager.set_class_as_defined(classNode)
+            except CustomError as e:
+                self._report_error(e)
 
         # Projedeme všechny třídy jednu po druhé
-        for classNode in node.classNodeList:
+        for classIndex, classNode in enumerate(node.classNodeList):
+            self._errorLocation = (classIndex, 1)
             self.visit_class_node(classNode)
-        self._symtable.classManager.are_all_classes_defined()
+
+        if self._errors is None:
+            classManager.are_all_classes_defined()
+            return
+
+        # Ve sbíracím režimu se nedefinovaný rodič hlásí u první třídy, která jej dědí
+        reportedParents = set()
+        for classIndex, classNode in enumerate(node.classNodeList):
+            parentSymbol = classManager.get_class_symbol(classNode.perentIdentifier)
+            if parentSymbol is not None and not parentSymbol.isDefined and \
+               parentSymbol.identifier not in reportedParents:
+                reportedParents.add(parentSymbol.identifier)
+                self._errorLocation = (classIndex, 0)
+                self._report_error(SemanticUndefinedSymbolError(
+                    f"Class '{parentSymbol.identifier}' is not defined."
+                    ))
 
     def visit_class_node(self, node: ASTNodes.ClassNode):
         """
@@ -131,11 +258,12 @@ class SemanticAnalyser(ASTNodeVisitor):
         """
         # Kontrola chybného výskytu metody mimo třídu
         if self._currentClass is None:
-            raise SemanticUndefinedSymbolError(f"Method {node.selector} is defined out of class.")
+            self._report_error(SemanticUndefinedSymbolError(f"Method {node.selector} is defined out of class."))
+            return
 
         # Kontrola, že metoda 'run' je bezparametrická
         if node.selector == "run" and len(getattr(node.blockNode, 'parameterNodeList', [])) > 0:
-            raise SemanticArityError(f"Method 'run' must have no parameters.")
+            self._report_error(SemanticArityError(f"Method 'run' must have no parameters."))
 
         # Kontrola override, zda se nemění počet parametrů
         classSymbol = self._symtable.classManager.get_class_symbol(self._currentClass)
@@ -146,15 +274,18 @@ class SemanticAnalyser(ASTNodeVisitor):
             if parentMethod is not None:
                 paramCount = len(node.blockNode.parameterNodeList)
                 if parentMethod.get_param_count() != paramCount:
-                    raise SemanticArityError(
+                    self._report_error(SemanticArityError(
                         f"Override of method '{node.selector}' in class '{self._currentClass}' "
                         f"has incorrect arity. Original method has arity '{parentMethod.get_param_count()}'; "
                         f"new method has arity '{paramCount}'."
-                        )
+                        ))
 
         # Vložíme definici metody do tabulky symbolů.
         # (Pozn. případná kontrola korektnosti override (arity) se provede uvnitř tabulky symbolů.)
-        self._symtable.classManager.insert_method_symbol(self._currentClass, node.selector, node.blockNode)
+        try:
+            self._symtable.classManager.insert_method_symbol(self._currentClass, node.selector, node.blockNode)
+        except CustomError as e:
+            self._report_error(e)
 
         # Analýza metody => vstup do nového lokálního rozsahu platnosti (rámce).
         self._symtable.scopeManager.enter_new_scope()
@@ -173,7 +304,8 @@ class SemanticAnalyser(ASTNodeVisitor):
 
     def visit_block_node(self, node: ASTNodes.BlockNode):
         """
-        Návštěvník uzlu bloku.
+        Návštěvník uzlu bloku. Podstrom bloku se prochází iterativně
+        (viz `_visit_subtree`).
 
         Parametry:
             - node (ASTNodes.BlockNode): Uzel bloku.
@@ -181,35 +313,12 @@ class SemanticAnalyser(ASTNodeVisitor):
         Výjimky:
             - SemanticVariableCollisionError: Pokud dojde ke kolizi formálních parametrů.
         """
-        # Analýza bloku => vstup do nového lokálního rozsahu platnosti (rámce).
-        self._symtable.scopeManager.enter_new_scope()
-
-        # Zpracujeme formální parametry bloku (pokud existují).
-        for parameter in node.parameterNodeList:
-            # Kontrola kolize formálního parametru s jiným symbolem
-            # (Pozn. pseudoproměnné 'self' a 'super' jsou ošetřeny v tabulce symbolů.)
-            if self._symtable.scopeManager.is_defined(parameter):
-                if self._symtable.scopeManager.is_formal_parameter(parameter):
-                    raise SemanticOtherError(
-                        f"Trying to redefine formal parameter '{parameter}'."
-                        )
-                else:
-                    raise SemanticVariableCollisionError(
-                        f"Collision of formal parameter '{parameter}'."
-                        )
-            # Definice formálního parametru v lokálním rámci
-            self._symtable.scopeManager.define_formal_parameter(parameter)
-
-        # Projdeme všechny příkazy v těle bloku
-        for statement in node.statementNodeList:
-            statement.visit_by(self)
-
-        # Konec analýzy bloku => výstup z lokálního rámce
-        self._symtable.scopeManager.exit_current_scope()
+        self._visit_subtree(node)
 
     def visit_assign_node(self, node: ASTNodes.AssignNode):
         """
-        Návštěvník uzlu přiřazení.
+        Návštěvník uzlu přiřazení. Podstrom přiřazení se prochází iterativně
+        (viz `_visit_subtree`).
 
         Parametry:
             - node (ASTNodes.AssignNode): Uzel přiřazení.
@@ -218,23 +327,12 @@ class SemanticAnalyser(ASTNodeVisitor):
             - SemanticOtherError: Při pokusu o přiřazení do formálního parametru.
             - SemanticVariableCollisionError: Pokud dojde ke kolizi formálních parametrů.
         """
-        # Kontrola kolize přiřazení do formálního parametru
-        identifier = node.identifierNode.identifier
-        if self._symtable.scopeManager.is_formal_parameter(identifier):
-            raise SemanticVariableCollisionError(
-                f"Assignment to formal parameter ({identifier}) is not allowed."
-                )
-        # Pokud proměnná nebyla definována v aktuálním (či nadřazeném) rozsahu, definujeme ji.
-        if not self._symtable.scopeManager.is_defined(identifier):
-            self._symtable.scopeManager.define_variable(identifier)
-
-        # Analyzujeme přiřazení
-        node.identifierNode.visit_by(self)  # L-hodnota
-        node.exprNode.visit_by(self)  # R-hodnota
+        self._visit_subtree(node)
 
     def visit_expression_node(self, node: ASTNodes.ExpressionNode):
         """
-        Návštěvník uzlu výrazu.
+        Návštěvník uzlu výrazu. Podstrom výrazu se prochází iterativně
+        (viz `_visit_subtree`).
 
         Parametry:
             - node (ASTNodes.ExpressionNode): Uzel výrazu.
@@ -245,32 +343,132 @@ class SemanticAnalyser(ASTNodeVisitor):
             - SemanticArityError: Pokud počet argumentů metody neodpovídá
                                   očekávanému počtu.
         """
-        # Projdeme všechny podvýrazy
-        if isinstance(node.receiver, ASTNodes.LiteralNode):
-            self.visit_literal_node(node.receiver)  # literál
-            receiverId = node.receiver.literalType
-        elif isinstance(node.receiver, ASTNodes.IdentifierNode):
-            self.visit_identifier_node(node.receiver)  # třída, proměnná
-            receiverId = node.receiver.identifier
-        elif isinstance(node.receiver, ASTNodes.BlockNode):
-            self.visit_block_node(node.receiver)  # blokový literál
-            return
-        elif isinstance(node.receiver, ASTNodes.ExpressionNode):
-            self.visit_expression_node(node.receiver)  # odeslání zprávy
-            return
-        else:
-            receiverId = str(node.receiver)  # jiný typ uzlu (např. 'self', 'super')
+        self._visit_subtree(node)
 
-        # Projdeme všechny argumenty, které se předávají metodě
-        for arg in node.argNodeList:
-            arg.visit_by(self)
+    def _visit_subtree(self, rootNode: ASTNodes):
+        """
+        Projde podstrom bloku, přiřazení nebo výrazu pomocí explicitního
+        zásobníku místo rekurze, takže hloubka zanoření není omezena
+        limitem rekurze interpretu. Pořadí kontrol (a tedy i první nalezená
+        chyba) odpovídá rekurzivnímu průchodu do hloubky:
+            - blok: vstup do rámce, parametry, příkazy v pořadí, výstup z rámce,
+            - přiřazení: L-hodnota, R-hodnota,
+            - výraz: příjemce, argumenty v pořadí, kontrola selektoru.
+        Kromě uzlů se na zásobník ukládají značky `None` (výstup z rámce
+        bloku) a dvojice (uzel výrazu, identifikátor příjemce) pro kontrolu
+        selektoru po průchodu argumenty.
+
+        Parametry:
+            - rootNode (ASTNodes): Kořen procházeného podstromu.
+
+        Výjimky:
+            - SemanticUndefinedSymbolError: Nedefinovaná proměnná, třída nebo metoda.
+            - SemanticArityError: Nesoulad v počtu argumentů.
+            - SemanticVariableCollisionError: Kolize proměnné nebo parametru.
+            - SemanticOtherError: Redefinice formálního parametru.
+        """
+        scopeManager = self._symtable.scopeManager
+        getNodeKind = NODE_KINDS.get
+        visitIdentifier = self.visit_identifier_node
+        visitLiteral = self.visit_literal_node
+        stack, pop, push = self._stack
+        base = len(stack)
+        push(rootNode)
+
+        while len(stack) > base:
+            node = pop()
+            kind = getNodeKind(type(node))
+            if kind is None:
+                kind = get_node_kind(type(node))
+
+            if kind == ASSIGN_KIND:
+                # Analyzujeme přiřazení, R-hodnotu zpracujeme hned (bez zásobníku)
+                self._check_assign_target(node)  # L-hodnota
+                node = node.exprNode  # R-hodnota
+                kind = getNodeKind(type(node))
+                if kind is None:
+                    kind = get_node_kind(type(node))
+
+            if kind == EXPRESSION_KIND:
+                # Příjemce, který je sám odesláním zprávy, se projde místo
+                # celého výrazu (argumenty ani selektor se u něj nekontrolují).
+                receiver = node.receiver
+                receiverKind = getNodeKind(type(receiver))
+                if receiverKind is None:
+                    receiverKind = get_node_kind(type(receiver))
+                while receiverKind == EXPRESSION_KIND:
+                    node = receiver
+                    receiver = node.receiver
+                    receiverKind = getNodeKind(type(receiver))
+                    if receiverKind is None:
+                        receiverKind = get_node_kind(type(receiver))
+
+                if receiverKind == LITERAL_KIND:
+                    visitLiteral(receiver)  # literál
+                    receiverId = receiver.literalType
+                elif receiverKind == IDENTIFIER_KIND:
+                    visitIdentifier(receiver)  # třída, proměnná
+                    receiverId = receiver.identifier
+                elif receiverKind == BLOCK_KIND:
+                    receiverId = None  # blokový literál se projde místo celého výrazu
+                else:
+                    receiverId = str(receiver)  # jiný typ uzlu (např. 'self', 'super')
+
+                if receiverKind != BLOCK_KIND:
+                    # Argumenty (identifikátory a literály) na začátku seznamu
+                    # zkontrolujeme rovnou, ostatní se uloží na zásobník.
+                    argNodeList = node.argNodeList
+                    leafCount = 0
+                    for arg in argNodeList:
+                        argKind = getNodeKind(type(arg))
+                        if argKind is None:
+                            argKind = get_node_kind(type(arg))
+                        if argKind == IDENTIFIER_KIND:
+                            visitIdentifier(arg)
+                        elif argKind == LITERAL_KIND:
+                            visitLiteral(arg)
+                        else:
+                            break
+                        leafCount += 1
+
+                    # Selektor se kontroluje až po průchodu všemi argumenty.
+                    if leafCount < len(argNodeList):
+                        if node.selector:
+                            push((node, receiverId))
+                        stack.extend(reversed(argNodeList[leafCount:]))
+                    elif node.selector:
+                        if receiverId and receiverId[0].isupper():
+                            self._handle_class_method(node, receiverId)
+                        else:
+                            self._handle_instance_method(node, receiverId)
+                    continue
+
+                node = receiver
+                kind = BLOCK_KIND
+
+            if kind == BLOCK_KIND:
+                # Analýza bloku => vstup do nového lokálního rozsahu platnosti (rámce).
+                self._enter_block_scope(node)
+
+                # Příkazy v těle bloku a po nich výstup z lokálního rámce
+                push(None)
+                stack.extend(node.statementNodeList[::-1])
+
+            elif kind == IDENTIFIER_KIND:
+                visitIdentifier(node)
+
+            elif kind == LITERAL_KIND:
+                visitLiteral(node)
+
+            elif node is None:
+                # Konec analýzy bloku => výstup z lokálního rámce
+                scopeManager.exit_current_scope()
+
+            elif kind == SEND_CHECK_KIND:
+                self._check_selector(*node)
 
-        # Analýza třídních a instančních metod
-        if node.selector:
-            if receiverId and receiverId[0].isupper():
-                self._handle_class_method(node, receiverId)
             else:
-                self._handle_instance_method(node, receiverId)
+                node.visit_by(self)  # jiný typ uzlu
 
     def visit_identifier_node(self, node: ASTNodes.IdentifierNode):
         """
@@ -288,15 +486,15 @@ class SemanticAnalyser(ASTNodeVisitor):
         if identifier[0].isupper():
             # Kontrola existence třídy
             if not self._symtable.classManager.get_class_symbol(identifier):
-                raise SemanticUndefinedSymbolError(
+                self._report_error(SemanticUndefinedSymbolError(
                     f"Class '{identifier}' is not defined."
-                    )
+                    ))
         else:
             # Kontrola existence proměnné
             if not self._symtable.scopeManager.is_defined(identifier):
-                raise SemanticUndefinedSymbolError(
+                self._report_error(SemanticUndefinedSymbolError(
                     f"Variable '{identifier}' is not defined."
-                    )
+                    ))
 
     def visit_literal_node(self, node: ASTNodes.LiteralNode):
         """
@@ -307,6 +505,77 @@ class SemanticAnalyser(ASTNodeVisitor):
         """
         pass  # Literály mají zřejmou hodnotu, není třeba nic kontrolovat
 
+    def _enter_block_scope(self, node: ASTNodes.BlockNode):
+        """
+        Vstoupí do nového lokálního rámce bloku a definuje v něm formální
+        parametry bloku.
+
+        Parametry:
+            - node (ASTNodes.BlockNode): Uzel bloku.
+
+        Výjimky:
+            - SemanticOtherError: Při redefinici formálního parametru.
+            - SemanticVariableCollisionError: Pokud dojde ke kolizi formálních parametrů.
+        """
+        scopeManager = self._symtable.scopeManager
+        scopeManager.enter_new_scope()
+
+        # Zpracujeme formální parametry bloku (pokud existují).
+        for parameter in node.parameterNodeList:
+            # Kontrola kolize formálního parametru s jiným symbolem
+            # (Pozn. pseudoproměnné 'self' a 'super' jsou ošetřeny v tabulce symbolů.)
+            if scopeManager.is_defined(parameter):
+                if scopeManager.is_formal_parameter(parameter):
+                    self._report_error(SemanticOtherError(
+                        f"Trying to redefine formal parameter '{parameter}'."
+                        ))
+                else:
+                    self._report_error(SemanticVariableCollisionError(
+                        f"Collision of formal parameter '{parameter}'."
+                        ))
+                continue
+            # Definice formálního parametru v lokálním rámci
+            scopeManager.define_formal_parameter(parameter)
+
+    def _check_assign_target(self, node: ASTNodes.AssignNode):
+        """
+        Zkontroluje cíl přiřazení (L-hodnotu) a pokud proměnná dosud není
+        definována, definuje ji v aktuálním rámci.
+
+        Parametry:
+            - node (ASTNodes.AssignNode): Uzel přiřazení.
+
+        Výjimky:
+            - SemanticVariableCollisionError: Při pokusu o přiřazení do formálního parametru.
+        """
+        scopeManager = self._symtable.scopeManager
+
+        # Kontrola kolize přiřazení do formálního parametru
+        identifier = node.identifierNode.identifier
+        if scopeManager.is_formal_parameter(identifier):
+            self._report_error(SemanticVariableCollisionError(
+                f"Assignment to formal parameter ({identifier}) is not allowed."
+                ))
+            return
+        # Pokud proměnná nebyla definována v aktuálním (či nadřazeném) rozsahu, definujeme ji.
+        if not scopeManager.is_defined(identifier):
+            scopeManager.define_variable(identifier)
+        self.visit_identifier_node(node.identifierNode)
+
+    def _check_selector(self, node: ASTNodes.ExpressionNode, receiverId: str):
+        """
+        Zkontroluje selektor zaslané zprávy jako třídní metodu (příjemcem
+        je třída) nebo instanční metodu.
+
+        Parametry:
+            - node (ASTNodes.ExpressionNode): Uzel výrazu.
+            - receiverId (str): Identifikátor příjemce zprávy.
+        """
+        if receiverId and receiverId[0].isupper():
+            self._handle_class_method(node, receiverId)
+        else:
+            self._handle_instance_method(node, receiverId)
+
     def _handle_class_method(self, node, receiverId):
         """
         Zpracuje volání třídní metody.
@@ -319,6 +588,10 @@ class SemanticAnalyser(ASTNodeVisitor):
             - SemanticUndefinedSymbolError: Pokud třída nemá danou metodu.
             - SemanticArityError: Nesoulad v počtu argumentů.
         """
+        # Nedefinovaná třída příjemce už byla ohlášena (jen ve sbíracím režimu)
+        if self._errors is not None and self._symtable.classManager.get_class_symbol(receiverId) is None:
+            return
+
         methodSymbol = self._symtable.classManager.get_method_symbol(receiverId, node.selector)
 
         # Pokud jde o složený selektor
@@ -328,18 +601,19 @@ class SemanticAnalyser(ASTNodeVisitor):
 
         # Kontrola, zda třída obsahuje metodu
         if methodSymbol is None:
-            raise SemanticUndefinedSymbolError(
+            self._report_error(SemanticUndefinedSymbolError(
                 f"Class '{receiverId}' doesn't know any class method '{node.selector}'."
-                )
+                ))
+            return
 
         # Kontrola správného arity bezparametrické metody
         actualParamCount = len(node.argNodeList)
         expectedParamCount = methodSymbol.get_param_count()
         if expectedParamCount != actualParamCount:
-            raise SemanticArityError(
+            self._report_error(SemanticArityError(
                 f"Class method '{node.selector}' of class '{receiverId}' expects "
                 f"{expectedParamCount} arguments, but was given {actualParamCount}."
-                )
+                ))
 
     def _handle_instance_method(self, node: ASTNodes.MethodNode, receiverId: str):
         """
@@ -362,17 +636,20 @@ class SemanticAnalyser(ASTNodeVisitor):
                 actualParamCount = len(node.argNodeList)
                 expectedParamCount = methodSymbol.get_param_count()
                 if actualParamCount != expectedParamCount:
-                    raise SemanticArityError(
+                    self._report_error(SemanticArityError(
                         f"Instance method '{node.selector}' of class '{self._currentClass}'"
                         f"expects {expectedParamCount} arguments, but was given "
                         f"{actualParamCount}."
-                        )
+                        ))
         # Pro obecnou proměnnou kontrolujeme jen, jestli je definovaná.
+        # (Ve sbíracím režimu nedefinovaného příjemce už ohlásil `visit_identifier_node`.)
         else:
+            if self._errors is not None and get_node_kind(type(node.receiver)) == IDENTIFIER_KIND:
+                return
             if not self._symtable.scopeManager.is_defined(receiverId):
-                raise SemanticUndefinedSymbolError(
+                self._report_error(SemanticUndefinedSymbolError(
                     f"Variable '{receiverId}' is not defined."
-                    )
+                    ))
 
     def _check_combined_selector(self, node, receiverId: str):
         """
@@ -395,22 +672,24 @@ class SemanticAnalyser(ASTNodeVisitor):
         for i, part in enumerate(splitSelector):
             # Pozor na zkratkové vyhodnocování v podmínkách
             if part == "startsWith" and (i + 1 >= len(splitSelector) or splitSelector[i + 1] != "endsBefore"):
-                raise SemanticUndefinedSymbolError(
+                self._report_error(SemanticUndefinedSymbolError(
                     f"Method 'startsWith:' must be followed by 'endsBefore:'."
-                    )
+                    ))
+                return
             if part == "ifTrue" and (i + 1 >= len(splitSelector) or splitSelector[i + 1] != "ifFalse"):
-                raise SemanticUndefinedSymbolError(
+                self._report_error(SemanticUndefinedSymbolError(
                     f"Method 'ifTrue:' must be followed by 'ifFalse:'."
-                    )
+                    ))
+                return
 
         # Zkontrolujeme, zda součet arit všech dílčích částí sedí s počtem předaných argumentů
         expectedParamCount = self._get_expected_param_count(splitSelector, receiverId)
         actualParamCount = len(node.argNodeList)
         if expectedParamCount != actualParamCount:
-            raise SemanticArityError(
+            self._report_error(SemanticArityError(
                 f"Combined method call '{node.selector}' of class '{receiverId}' "
                 f"expects {expectedParamCount} arguments, but got {actualParamCount}."
-                )
+                ))
 
     def _get_expected_param_count(self, splitSelector, receiverId):
         """
@@ -436,28 +715,49 @@ class SemanticAnalyser(ASTNodeVisitor):
 
     def check_cyclic_inheritance(self):
         """
-        Zkontroluje cyklickou dědičnost mezi třídami.
+        Zkontroluje cyklickou dědičnost mezi třídami v lineárním čase. Každá
+        třída má nejvýše jednoho rodiče, průchod řetězcem předků proto stačí
+        zahájit z každé dosud nenavštívené třídy a barvit navštívené třídy:
+            - třída na aktuálně procházené cestě (rozpracovaná),
+            - třída, jejíž řetězec předků je již zkontrolován (hotová).
+        Narazí-li průchod na rozpracovanou třídu, uzavřel cyklus. Každá třída
+        se tak navštíví nejvýše jednou a nalezeny jsou všechny cykly.
 
         Výjimky:
-            - SemanticOtherError: Pokud je detekována cyklická dědičnost.
+            - SemanticOtherError: Pokud je detekována cyklická dědičnost
+                                  (detail obsahuje členy všech cyklů).
         """
-        visited = set()
+        IN_PROGRESS, DONE = 1, 2
+        classManager = self._symtable.classManager
+        state = {}
+        cycles = []
 
         # Projdeme všechny třídy a zkontrolujeme cyklickou dědičnost
-        for classSymbol in self._symtable.classManager.get_all_class_symbols():
+        for classSymbol in classManager.get_all_class_symbols():
+            path = []
             classIdentifier = classSymbol.identifier
-            # Dokud nedojdeme ke kořeni dědičnosti
-            while classIdentifier:
-                # Pokud jsme už tuto třídu navštívili, máme cyklickou dědičnost
-                if classIdentifier in visited:
-                    raise SemanticOtherError(
-                        f"Cyclic inheritance detected for class '{classIdentifier}'."
-                        )
-                # Jinak přidáme třídu do navštívených tříd a pokračujeme v průchodu
-                visited.add(classIdentifier)
-                parentClass = self._symtable.classManager.get_class_symbol(classIdentifier).parentIdentifier
-                classIdentifier = parentClass
-            # Vyprázdníme navštívené třídy pro další iteraci
-            visited.clear()
+            # Postupujeme k předkům, dokud nenarazíme na kořen nebo již navštívenou třídu
+            while classIdentifier and classIdentifier not in state:
+                state[classIdentifier] = IN_PROGRESS
+                path.append(classIdentifier)
+                parentSymbol = classManager.get_class_symbol(classIdentifier)
+                classIdentifier = parentSymbol.parentIdentifier if parentSymbol else None
+
+            # Průchod se vrátil do rozpracované třídy aktuální cesty => cyklus
+            if classIdentifier and state[classIdentifier] == IN_PROGRESS:
+                cycles.append(path[path.index(classIdentifier):])
+
+            # Všechny třídy aktuální cesty jsou zkontrolovány
+            for identifier in path:
+                state[identifier] = DONE
+
+        if cycles:
+            cycleDescriptions = [
+                " -> ".join(f"'{identifier}'" for identifier in cycle + cycle[:1])
+                for cycle in cycles
+                ]
+            self._report_error(SemanticOtherError(
+                f"Cyclic inheritance detected: {'; '.join(cycleDescriptions)}."
+                ))
 
 ### konec souboru 'SemanticAnalyser.py' ###
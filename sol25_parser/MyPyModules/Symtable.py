@@ -7,7 +7,7 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            18.02.2025                                                 *
-* Poslední změna:   23.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Modul pro správu tabulky symbolů. Obsahuje třídy a         *
 *                   metody pro definici tříd, metod a spravování lokálních     *
@@ -18,7 +18,8 @@
 """
 
 # Import modulů standardní knihovny
-from typing import Set
+from sys import intern  # intern()
+from types import MappingProxyType
 
 # Import vlastních modulů
 from MyPyModules.AbstractSyntaxTree import ASTNodes as AST
@@ -48,11 +49,14 @@ class Symbols:
             - methods (dict): Slovník metod, kde klíče jsou selektory metod a
                               hodnoty jsou instance třídy `MethodSymbol`.
             - isBuiltIn (bool): Příznak, zda je třída vestavěná.
+            - isFrozen (bool): Příznak, zda je symbol neměnný (viz `freeze()`).
 
         Metody:
             - __init__(self, identifier, parentIdentifier, isBuiltIn): Inicializuje symbol třídy.
             - add_method(self, selector, methodSymbol): Přidá novou metodu do třídy.
+            - freeze(self): Učiní symbol třídy i symboly jejích metod neměnnými.
         """
+        isFrozen = False
 
         def __init__(self, identifier:str, parent:str = None, isBuiltIn:bool = False, isDefined:bool = False):
             """
@@ -77,6 +81,12 @@ class Symbols:
                     - Pokud je metoda již definována nebo je porušeno pravidlo
                       definice ve vestavěné třídě.
             """
+            # Neměnnou (vestavěnou) třídu nelze rozšířit
+            if self.isFrozen:
+                raise InternalError(
+                    f"Can not add method '{selector}' to immutable class "
+                    f"'{self.identifier}'."
+                    )
             # Kontrola redefinice metody
             if selector in self.methods:
                 raise SemanticUndefinedSymbolError(
@@ -89,8 +99,34 @@ class Symbols:
                     f"Can not define new method '{selector}' inside built-in "
                     f"class '{self.identifier}'."
                     )
-            # Přidání nového symbolu metody do slovníku
-            self.methods[selector] = methodSymbol
+            # Přidání nového symbolu metody do slovníku (selektory z AST jsou
+            # internované, internováním klíče vyhledání skončí na shodě identity)
+            self.methods[intern(selector)] = methodSymbol
+
+        def freeze(self):
+            """
+            Učiní symbol třídy i symboly jejích metod neměnnými. Slovník metod
+            se nahradí pohledem pouze pro čtení a každý další pokus o změnu
+            atributu vyvolá výjimku.
+            """
+            for methodSymbol in self.methods.values():
+                methodSymbol.freeze()
+            self.methods = MappingProxyType(self.methods)
+            self.isFrozen = True
+
+        def __setattr__(self, name:str, value):
+            """
+            Nastaví atribut symbolu, pokud symbol není neměnný.
+
+            Výjimky:
+                - InternalError: Pokud je symbol neměnný.
+            """
+            if self.isFrozen:
+                raise InternalError(
+                    f"Can not modify attribute '{name}' of immutable class "
+                    f"'{self.identifier}'."
+                    )
+            super().__setattr__(name, value)
 
     class MethodSymbol:
         """
@@ -108,7 +144,10 @@ class Symbols:
         Metody:
             - get_param_count(): Vrací skutečný počet parametrů (z bloku nebo
                                   z `paramCount`).
+            - freeze(): Učiní symbol metody neměnným.
         """
+        isFrozen = False
+
         def __init__(self, selector:str, block:AST.BlockNode = None,
                      paramCnt:int = None, isBuiltIn:bool = False, isDefined:bool = False
                      ):
@@ -134,6 +173,26 @@ class Symbols:
                 return self.paramCount
             return 0
 
+        def freeze(self):
+            """
+            Učiní symbol metody neměnným.
+            """
+            self.isFrozen = True
+
+        def __setattr__(self, name:str, value):
+            """
+            Nastaví atribut symbolu, pokud symbol není neměnný.
+
+            Výjimky:
+                - InternalError: Pokud je symbol neměnný.
+            """
+            if self.isFrozen:
+                raise InternalError(
+                    f"Can not modify attribute '{name}' of immutable method "
+                    f"'{self.selector}'."
+                    )
+            super().__setattr__(name, value)
+
 
 class BuiltInSymbols:
     """
@@ -254,6 +313,34 @@ class BuiltInSymbols:
             self.add_method("whileTrue:", Symbols.MethodSymbol("whileTrue:", None, 1, True, True))
 
 
+def create_builtin_symbols() -> MappingProxyType:
+    """
+    Vytvoří neměnnou tabulku vestavěných tříd Object, Nil, True, False,
+    Integer, String a Block. Symboly tříd i jejich metod jsou zmrazené
+    (viz `Symbols.ClassSymbol.freeze()`), a proto je lze sdílet odkazem
+    mezi všemi analýzami.
+
+    Návratová hodnota:
+        - MappingProxyType: Pohled pouze pro čtení na slovník
+                            str(classIdentifier) --> ClassSymbol.
+    """
+    builtins = [
+        BuiltInSymbols.ObjectClass(),  # Třída 'Object'
+        BuiltInSymbols.NilClass(),  # Třida 'Nil'
+        BuiltInSymbols.TrueClass(),  # Třida 'True'
+        BuiltInSymbols.FalseClass(),  # Třída 'False'
+        BuiltInSymbols.IntegerClass(),  # Třída 'Integer'
+        BuiltInSymbols.StringClass(),  # Třída 'String'
+        BuiltInSymbols.BlockClass()  # Třída 'Block'
+        ]
+    for builtinClass in builtins:
+        builtinClass.freeze()
+    return MappingProxyType({builtinClass.identifier: builtinClass for builtinClass in builtins})
+
+# Sdílená neměnná tabulka vestavěných tříd (vytváří se jednou při importu modulu)
+BUILTIN_CLASS_TABLE = create_builtin_symbols()
+
+
 class Symtable:
     """
     Třída reprezentující tabulku symbolů, která spravuje symboly tříd, metod a
@@ -289,8 +376,9 @@ class Symtable:
             - insert_method_symbol(self, classIdentifier:str, selector:str, block:AST.BlockNode):
               Přidá (vloží) novou metodu do specifikované třídy.
             - get_class_symbol(self, identifier:str): Vyhledá a vrátí symbol třídy
-            - get_method_symbol(self, classIdentifier:str, selector:str, visited:Set[str]):
-              Rekurzivně vyhledá metodu v dané třídě a případně v jejích předcích.
+            - get_method_symbol(self, classIdentifier:str, selector:str):
+              Vyhledá metodu v dané třídě a případně v jejích předcích.
+            - invalidate_method_cache(self, selector:str): Zneplatní mezipaměť vyhledávání metod.
         """
 
         def __init__(self):
@@ -299,23 +387,21 @@ class Symtable:
             """
             self.classes = {}  # slovník str(classIdentifier) --> ClassSymbol
 
+            # Mezipaměť vyhledávání metod (obdoba tabulky virtuálních metod)
+            # slovník str(selector) --> {str(classIdentifier) --> MethodSymbol | None}
+            self._methodCache = {}
+
         def load_builtin_symbols(self):
             """
-            Načte vestavěné třídy a jejich metody do tabulky symbolů. Vytvoří
-            se třídy Object, Nil, True, False, Integer, String a Block. Každá
-            třída má přiřazené své vestavěné metody.
-            """
-            builtins = [
-                BuiltInSymbols.ObjectClass(),  # Třída 'Object'
-                BuiltInSymbols.NilClass(),  # Třida 'Nil'
-                BuiltInSymbols.TrueClass(),  # Třida 'True'
-                BuiltInSymbols.FalseClass(),  # Třída 'False'
-                BuiltInSymbols.IntegerClass(),  # Třída 'Integer'
-                BuiltInSymbols.StringClass(),  # Třída 'String'
-                BuiltInSymbols.BlockClass()  # Třída 'Block'
-                ]
-            for builtinClass in builtins:
-                self.classes[builtinClass.identifier] = builtinClass
+            Načte vestavěné třídy a jejich metody do tabulky symbolů. Třídy
+            Object, Nil, True, False, Integer, String a Block se nevytváří
+            znovu, ale převezmou se odkazem ze sdílené neměnné tabulky
+            `BUILTIN_CLASS_TABLE`. Uživatelské třídy se vkládají pouze do
+            slovníku `classes` této instance (překryvná vrstva nad sdílenou
+            tabulkou), sdílené symboly tak nelze změnit.
+            """
+            self.classes.update(BUILTIN_CLASS_TABLE)
+            self.invalidate_method_cache()
 
         def insert_class_symbol(self, identifier:str, parentIdentifier:str = None,
                                 defined:bool = False
@@ -351,6 +437,7 @@ class Symtable:
                         )
             self.classes[identifier] = (
                 Symbols.ClassSymbol(identifier, parentIdentifier, isBuiltIn = False, isDefined = defined))
+            self.invalidate_method_cache()
 
         def insert_method_symbol(self, classIdentifier:str, selector:str,
                                  block:AST.BlockNode, defined:bool = False
@@ -392,6 +479,7 @@ class Symtable:
                     )
             # Asociace metody s danou třídou
             classSymbol.add_method(selector, Symbols.MethodSymbol(selector, block, isBuiltIn = False, isDefined = defined))
+            self.invalidate_method_cache(selector)
 
         def get_class_symbol(self, identifier:str) -> Symbols.ClassSymbol | None:
             """
@@ -416,49 +504,69 @@ class Symtable:
             """
             return list(self.classes.values())
 
-        def get_method_symbol(self, classIdentifier:str, selector:str, visited:Set[str] = None):
+        def get_method_symbol(self, classIdentifier:str, selector:str):
             """
-            Rekurzivně vyhledá metodu v dané třídě a případně v jejích předcích.
+            Vyhledá metodu v dané třídě a případně v jejích předcích. Výsledek
+            (včetně neúspěšného hledání) se uloží do mezipaměti pro všechny
+            třídy na prošlé cestě, takže opakované vyhledání z libovolné z nich
+            má konstantní složitost i pro dlouhé řetězce dědičnosti.
 
             Parametry:
                 - classIdentifier (str): Identifikátor třídy, kde vyhledávání začíná.
                 - selector (str): Selektor (identifikátor) hledané metody.
-                - visited (set): Množina dříve navštívených tříd pro detekci cyklů.
 
             Návratová hodnota:
                 - Symbols.MethodSymbol | None: Metodu, pokud je nalezena, jinak `None`.
             """
-            # Pokud nebylo předáno 'visited', vytvoří se nová prázdná množina.
-            if visited is None:
-                visited = set()
-
-            # Pokud jsme již tuto třídu navštívili, hrozí cyklus, proto vracíme `None`.
-            if classIdentifier in visited:
-                return None
-            # Jinak přidáme tuto třídu do `visited`
-            else:
-                visited.add(classIdentifier)
-
-            # Pokud je 'classIdentifier' prázdný, nelze pokračovat.
-            if not classIdentifier:
-                return None
-            # Jinak získání symbol třídy podle jejího identifikátoru.
-            else:
-                classSymbol = self.classes.get(classIdentifier)
+            # Pokusíme se výsledek získat z mezipaměti.
+            selectorCache = self._methodCache.get(selector)
+            if selectorCache is None:
+                selectorCache = self._methodCache[selector] = {}
+            elif classIdentifier in selectorCache:
+                return selectorCache[classIdentifier]
+
+            # Procházíme řetězec předků, dokud metodu nenajdeme, nenarazíme na
+            # třídu s výsledkem v mezipaměti, nebo řetězec neskončí (či se nezacyklí).
+            methodSymbol = None
+            path = []
+            visited = set()
+            currentIdentifier = classIdentifier
+            while currentIdentifier and currentIdentifier not in visited:
+                if currentIdentifier in selectorCache:
+                    methodSymbol = selectorCache[currentIdentifier]
+                    break
+                visited.add(currentIdentifier)
+                path.append(currentIdentifier)
+
+                # Pokud symbol třídy neexistuje, metoda nebyla nalezena.
+                classSymbol = self.classes.get(currentIdentifier)
+                if not classSymbol:
+                    break
+
+                # Pokud je hledaný selektor mezi metodami aktuální třídy, máme výsledek.
+                methodSymbol = classSymbol.methods.get(selector)
+                if methodSymbol is not None:
+                    break
+                currentIdentifier = classSymbol.parentIdentifier
+
+            # Výsledek platí pro všechny třídy na prošlé cestě.
+            for identifier in path:
+                selectorCache[identifier] = methodSymbol
+            return methodSymbol
+
+        def invalidate_method_cache(self, selector:str = None):
+            """
+            Zneplatní mezipaměť vyhledávání metod. Přidání metody ovlivní jen
+            výsledky pro její selektor, změna tříd nebo jejich předků všechny.
 
-            # Pokud symbol třídy neexistuje, vracíme `None` (třída nebyla nalezena).
-            if not classSymbol:
-                return None
-
-            # Pokud je hledaný selektor mezi metodami aktuální třídy, vrátíme nalezenou metodu.
-            if selector in classSymbol.methods:
-                return classSymbol.methods[selector]
-            # Pokud má třída rodiče, pokusíme se vyhledat metodu rekurzivně v předkovi.
-            elif classSymbol.parentIdentifier:
-                return self.get_method_symbol(classSymbol.parentIdentifier, selector, visited)
-            # Jinak se nepodařilo nic najít, vracíme `None`.
+            Parametry:
+                - selector (str): Selektor, jehož výsledky se zneplatní
+                                  (výchozí None = celá mezipaměť).
+            """
+            if selector is None:
+                self._methodCache.clear()
             else:
-                return None
+                self._methodCache.pop(selector, None)
 
         def class_knows_method(self, classIdentifier:str, methodIdentifier:str) -> bool:
             """
@@ -494,6 +602,7 @@ class Symtable:
             if classSymbol is not None:
                 classSymbol.parentIdentifier = classNode.perentIdentifier
                 classSymbol.isDefined = True
+                self.invalidate_method_cache()
             else:
                 self.insert_class_symbol(classNode.identifier, classNode.perentIdentifier, True)
 
@@ -7,61 +7,97 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            17.02.2025                                                 *
-* Poslední změna:   24.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento soubor obsahuje implementaci generátoru XML pro      *
 *                   jazyk SOL25. Generátor prochází abstraktní syntaktický     *
-*                   strom (AST) a vytváří XML reprezentaci programu.           *
+*                   strom (AST) a vytváří XML reprezentaci programu. XML se    *
+*                   zapisuje proudově během jediného průchodu AST přímo do     *
+*                   výstupního souboru (bez mezilehlého DOM). Veškeré          *
+*                   escapování hodnot atributů probíhá pouze zde při zápisu.   *
 ********************************************************************************
 """
 
 # Import modulů standardní knihovny
-import re
-from xml.dom import minidom
-from xml.etree import ElementTree
+import io  # StringIO()
 
 # Import vlastních modulů
 from MyPyModules.AbstractSyntaxTree import ASTNodes
 from MyPyModules.CustomErrors import InternalError
+from MyPyModules.LiteralSpans import LiteralSpans, scan_literal_spans
+
+# Hlavička XML dokumentu a odsazení jedné úrovně zanoření
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XML_INDENT = "  "
+
+# Převodní tabulky pro escapování hodnot atributů. Znaky nového řádku
+# v popisu programu (atribut `description`) se zapisují jako `&nbsp;`.
+XML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    "'": "&apos;",
+    '"': "&quot;"
+})
+DESCRIPTION_ESCAPE_TABLE = {**XML_ESCAPE_TABLE, ord("\n"): "&nbsp;"}
 
 #######################################################################
-# Zdroje: https://www.datacamp.com/tutorial/python-xml-elementtree
-#       : https://rowelldionicio.com/parsing-xml-with-python-minidom/
+# Formát výstupu odpovídá `minidom.Document.toprettyxml(indent="  ")`:
+#   - každý element začíná na novém řádku odsazeném o úroveň zanoření,
+#   - element bez potomků se zapíše jako prázdný tag `<tag .../>`,
+#   - atributy se zapíší v pořadí, v jakém jsou uvedeny ve slovníku.
+# Generátor nemá žádný sdílený ani globální stav, a je proto reentrantní
+# (lze jej používat souběžně z více vláken).
 #######################################################################
 class XMLGenerator:
     """
     Třída pro generování XML reprezentace programu v jazyce SOL25.
 
     Metody:
-        - generate_XML(ASTRoot:ASTNodes.ProgramNode, SOL25Code:str) -> str:
+        - generate_XML(ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, literalSpans) -> str:
             - Vytváří XML reprezentaci programu na základě AST a zdrojového kódu.
 
-        - generate_class_tag(classNode:ASTNodes.ClassNode) -> ElementTree.Element:
-            - Generuje element <class> pro uživatelsky definovanou třídu.
+        - write_XML(ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, sink, literalSpans) -> None:
+            - Zapisuje XML reprezentaci programu proudově do souboru `sink`.
 
-        - generate_method_tag(methodNode:ASTNodes.MethodNode) -> ElementTree.Element:
-            - Generuje element <method> pro metodu třídy.
+        - generate_program_start_tag(ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, write,
+                                     literalSpans) -> bool:
+            - Zapíše hlavičku dokumentu a počáteční tag elementu <program>.
 
-        - generate_block_tag(blockNode:ASTNodes.BlockNode) -> ElementTree.Element:
-            - Generuje element <block> pro blok kódu.
+        - generate_class_tag(classNode:ASTNodes.ClassNode, write, indent:str) -> None:
+            - Zapíše element <class> pro uživatelsky definovanou třídu.
 
-        - generate_assign_tag(assignNode:ASTNodes.AssignNode) -> ElementTree.Element:
-            - Generuje element <assign> pro přiřazení hodnoty proměnné.
+        - generate_method_tag(methodNode:ASTNodes.MethodNode, write, indent:str) -> None:
+            - Zapíše element <method> pro metodu třídy.
 
-        - generate_expression_tag(exprNode:ASTNodes) -> ElementTree.Element:
-            - Generuje element <expr> pro výraz v kódu.
+        - generate_block_tag(blockNode:ASTNodes.BlockNode, write, indent:str) -> None:
+            - Zapíše element <block> pro blok kódu.
 
-        - generate_literal_tag(literalNode: ASTNodes.LiteralNode) -> ElementTree.Element:
-            - Generuje element <literal> pro literál v kódu.
+        - generate_assign_tag(assignNode:ASTNodes.AssignNode, order:int, write, indent:str) -> None:
+            - Zapíše element <assign> pro přiřazení hodnoty proměnné.
 
-        - generate_variable_tag(identifierNode: ASTNodes.IdentifierNode) -> ElementTree.Element:
-            - Generuje element <var> pro proměnnou v kódu.
+        - generate_expression_tag(exprNode:ASTNodes, write, indent:str) -> None:
+            - Zapíše element <expr> pro výraz v kódu.
 
-        - generate_send_tag(exprNode: ASTNodes.ExpressionNode) -> ElementTree.Element:
-            - Generuje element <send> pro odeslání zprávy v kódu.
+        - generate_literal_tag(literalNode: ASTNodes.LiteralNode, write, indent:str) -> None:
+            - Zapíše element <literal> pro literál v kódu.
+
+        - generate_variable_tag(identifierNode: ASTNodes.IdentifierNode, write, indent:str) -> None:
+            - Zapíše element <var> pro proměnnou v kódu.
+
+        - generate_send_tag(exprNode: ASTNodes.ExpressionNode, write, indent:str) -> None:
+            - Zapíše element <send> pro odeslání zprávy v kódu.
+
+        - _write_subtree(rootItem:tuple, write) -> None:
+            - Iterativně zapíše podstrom bloku, příkazu nebo výrazu.
+
+    Parametry `write` a `indent` jsou metoda `write()` výstupního souboru
+    a odsazení zapisovaného elementu. Volitelný parametr `literalSpans` je
+    předběžný průchod kódu, se kterým byl kód parsován (viz `get_first_comment()`).
     """
 
-    def generate_XML(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str) -> str:
+    def generate_XML(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str,
+                     literalSpans:LiteralSpans | None = None) -> str:
         """
         Generuje XML reprezentaci programu na základě abstraktního syntaktického
         stromu (AST).
@@ -69,60 +105,79 @@ class XMLGenerator:
         Parametry:
             - ASTRoot (ASTNodes.ProgramNode): Kořenový uzel AST.
             - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
 
         Návratová hodnota:
             - str: Hezky formátovaná XML reprezentace programu v SOL25.
         """
-        # Vytvoříme slovník s atributy zdrojového kódu.
-        attributes = {"language": "SOL25"}  # definice jazyka programu
+        buffer = io.StringIO()
+        self.write_XML(ASTRoot, SOL25Code, buffer, literalSpans)
+        return buffer.getvalue()
 
-        # Vyhledání prvního komentáře v kódu SOL25
-        firstComment = get_first_comment(SOL25Code)
+    def write_XML(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, sink,
+                  literalSpans:LiteralSpans | None = None):
+        """
+        Zapíše XML reprezentaci programu proudově do textového souboru během
+        jediného průchodu AST.
 
-        # Pokud je nalezen komentář, přidáme ho jako atribut "description"
-        if firstComment:
-            description = firstComment
-            attributes["description"] = description
+        Parametry:
+            - ASTRoot (ASTNodes.ProgramNode): Kořenový uzel AST.
+            - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+            - sink (TextIO): Textový soubor (objekt s metodou `write()`).
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
+        """
+        write = sink.write
 
-        # Vygenerujeme element <program> s atributy do stromu elementů XML.
-        programTag = ElementTree.Element("program", attributes)
+        # Zapíšeme hlavičku dokumentu a element <program> s atributy.
+        if not self.generate_program_start_tag(ASTRoot, SOL25Code, write, literalSpans):
+            return
 
         # Pro každou uživatelsky definovanou třídu vytvoříme element <class>.
-        order = 1
         for classNode in ASTRoot.classNodeList:
-            classTag = self.generate_class_tag(classNode)
-            programTag.append(classTag)
-            order += 1
+            self.generate_class_tag(classNode, write, XML_INDENT)
+        write("</program>\n")
 
-        # Převod elementu XML na řetězec.
-        byteXML = ElementTree.tostring(element=programTag, encoding="utf-8")
+    def generate_program_start_tag(self, ASTRoot:ASTNodes.ProgramNode, SOL25Code:str, write,
+                                   literalSpans:LiteralSpans | None = None) -> bool:
+        """
+        Zapíše hlavičku XML dokumentu a počáteční tag elementu <program>
+        s atributem `language` a případně `description` (první komentář
+        zdrojového kódu).
 
-        # Převod řetězcové reprezentace XML na DOM objektovou reprezentaci.
-        reparsedXML = minidom.parseString(byteXML)
+        Parametry:
+            - ASTRoot (ASTNodes.ProgramNode): Kořenový uzel AST.
+            - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
 
-        # Override funkce pro zápis hezky formátovaného XML, aby nedocházelo k escapování znaků.
-        def no_escape_write_data(writer, data):
-            writer.write(data)
-        minidom._write_data = no_escape_write_data
+        Návratová hodnota:
+            - bool: `True`, pokud element zůstal otevřený a je třeba jej uzavřít.
+        """
+        # Vytvoříme slovník s atributy zdrojového kódu.
+        attributes = {"language": "SOL25"}  # definice jazyka programu
 
-        # Zdroj: https://rowelldionicio.com/parsing-xml-with-python-minidom/
-        prettyXML = reparsedXML.toprettyxml(indent="  ", encoding="UTF-8")
+        # Vyhledání prvního komentáře v kódu SOL25
+        firstComment = get_first_comment(SOL25Code, literalSpans)
 
-        # Dekódování bajtového řetězce na textový řetězec.
-        XMLCode = prettyXML.decode("UTF-8")
-        return XMLCode
+        # Pokud je nalezen komentář, přidáme ho jako atribut "description"
+        if firstComment:
+            description = firstComment
+            attributes["description"] = description
+
+        write(XML_DECLARATION)
+        return write_start_tag(write, "", "program", attributes, ASTRoot.classNodeList,
+                               DESCRIPTION_ESCAPE_TABLE)
 
-    def generate_class_tag(self, classNode:ASTNodes.ClassNode) -> ElementTree.Element:
+    def generate_class_tag(self, classNode:ASTNodes.ClassNode, write, indent:str):
         """
-        Generuje XML element <class> pro daný uzel třídy. Každý element <class>
+        Zapíše XML element <class> pro daný uzel třídy. Každý element <class>
         obsahuje dva povinné atributy: `name` s identifikátorem třídy a `parent`
         s identifikátorem nadtřídy (rodiče).
 
         Parametry:
             - classNode (ASTNodes.ClassNode): Uzel třídy v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <class>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
         # Atributem elementu třídy <class> je identifikátor třídy a identifikátor nadtřídy.
         attributes = {
@@ -130,238 +185,286 @@ class XMLGenerator:
             "parent": classNode.perentIdentifier
         }
 
-        # Přidáme element <class> s atributy do stromu elementů XML.
-        classTag = ElementTree.Element("class", attributes)
+        # Zapíšeme element <class> s atributy.
+        if not write_start_tag(write, indent, "class", attributes, classNode.methodNodeList):
+            return
 
         # Vygenerujeme elementy <method> pro každou definovanou metodu dané třídy.
+        childIndent = indent + XML_INDENT
         for methodNode in classNode.methodNodeList:
-            methodTag = self.generate_method_tag(methodNode)
-            classTag.append(methodTag)
-        return classTag
+            self.generate_method_tag(methodNode, write, childIndent)
+        write(f"{indent}</class>\n")
 
-    def generate_method_tag(self, methodNode:ASTNodes.MethodNode) -> ElementTree.Element:
+    def generate_method_tag(self, methodNode:ASTNodes.MethodNode, write, indent:str):
         """
-        Generuje XML element <method> pro daný uzel metody. Element <method>
+        Zapíše XML element <method> pro daný uzel metody. Element <method>
         obsahuje povinný atribut `selector` s identifikátorem metody. Při
         generování některých elementů je třeba definovat pořadí, což se provádí
         povinným atributem `order`.
 
         Parametry:
             - methodNode (ASTNodes.MethodNode): Uzel metody v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <method>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
         # Metoda je tvořena elementem <method> s atributem 'selector'.
-        attributes = {"selector": methodNode.selector}
-
-        # Vygenerujeme element <method> s atributy do stromu elementů XML.
-        methodTag = ElementTree.Element("method", attributes)
+        write_start_tag(write, indent, "method", {"selector": methodNode.selector}, True)
 
         # Tělo metody je reprezentováno blokem.
-        blockTag = self.generate_block_tag(methodNode.blockNode)
-        methodTag.append(blockTag)
-        return methodTag
+        self.generate_block_tag(methodNode.blockNode, write, indent + XML_INDENT)
+        write(f"{indent}</method>\n")
 
-    def generate_block_tag(self, blockNode:ASTNodes.BlockNode) -> ElementTree.Element:
+    def generate_block_tag(self, blockNode:ASTNodes.BlockNode, write, indent:str):
         """
-        Generuje XML element <block> pro daný uzel bloku. Element <block>
+        Zapíše XML element <block> pro daný uzel bloku. Element <block>
         obsahuje podelementy `parameter` pro každý parametr bloku se dvěma
         povinným atributy `order` a `name` pro pořadí a identifikátor parametru.
         Dále element <block> obsahuje podelementy pro každý příkaz sekvence
         příkazů a s atributem arity udávajícím počet očekávaných argumentů.
+        Podstrom bloku se zapisuje iterativně (viz `_write_subtree`).
 
         Parametry:
             - blockNode (ASTNodes.BlockNode): Uzel bloku v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <block>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
-        # Zjistíme počet parametrů bloku, pokud je seznam parametrů prázdný, arita je 0.
-        arity = len(blockNode.parameterNodeList) if blockNode.parameterNodeList else 0
-        attributes = {"arity": str(arity)}
-
-        # Vygenerujeme element <block> s atributy do stromu elementů XML.
-        blockTag = ElementTree.Element("block", attributes)
-
-        # Pro každý parametr bloku vytvoříme element <parameter> s atributy 'name' a 'order'.
-        order = 1
-        for param in blockNode.parameterNodeList:
-            attributes = {"order": str(order),
-                          "name": param
-                          }
-            parameterTag = ElementTree.Element("parameter", attributes)
-            blockTag.append(parameterTag)
-            order += 1
-
-        # Pro každý příkaz přiřazení v bloku vytvoříme element <assign>.
-        order = 1
-        for statement in blockNode.statementNodeList:
-            assignTag = self.generate_assign_tag(statement, order)
-            blockTag.append(assignTag)
-            order += 1
-        return blockTag
-
-    def generate_assign_tag(self, assignNode:ASTNodes.AssignNode, order:int) -> ElementTree.Element:
+        self._write_subtree(("block", blockNode, indent, 0), write)
+
+    def generate_assign_tag(self, assignNode:ASTNodes.AssignNode, order:int, write, indent:str):
         """
-        Generuje XML element <assign> pro příkaz. Element <assign> má povinný
+        Zapíše XML element <assign> pro příkaz. Element <assign> má povinný
         atribut `order` pro určení pořadí příkazu v sekvenci příkazů. Příkaz
         zahrnuje dva povinné podelementy `var` s atributem `name` pro identifikátor
         cílové proměnné a podelement `expr` pro výraz pro výpočet přiřazované hodnoty.
+        Podstrom příkazu se zapisuje iterativně (viz `_write_subtree`).
 
         Parametry:
             - assignNode (ASTNodes.AssignNode): Uzel příkazu (přiřazení) v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <assign>.
+            - order (int): Pořadí příkazu v bloku.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
-        # Přidáme element příkazu <assign> do stromu elementů XML.
-        attributes = {"order": str(order)}
-        assignTag = ElementTree.Element("assign", attributes)
-
-        # Vygenerujeme podelement <var> pro proměnnou, do které přiřazujeme.
-        variableTag = self.generate_variable_tag(assignNode.identifierNode)
-        assignTag.append(variableTag)
-
-        # Vygenerujeme podelement <expr> pro výraz, který přiřazujeme.
-        expressionTag = self.generate_expression_tag(assignNode.exprNode)
-        assignTag.append(expressionTag)
-        return assignTag
+        self._write_subtree(("assign", assignNode, indent, order), write)
 
-    def generate_expression_tag(self, exprNode:ASTNodes) -> ElementTree.Element:
+    def generate_expression_tag(self, exprNode:ASTNodes, write, indent:str):
         """
-        Generuje XML element <expr> pro daný uzel výrazu. Výraz obsahuje jeden
+        Zapíše XML element <expr> pro daný uzel výrazu. Výraz obsahuje jeden
         podelement podle druhu výrazu: (1) literál <literal>, (2) proměnná <var>,
-        (3) blokový literál <block> nebo (4) zaslání zprávy <send>.
+        (3) blokový literál <block> nebo (4) zaslání zprávy <send>. Podstrom
+        výrazu se zapisuje iterativně (viz `_write_subtree`).
 
         Parametry:
             - exprNode (ASTNodes): Uzel výrazu v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <expr>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
-        # Přidáme element <expr>, který nemá atributy, do stromu elementů XML.
-        expressionTag = ElementTree.Element("expr")
-
-        # Podle typu uzlu vygenerujeme odpovídající podelement.
-        if isinstance(exprNode, ASTNodes.LiteralNode):
-            literalTag = self.generate_literal_tag(exprNode)  # literál Integer, String, True, False, Nil
-            expressionTag.append(literalTag)
-        elif isinstance(exprNode, ASTNodes.IdentifierNode):
-            variableTag = self.generate_variable_tag(exprNode)  # proměnná | literál třídy
-            expressionTag.append(variableTag)
-        elif isinstance(exprNode, ASTNodes.BlockNode):
-            blockTag = self.generate_block_tag(exprNode)  # zpracujeme blokový literál
-            expressionTag.append(blockTag)
-        elif isinstance(exprNode, ASTNodes.ExpressionNode):
-            sendTag = self.generate_send_tag(exprNode)  # zpracujeme odeslání zprávy
-            expressionTag.append(sendTag)
-        else:
-            raise InternalError(
-                f"Uknown expression node type '{exprNode}' was detected while "
-                f"generating XML output ."
-            )
-        return expressionTag
+        self._write_subtree(("expr", exprNode, indent, 0), write)
 
-    def generate_literal_tag(self, literalNode: ASTNodes.LiteralNode) -> ElementTree.Element:
+    def generate_literal_tag(self, literalNode: ASTNodes.LiteralNode, write, indent:str):
         """
-        Generuje XML element <literal> pro daný uzel literálu. Element <literal>
+        Zapíše XML element <literal> pro daný uzel literálu. Element <literal>
         obsahuje dva povinné textové atributy `class` s identifikátorem vestavěné
         třídy (Integer/String/Nil/True/False) a atribut `value` reprezentující
         hodnotu literálu.
 
         Parametry:
             - literalNode (ASTNodes.LiteralNode): Uzel literálu v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <literal>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
         # Atributem elementu literálu <liteal> je třída (typ) literálu a jeho hodnota.
         attributes = {"class": literalNode.literalType,
                       "value": str(literalNode.literalValue)
                       }
-        # Vygenerujeme element <literal> do stromu elementů XML
-        literalTag = ElementTree.Element("literal", attributes)
-        return literalTag
+        write_start_tag(write, indent, "literal", attributes, False)
 
-    def generate_variable_tag(self, identifierNode: ASTNodes.IdentifierNode) -> ElementTree.Element:
+    def generate_variable_tag(self, identifierNode: ASTNodes.IdentifierNode, write, indent:str):
         """
-        Generuje XML element <var> nebo <literal> typu `class` pro daný uzel
+        Zapíše XML element <var> nebo <literal> typu `class` pro daný uzel
         identifikátoru. Element <var> obsahuje povinný atribut `name` s
         identifikátorem proměnné. Pro vyjádření literálu identifikátoru
         třídy je `class="class"` a `value` obsahuje identifikátor třídy.
 
         Parametry:
             - identifierNode (ASTNodes.IdentifierNode): Uzel identifikátoru v AST.
-
-        Návratová hodnota:
-            - ElementTree.Element: XML element <var> nebo <literal>.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
         """
         # Pokud identifikátor začíná velkým písmenem, interpretujeme ho jako literál třídy.
         if identifierNode.identifier and identifierNode.identifier[0].isupper():
             attributes = {"class": "class",
                           "value": identifierNode.identifier
                           }
-            return ElementTree.Element("literal", attributes)
+            write_start_tag(write, indent, "literal", attributes, False)
         # Jinak ho považujeme za identifikátor proměnné.
         else:
-            attributes = {"name": identifierNode.identifier}
-            return ElementTree.Element("var", attributes)
+            write_start_tag(write, indent, "var", {"name": identifierNode.identifier}, False)
 
-    def generate_send_tag(self, exprNode: ASTNodes.ExpressionNode) -> ElementTree.Element:
+    def generate_send_tag(self, exprNode: ASTNodes.ExpressionNode, write, indent:str):
         """
-        Generuje XML element <send> pro daný uzel odeslání zprávy. Selektor
+        Zapíše XML element <send> pro daný uzel odeslání zprávy. Selektor
         zprávy je uložen v povinném atributu `selector`. Výraz pro vyhodnocení
         příjemce je v podelementu <expr> a pokud se jedná o parametrickou zprávu,
         obsahuje element <send> ještě podelementy <arg> pro každý argument
         předávaný zprávě. Element <arg> obsahuje právě jeden podelement <expr>
         pro výraz, jehož vyhodnocením získáme skutečný argument zprávy.
+        Podstrom zprávy se zapisuje iterativně (viz `_write_subtree`).
 
         Parametry:
             - exprNode (ASTNodes.ExpressionNode): Uzel odeslání zprávy v AST.
+            - write (callable): Metoda `write()` výstupního souboru.
+            - indent (str): Odsazení elementu.
+        """
+        self._write_subtree(("send", exprNode, indent, 0), write)
 
-        Návratová hodnota:
-            - ElementTree.Element: XML element <send>.
+    def _write_subtree(self, rootItem:tuple, write):
         """
-        # Atributem elementu zprávy <send> je selektor odesílatele zprávy.
-        attributes = {"selector": exprNode.selector}
-
-        # Vygenerujeme element <send> do stromu elementů XML.
-        sendTag = ElementTree.Element("send", attributes)
-
-        # Příjemcem zpárvy je výraz s elementem <expr>.
-        receiverExpression = self.generate_expression_tag(exprNode.receiver)
-        sendTag.append(receiverExpression)
-
-        # Pro každý argument zprávy vytvoříme element <arg> s atributem `order`.
-        order = 1
-        for argument in exprNode.argNodeList:
-            # Vygenerujeme element <arg> pro argument do stromu elementů XML.
-            attributes = {"order": str(order)}
-            argumentTag = ElementTree.Element("arg", attributes)
-            # Vygenerujeme element <expr> pro výraz argumentu.
-            argumentExpression = self.generate_expression_tag(argument)
-            argumentTag.append(argumentExpression)
-            sendTag.append(argumentTag)  # přidáme argument do zprávy
-            order += 1
-        return sendTag
-
-def get_first_comment(SOL25Code:str) -> str | None:
+        Zapíše podstrom bloku, příkazu nebo výrazu pomocí explicitního
+        zásobníku místo rekurze, takže hloubka zanoření není omezena limitem
+        rekurze interpretu. Položkou zásobníku je buď text k zápisu (např.
+        uzavírací tag elementu), nebo čtveřice (element, uzel, odsazení,
+        pořadí) pro element <block>, <assign>, <expr> nebo <send>. Potomci
+        elementu se na zásobník ukládají v obráceném pořadí, výstup je tak
+        stejný jako při rekurzivním průchodu do hloubky.
+
+        Parametry:
+            - rootItem (tuple): Položka pro kořen zapisovaného podstromu.
+            - write (callable): Metoda `write()` výstupního souboru.
+        """
+        stack = [rootItem]
+        pop = stack.pop
+        push = stack.append
+
+        while stack:
+            item = pop()
+            if type(item) is str:
+                write(item)  # uzavírací tag
+                continue
+
+            tag, node, indent, order = item
+            childIndent = indent + XML_INDENT
+
+            if tag == "expr":
+                # Zapíšeme element <expr>, který nemá atributy.
+                write(f"{indent}<expr>\n")
+
+                # Podle typu uzlu vygenerujeme odpovídající podelement.
+                if isinstance(node, ASTNodes.ExpressionNode):
+                    push(f"{indent}</expr>\n")
+                    push(("send", node, childIndent, 0))  # zpracujeme odeslání zprávy
+                elif isinstance(node, ASTNodes.IdentifierNode):
+                    self.generate_variable_tag(node, write, childIndent)  # proměnná | literál třídy
+                    write(f"{indent}</expr>\n")
+                elif isinstance(node, ASTNodes.LiteralNode):
+                    self.generate_literal_tag(node, write, childIndent)  # literál Integer, String, True, False, Nil
+                    write(f"{indent}</expr>\n")
+                elif isinstance(node, ASTNodes.BlockNode):
+                    push(f"{indent}</expr>\n")
+                    push(("block", node, childIndent, 0))  # zpracujeme blokový literál
+                else:
+                    raise InternalError(
+                        f"Uknown expression node type '{node}' was detected while "
+                        f"generating XML output ."
+                    )
+
+            elif tag == "send":
+                # Atributem elementu zprávy <send> je selektor odesílatele zprávy.
+                write_start_tag(write, indent, "send", {"selector": node.selector}, True)
+                push(f"{indent}</send>\n")
+
+                # Pro každý argument zprávy element <arg> s atributem `order`
+                # a v něm element <expr> pro výraz argumentu.
+                argumentIndent = childIndent + XML_INDENT
+                argNodeList = node.argNodeList
+                for argumentOrder in range(len(argNodeList), 0, -1):
+                    push(f"{childIndent}</arg>\n")
+                    push(("expr", argNodeList[argumentOrder - 1], argumentIndent, 0))
+                    push(f'{childIndent}<arg order="{argumentOrder}">\n')
+
+                # Příjemcem zprávy je výraz s elementem <expr>.
+                push(("expr", node.receiver, childIndent, 0))
+
+            elif tag == "assign":
+                # Zapíšeme element příkazu <assign>.
+                write_start_tag(write, indent, "assign", {"order": str(order)}, True)
+
+                # Vygenerujeme podelement <var> pro proměnnou, do které přiřazujeme,
+                # a podelement <expr> pro výraz, který přiřazujeme.
+                self.generate_variable_tag(node.identifierNode, write, childIndent)
+                push(f"{indent}</assign>\n")
+                push(("expr", node.exprNode, childIndent, 0))
+
+            elif tag == "block":
+                # Zjistíme počet parametrů bloku, pokud je seznam parametrů prázdný, arita je 0.
+                arity = len(node.parameterNodeList) if node.parameterNodeList else 0
+                attributes = {"arity": str(arity)}
+
+                # Zapíšeme element <block> s atributy.
+                hasChildren = node.parameterNodeList or node.statementNodeList
+                if not write_start_tag(write, indent, "block", attributes, hasChildren):
+                    continue
+
+                # Pro každý parametr bloku vytvoříme element <parameter> s atributy 'name' a 'order'.
+                parameterOrder = 1
+                for param in node.parameterNodeList:
+                    attributes = {"order": str(parameterOrder),
+                                  "name": param
+                                  }
+                    write_start_tag(write, childIndent, "parameter", attributes, False)
+                    parameterOrder += 1
+
+                # Pro každý příkaz přiřazení v bloku element <assign>.
+                push(f"{indent}</block>\n")
+                statementNodeList = node.statementNodeList
+                for statementOrder in range(len(statementNodeList), 0, -1):
+                    push(("assign", statementNodeList[statementOrder - 1], childIndent, statementOrder))
+
+            else:
+                raise InternalError(f"Unknown XML element '{tag}' on the traversal stack.")
+
+def write_start_tag(write, indent:str, tag:str, attributes:dict, hasChildren,
+                    escapeTable:dict=XML_ESCAPE_TABLE) -> bool:
+    """
+    Zapíše počáteční tag elementu s atributy. Element bez potomků se rovnou
+    uzavře jako prázdný tag `<tag .../>`. Hodnoty atributů se escapují.
+
+    Parametry:
+        - write (callable): Metoda `write()` výstupního souboru.
+        - indent (str): Odsazení elementu.
+        - tag (str): Název elementu.
+        - attributes (dict): Atributy elementu (v pořadí zápisu).
+        - hasChildren (Any): Pravdivostní hodnota určující, zda má element potomky.
+        - escapeTable (dict): Převodní tabulka pro escapování hodnot atributů.
+
+    Návratová hodnota:
+        - bool: `True`, pokud element zůstal otevřený a je třeba jej uzavřít.
+    """
+    attributeText = "".join(f' {name}="{value.translate(escapeTable)}"'
+                            for name, value in attributes.items())
+    if hasChildren:
+        write(f"{indent}<{tag}{attributeText}>\n")
+        return True
+    write(f"{indent}<{tag}{attributeText}/>\n")
+    return False
+
+def get_first_comment(SOL25Code:str, literalSpans:LiteralSpans | None = None) -> str | None:
     """
-    Vyhledá první komentář v kódu SOL25.
+    Vyhledá první komentář v kódu SOL25 (uvozovky uvnitř řetězcového literálu
+    komentář nezačínají). Text komentáře se vrací neupravený, escapování
+    provádí až zápis atributu `description`. Pokud je předán předběžný průchod
+    téhož kódu (se kterým pracoval lexer SOL25), komentář se převezme z jeho
+    výsledku. Jinak vyhledávání končí hned za uzavírající uvozovkou prvního
+    komentáře, zbytek kódu se neprochází.
 
     Parametry:
         - SOL25Code (str): Zdrojový kód programu v jazyce SOL25.
+        - literalSpans (LiteralSpans | None): Předběžný průchod kódu.
 
     Návratová hodnota:
         - str: První nalezený komentář nebo None, pokud není nalezen.
     """
-    # Vyhledání prvního komentáře v kódu SOL25
-    match = re.search(r'"(.*?)"', SOL25Code, re.DOTALL)
-    if match:
-        firstComment = match.group(0)
-        return firstComment.strip("\"").replace("\n", "&nbsp;")
-    else:
-        return None
+    if literalSpans is not None and literalSpans.text is SOL25Code:
+        return literalSpans.firstComment
+    return scan_literal_spans(SOL25Code, stopAtComment = True)[1]
 
 ### konec souboru 'XMLGenerator.py' ###
@@ -7,26 +7,37 @@
 * Autor:            Jan Kalina <xkalinj00>                                     *
 *                                                                              *
 * Datum:            17.02.2025                                                 *
-* Poslední změna:   21.02.2025                                                 *
+* Poslední změna:   17.10.2026                                                 *
 *                                                                              *
 * Popis:            Tento skript slouží jako hlavní skript analyzátoru kódu    *
 *                   v SOL25. Jde o tzv. vstupní bod (resp. funkci `main()`).   *
 *                   Tento skript slouží ke zpracování parametrů příkazové      *
 *                   řádky (pomocí `argparse`), načtení analyzovaného           *
-*                   zdrojového kódu ze STDIN a následnému vytvoření třídy      *
-*                   tzv. fasády tvořící rozhraní celého analyzátoru.           *
+*                   zdrojového kódu ze STDIN (nebo ze souboru zadaného         *
+*                   parametrem `--input`) a následnému vytvoření třídy         *
+*                   tzv. fasády tvořící rozhraní celého analyzátoru. Parametr  *
+*                   `--batch` spouští dávkovou analýzu více souborů (případně  *
+*                   paralelně ve více procesech, viz `--jobs`), parametr       *
+*                   `--serve` spouští server naslouchající na unixovém         *
+*                   socketu a parametr `--cache` ukládá výsledky do mezipaměti *
+*                   na disku. Parametr `--check-syntax` pouze zkontroluje      *
+*                   syntaxi bez stavby AST a parametr `--max-errors` sebere    *
+*                   více lexikálních a syntaktických (resp. sémantických)      *
+*                   chyb v jednom běhu.                                        *
 ********************************************************************************
 """
 
 # Import modulů standardní knihovny
+import io   # StringIO()
+import os   # fstat()
 import sys  # exit(), stdin.read(), stderr
 
 # Import vlastních modulů
+# (Pozn. ostatní části analyzátoru se importují až v té fázi běhu, která je
+#  potřebuje, takže např. `--help`, chyba vstupu nebo zásah do mezipaměti
+#  výsledků nenačítají knihovnu 'lark' ani další moduly analyzátoru.)
 from MyPyModules import CustomErrors as Error
 from MyPyModules.ArgumentParser import ArgumentParser
-from MyPyModules.LarkParser import LarkParser
-from MyPyModules.SemanticAnalyser import SemanticAnalyser
-from MyPyModules.XMLGenerator import XMLGenerator
 
 ################################################################################
 #                                                                              #
@@ -42,53 +53,164 @@ class Facade:
 
     Atributy:
         - _code (str):                 Zdrojový kód v SOL25.
+        - _literalSpans (LiteralSpans): Předběžný průchod kódu (lexer i generátor XML).
         - _parser (LarkParser):        Instance parseru pro lexikální a syntaktickou analýzu.
         - _checker (SemanticAnalyser): Instance analyzátoru pro sémantickou analýzu.
         - _generator (XMLGenerator):   Instance generátoru XML výstupu.
+        - _fusedAnalyser (FusedAnalyser|None): Sloučený průchod sémantické analýzy
+                                               a generování XML (None, pokud se nepoužije).
 
-    Metody: __init__(SOL25Code:str), run_analysis()
+    Metody: __init__(SOL25Code:str, astBackend:str, fusedPass:bool, maxErrors:int), run_analysis()
     """
-    def __init__(self, SOL25Code):
+    def __init__(self, SOL25Code, astBackend = None, fusedPass = False, maxErrors = None):
         """
         Inicializuje fasádu se zdrojovým kódem v SOL25 předaným na STDIN.
 
         Parametry:
             - SOL25Code (str): Zdrojový kód v SOL25.
+            - astBackend (str): Reprezentace AST ('object' nebo 'flat', výchozí 'object').
+            - fusedPass (bool): Sémantická analýza a generování XML v jediném průchodu AST.
+            - maxErrors (int): Počet sbíraných lexikálních a syntaktických chyb,
+                               resp. sémantických chyb (výchozí None, tj.
+                               analýzu ukončí první chyba).
         """
+        from MyPyModules.LarkParser import LarkParser, OBJECT_AST_BACKEND
+        from MyPyModules.LiteralSpans import find_literal_spans
+
         self._code = SOL25Code
-        self._parser = LarkParser()
-        self._checker = SemanticAnalyser()
-        self._generator = XMLGenerator()
+        self._literalSpans = find_literal_spans(SOL25Code)
+        self._parser = LarkParser(astBackend = astBackend or OBJECT_AST_BACKEND, maxErrors = maxErrors)
+        self._checker = None
+        self._generator = None
+        self._fusedAnalyser = None
+        if fusedPass:
+            from MyPyModules.FusedAnalyser import FusedAnalyser
+            self._fusedAnalyser = FusedAnalyser(maxErrors)
+        else:
+            from MyPyModules.SemanticAnalyser import SemanticAnalyser
+            from MyPyModules.XMLGenerator import XMLGenerator
+            self._checker = SemanticAnalyser(maxErrors)
+            self._generator = XMLGenerator()
 
-    def run_analysis(self):
+    def run_analysis(self, sink = None):
         """
         Provede lexikální a syntaktickou analýzu zdrojového kódu v SOL25,
         sémantickou analýzu a generování XML výstupu.
+
+        Parametry:
+            - sink (TextIO): Soubor pro zápis XML výstupu (výchozí STDOUT).
         """
+        if sink is None:
+            sink = sys.stdout
+
         # Provede lexikální a syntaktickou analýzu, jejímž výstupem je kořen
         # abstraktního syntaktického stromu (AST) reprezentující kód v SOL25.
         try:
-            ASTRoot = self._parser.parse_code(self._code)
+            ASTRoot = self._parser.parse_code(self._code, self._literalSpans)
         except:
             raise
 
+        # Sloučený průchod zapíše výstup až po úspěšné sémantické analýze
+        if self._fusedAnalyser is not None:
+            try:
+                self._fusedAnalyser.write_XML(ASTRoot, self._code, sink, self._literalSpans)
+                sink.write("\n")
+            except:
+                raise
+            return
+
         # Provede sémantickou analýzu zdrojového kódu v SOL25
         try:
             self._checker.analyse_semantic(ASTRoot)
         except:
             raise
 
-        # Generování XML výstup na základě předaného kořenu AST
+        # Generování XML výstupu na základě předaného kořenu AST proudově na STDOUT
+        # (za dokument přidáme prázdný řádek stejně jako dříve `print()`)
         try:
-            XMLcode = self._generator.generate_XML(ASTRoot, self._code)
+            self._generator.write_XML(ASTRoot, self._code, sink, self._literalSpans)
+            sink.write("\n")
         except:
             raise
 
-        # Pokud analýzu a generování kódu proběhlo úspěšně, vytiskne XML na STDOUT
+
+def read_source_file(path):
+    """
+    Načte zdrojový kód v SOL25 ze souboru. Soubor se mapuje do paměti
+    a dekóduje přímo z namapovaného bufferu, takže jeho obsah se nekopíruje
+    do mezilehlého objektu `bytes` (lexer knihovny 'lark' pracuje nad `str`,
+    dekódování je tedy jedinou kopií). Konce řádků se stejně jako při
+    čtení STDIN nepřevádí.
+
+    Parametry:
+        - path (str): Cesta k souboru se zdrojovým kódem.
+
+    Návratová hodnota:
+        - str: Zdrojový kód v SOL25.
+
+    Výjimky:
+        - InputFileError: Pokud soubor nelze otevřít, je prázdný nebo není v UTF-8.
+    """
+    import mmap
+
+    try:
+        with open(path, "rb") as sourceFile:
+            # Prázdný soubor nelze namapovat (a prázdný vstup je chybou i na STDIN)
+            if os.fstat(sourceFile.fileno()).st_size == 0:
+                raise Error.InputFileError()
+            with mmap.mmap(sourceFile.fileno(), 0, access = mmap.ACCESS_READ) as buffer:
+                SOL25Code = str(buffer, "utf-8")
+    except (OSError, ValueError) as e:
+        raise Error.InputFileError(str(e))
+    return SOL25Code
+
+
+def run_syntax_check(SOL25Code, maxErrors = None):
+    """
+    Zkontroluje pouze lexikální a syntaktickou správnost zdrojového kódu
+    v SOL25 (včetně klíčových a rezervovaných slov). AST se nestaví a nic
+    se nevypisuje.
+
+    Parametry:
+        - SOL25Code (str): Zdrojový kód v SOL25.
+        - maxErrors (int): Počet sbíraných chyb (viz `Facade`).
+    """
+    from MyPyModules.LarkParser import LarkParser
+
+    try:
+        LarkParser(syntaxOnly = True, maxErrors = maxErrors).parse_code(SOL25Code)
+    except:
+        raise
+
+
+def run_cached_analysis(SOL25Code, cache, astBackend = None, fusedPass = False):
+    """
+    Provede analýzu zdrojového kódu s využitím mezipaměti výsledků. Při
+    zásahu se uložený výstup vypíše (nebo se vyvolá uložená chyba), aniž by
+    se načítal parser; jinak se provede analýza a její výsledek se uloží.
+
+    Parametry:
+        - SOL25Code (str): Zdrojový kód v SOL25.
+        - cache (ResultCache): Mezipaměť výsledků.
+        - astBackend (str): Reprezentace AST (viz `Facade`).
+        - fusedPass (bool): Sloučený průchod AST (viz `Facade`).
+    """
+    key = cache.get_key(SOL25Code)
+    try:
+        output = cache.lookup(key)
+    except:
+        raise
+
+    if output is None:
+        buffer = io.StringIO()
         try:
-            print(XMLcode)
-        except:
+            Facade(SOL25Code, astBackend, fusedPass).run_analysis(buffer)
+        except Exception as e:
+            cache.store_error(key, e)
             raise
+        output = buffer.getvalue()
+        cache.store_result(key, output)
+    sys.stdout.write(output)
 
 
 ################################################################################
@@ -100,7 +222,7 @@ class Facade:
 def main():
     """
     Hlavní funkce skriptu. Zpracovává argumenty příkazové řádky, načítá
-    zdrojový kód ze STDIN a provádí analýzu kódu.
+    zdrojový kód ze STDIN (nebo ze souboru `--input`) a provádí analýzu kódu.
     """
     try:
         # Instanciace parseru vstupních argumentů a jejich zpracování
@@ -110,16 +232,65 @@ def main():
         except:
             raise
 
-        # Načtení zdrojového kódu v SOL25 ze STDIN
-        try:
-            SOL25Code = sys.stdin.read()
-            if not SOL25Code:
+        # V serverovém režimu se zdrojové kódy přijímají přes unixový socket
+        if argParser.serverSocket is not None:
+            try:
+                from MyPyModules.ParseServer import run_server
+                run_server(argParser.serverSocket)
+                sys.exit(Error.ExitCode.SUCCESS.value)
+            except:
+                raise
+
+        # Mezipaměť výsledků (None, pokud se nepoužije)
+        cache = None
+        if argParser.cacheDirectory is not None:
+            from MyPyModules.ResultCache import DEFAULT_CACHE_SIZE, ResultCache
+            cache = ResultCache(argParser.cacheDirectory, argParser.cacheSize or DEFAULT_CACHE_SIZE)
+
+        # V dávkovém režimu se analyzují zadané soubory místo STDIN
+        if argParser.batchPaths is not None:
+            try:
+                from MyPyModules.BatchAnalyser import BatchAnalyser, ParallelBatchAnalyser
+                if argParser.jobs is None or argParser.jobs == 1:
+                    batchAnalyser = BatchAnalyser(cache)
+                else:
+                    batchAnalyser = ParallelBatchAnalyser(argParser.jobs, cache)
+                sys.exit(batchAnalyser.run(argParser.batchPaths, argParser.outputDirectory))
+            except:
+                raise
+
+        # Načtení zdrojového kódu v SOL25 ze souboru, nebo ze STDIN
+        if argParser.inputFile is not None:
+            try:
+                SOL25Code = read_source_file(argParser.inputFile)
+            except:
+                raise
+        else:
+            try:
+                SOL25Code = sys.stdin.read()
+                if not SOL25Code:
+                    raise Error.InputFileError()
+            except OSError:
                 raise Error.InputFileError()
-        except OSError:
-            raise Error.InputFileError()
+
+        # Při pouhé kontrole syntaxe se nestaví AST ani nevypisuje výstup
+        if argParser.checkSyntax:
+            try:
+                run_syntax_check(SOL25Code, argParser.maxErrors)
+            except:
+                raise
+            sys.exit(Error.ExitCode.SUCCESS.value)
+
+        # S mezipamětí výsledků se analýza provede jen při jejím minutí
+        if cache is not None:
+            try:
+                run_cached_analysis(SOL25Code, cache, argParser.astBackend, argParser.fusedPass)
+            except:
+                raise
+            sys.exit(Error.ExitCode.SUCCESS.value)
 
         # Instanciace fasády parseru 'parse.py'
-        facade = Facade(SOL25Code)
+        facade = Facade(SOL25Code, argParser.astBackend, argParser.fusedPass, argParser.maxErrors)
 
         # Provedeme analýzu zrojového kódu SOL25
         try:
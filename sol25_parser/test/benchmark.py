@@ -0,0 +1,733 @@
+"""
+********************************************************************************
+*                                                                              *
+* Název projektu:   Projekt do předmětu IPP 2024/2025 IFJ24:                   *
+*                   Úloha 1 - Analyzátor kódu v SOL25 (parse.py)               *
+*                                                                              *
+* Soubor:           benchmark.py                                               *
+* Autor:            Jan Kalina <xkalinj00>                                     *
+*                                                                              *
+* Datum:            17.10.2026                                                 *
+* Poslední změna:   17.10.2026                                                 *
+*                                                                              *
+* Popis:            Výkonnostní měření analyzátoru kódu v SOL25. Skript se     *
+*                   spouští z adresáře 'test' příkazem                         *
+*                   'python3.11 benchmark.py [název ...]'; bez argumentů       *
+*                   provede všechna měření.                                    *
+*                                                                              *
+********************************************************************************
+"""
+
+import sys         # argv, executable, path.append()
+import io          # StringIO()
+import os          # path.dirname(), path.abspath(), path.join()
+import subprocess  # run()
+import tempfile    # TemporaryDirectory()
+import time        # perf_counter()
+import statistics  # median()
+import tracemalloc # start(), get_traced_memory(), stop()
+
+# Import modulů analyzátoru
+currentDirectory = os.path.dirname(os.path.abspath(__file__))
+parentDirectory = os.path.abspath(os.path.join(currentDirectory, os.pardir))
+sys.path.append(parentDirectory)
+
+
+################################################################################
+#                                                                              #
+#                                 BENCH-UTILS                                  #
+#                                                                              #
+################################################################################
+
+def run_python(code, env=None):
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=parentDirectory,
+        capture_output=True,
+        text=True,
+        env=env
+        )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr)
+    return process.stdout
+
+def measure(function, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def report(name, value, unit="ms"):
+    print(f"  {name:<40} {value:>12.3f} {unit}")
+
+def measure_peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def generate_program(methodCount):
+    """
+    Vygeneruje syntakticky i sémanticky správný program v SOL25 s třídou
+    'Main' a zadaným počtem dalších metod.
+    """
+    methods = []
+    for i in range(methodCount):
+        methods.append(
+            f"    method{i}:with: [:a :b |\n"
+            f"        x := a plus: {i}.\n"
+            f"        y := (x multiplyBy: b) greaterThan: 'text {i}'.\n"
+            f"        z := [:c | d := c asString. ] value: y.\n"
+            f"        w := self method{i}: x with: nil.\n"
+            f"    ]\n")
+    return ("\"Vygenerovaný program\"\n"
+            "class Main : Object {\n"
+            "    run [| ]\n"
+            + "".join(methods) +
+            "}\n")
+
+
+################################################################################
+#                                                                              #
+#                                    MĚŘENÍ                                    #
+#                                                                              #
+################################################################################
+
+def bench_parser_startup(repeat=5):
+    """
+    Doba vytvoření `LarkParser` v čerstvém interpretu bez mezipaměti (cold)
+    a s naplněnou mezipamětí LALR tabulek (warm).
+    """
+    print("Startup LarkParser (čerstvý interpret):")
+    with tempfile.TemporaryDirectory() as cacheDirectory:
+        code = ("import time\n"
+                "from MyPyModules.LarkParser import LarkParser\n"
+                "start = time.perf_counter()\n"
+                f"LarkParser(cacheDirectory={cacheDirectory!r})\n"
+                "print(time.perf_counter() - start)\n")
+        cold = []
+        for _ in range(repeat):
+            for name in os.listdir(cacheDirectory):
+                os.remove(os.path.join(cacheDirectory, name))
+            cold.append(float(run_python(code)))
+        warm = [float(run_python(code)) for _ in range(repeat)]
+    report("cold (sestavení LALR tabulek)", statistics.median(cold) * 1000)
+    report("warm (načtení z mezipaměti)", statistics.median(warm) * 1000)
+
+
+def bench_standalone_startup(repeat=10):
+    """
+    Celková doba běhu interpretu, který vytvoří `LarkParser` a zparsuje
+    minimální program: samostatný parser vs. knihovna 'lark' s mezipamětí.
+    """
+    from MyPyModules.LarkParser import build_standalone_parser
+    print("Samostatný parser vs. 'lark' (celý proces):")
+    code = ("from MyPyModules.LarkParser import LarkParser\n"
+            "LarkParser().parse_code('class Main : Object { run [| ] }')\n")
+    with tempfile.TemporaryDirectory() as moduleDirectory:
+        modulePath = os.path.join(moduleDirectory, "SOL25StandaloneParser.py")
+        build_standalone_parser(modulePath)
+        for name, path in (("lark + mezipaměť LALR", ""), ("samostatný parser", modulePath)):
+            env = dict(os.environ, SOL25_STANDALONE_PATH=path)
+            env.pop("PYTHONDONTWRITEBYTECODE", None)
+            run_python(code, env)  # zahřátí (vytvoření '.pyc' a mezipaměti)
+            report(name, measure(lambda: run_python(code, env), repeat) * 1000)
+
+
+def bench_inline_transform(methodCount=10000, repeat=3):
+    """
+    Doba a špička alokované paměti `LarkParser.parse_code()` pro program
+    s 10 000 metodami: parse strom + `transform()` vs. AST během redukcí.
+    """
+    from MyPyModules.LarkParser import LarkParser
+    print(f"Parsování programu s {methodCount} metodami:")
+    SOL25Code = generate_program(methodCount)
+    for name, buildParseTree in (("parse strom + transform()", True), ("AST během redukcí", False)):
+        parser = LarkParser(buildParseTree=buildParseTree)
+        report(f"{name} (čas)", measure(lambda: parser.parse_code(SOL25Code), repeat) * 1000)
+        peak = measure_peak_memory(lambda: parser.parse_code(SOL25Code))
+        report(f"{name} (paměť)", peak / 2**20, "MiB")
+
+
+def bench_batch_throughput(fileCount=50, methodCount=20):
+    """
+    Propustnost (soubory/s) samostatných běhů 'parse.py' pro každý soubor
+    a jednoho běhu 'parse.py --batch' nad stejnými soubory.
+    """
+    print(f"Analýza {fileCount} souborů:")
+    SOL25Code = generate_program(methodCount)
+    with tempfile.TemporaryDirectory() as sourceDirectory:
+        for i in range(fileCount):
+            with open(os.path.join(sourceDirectory, f"{i}.sol25"), "w") as sourceFile:
+                sourceFile.write(SOL25Code)
+        parseScript = os.path.join(parentDirectory, "parse.py")
+
+        def run_per_file():
+            for i in range(fileCount):
+                with open(os.path.join(sourceDirectory, f"{i}.sol25")) as sourceFile:
+                    subprocess.run([sys.executable, parseScript], stdin=sourceFile,
+                                   capture_output=True, check=True)
+
+        def run_batch():
+            subprocess.run([sys.executable, parseScript, "--batch", sourceDirectory],
+                           capture_output=True, check=True)
+
+        report("proces pro každý soubor", fileCount / measure(run_per_file, 1), "soub./s")
+        report("--batch", fileCount / measure(run_batch, 3), "soub./s")
+
+
+def bench_parallel_scaling(fileCount=400, methodCount=100):
+    """
+    Propustnost (soubory/s) paralelní dávkové analýzy pro 1 až N procesů,
+    kde N je počet dostupných jader.
+    """
+    from MyPyModules.BatchAnalyser import ParallelBatchAnalyser, get_available_cpu_count
+    coreCount = get_available_cpu_count()
+    print(f"Paralelní analýza {fileCount} souborů (dostupná jádra: {coreCount}):")
+    SOL25Code = generate_program(methodCount)
+    with tempfile.TemporaryDirectory() as sourceDirectory:
+        for i in range(fileCount):
+            with open(os.path.join(sourceDirectory, f"{i}.sol25"), "w") as sourceFile:
+                sourceFile.write(SOL25Code)
+        for jobs in range(1, coreCount + 1):
+            analyser = ParallelBatchAnalyser(jobs)
+            elapsed = measure(lambda: analyser.run([sourceDirectory], manifest=io.StringIO()), 1)
+            report(f"{jobs} proces(ů)", fileCount / elapsed, "soub./s")
+
+
+def bench_method_lookup(depth=1000, repeat=5):
+    """
+    Doba vyhledání metody ze všech tříd řetězce dědičnosti hloubky 1000
+    (první průchod plní mezipaměť, druhý z ní již jen čte).
+    """
+    from MyPyModules.Symtable import Symtable
+    print(f"Vyhledání metody v řetězci dědičnosti hloubky {depth}:")
+
+    def create_manager():
+        manager = Symtable().classManager
+        manager.load_builtin_symbols()
+        manager.insert_class_symbol("C0", "Object", True)
+        manager.insert_method_symbol("C0", "foo", None)
+        for i in range(1, depth):
+            manager.insert_class_symbol(f"C{i}", f"C{i - 1}", True)
+        return manager
+
+    def lookup_all(manager):
+        for i in range(depth - 1, -1, -1):
+            manager.get_method_symbol(f"C{i}", "foo")
+
+    managers = [create_manager() for _ in range(repeat)]
+    report("první průchod (plnění mezipaměti)", measure(lambda: lookup_all(managers.pop()), repeat) * 1000)
+    manager = create_manager()
+    lookup_all(manager)
+    report("opakovaný průchod", measure(lambda: lookup_all(manager), repeat) * 1000)
+
+
+def bench_cyclic_inheritance(classCount=10000, repeat=3):
+    """
+    Doba kontroly cyklické dědičnosti pro 10 000 tříd v jednom řetězci
+    a v jednom cyklu.
+    """
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    print(f"Kontrola cyklické dědičnosti pro {classCount} tříd:")
+
+    def create_analyser(parents):
+        analyser = SemanticAnalyser()
+        manager = analyser._symtable.classManager
+        manager.load_builtin_symbols()
+        for identifier, parentIdentifier in parents:
+            manager.insert_class_symbol(identifier, parentIdentifier, True)
+        return analyser
+
+    def check(analyser):
+        try:
+            analyser.check_cyclic_inheritance()
+        except Exception:
+            pass
+
+    chain = create_analyser([("C0", "Object")] + [(f"C{i}", f"C{i - 1}") for i in range(1, classCount)])
+    ring = create_analyser([(f"C{i}", f"C{(i + 1) % classCount}") for i in range(classCount)])
+    report("řetězec", measure(lambda: check(chain), repeat) * 1000)
+    report("cyklus", measure(lambda: check(ring), repeat) * 1000)
+
+
+def bench_incremental_edit(classCount=200, methodCount=5, repeat=5):
+    """
+    Doba analýzy programu s 200 třídami po úpravě těla jedné třídy: úplná
+    analýza vs. inkrementální analýza (`IncrementalAnalyser`).
+    """
+    from MyPyModules.BatchAnalyser import BatchAnalyser
+    from MyPyModules.IncrementalAnalyser import IncrementalAnalyser
+    print(f"Úprava jedné třídy v programu s {classCount} třídami:")
+    methods = "".join(f"    method{i}:with: [:a :b | x := a plus: {i}. y := self method{i}: x with: b. ]\n"
+                      for i in range(methodCount))
+    classes = ["class Main : Object {\n    run [| ]\n}\n"]
+    classes += [f"class C{i} : Object {{\n{methods}}}\n" for i in range(classCount)]
+    versions = []
+    for value in range(2):
+        edited = list(classes)
+        edited[classCount // 2] = edited[classCount // 2].replace("plus: 0.", f"plus: {value}.")
+        versions.append("".join(edited))
+
+    full = BatchAnalyser()
+    incremental = IncrementalAnalyser()
+    incremental.analyse_code(versions[1])
+    report("úplná analýza", measure(lambda: full.analyse_code(versions[0]), repeat) * 1000)
+    report("inkrementální analýza", measure(
+        lambda: [incremental.analyse_code(version) for version in versions], repeat) * 1000 / 2)
+
+
+def bench_result_cache(methodCount=200, repeat=10):
+    """
+    Celková doba běhu 'parse.py --cache DIR' pro program s 200 metodami:
+    bez mezipaměti, při minutí (analýza + zápis) a při zásahu.
+    """
+    print(f"Mezipaměť výsledků (program s {methodCount} metodami, celý proces):")
+    SOL25Code = generate_program(methodCount)
+    parseScript = os.path.join(parentDirectory, "parse.py")
+    with tempfile.TemporaryDirectory() as cacheDirectory:
+
+        def run_parse(*args):
+            subprocess.run([sys.executable, parseScript, *args], input=SOL25Code,
+                           capture_output=True, text=True, check=True)
+
+        def run_miss():
+            for name in os.listdir(cacheDirectory):
+                os.remove(os.path.join(cacheDirectory, name))
+            run_parse("--cache", cacheDirectory)
+
+        report("bez mezipaměti", measure(run_parse, repeat) * 1000)
+        report("minutí", measure(run_miss, repeat) * 1000)
+        run_parse("--cache", cacheDirectory)
+        report("zásah", measure(lambda: run_parse("--cache", cacheDirectory), repeat) * 1000)
+
+
+def bench_input_memory(methodCount=20000):
+    """
+    Špička RSS procesu 'parse.py' pro vygenerovaný program o velikosti
+    několika MB a špička alokací samotného načtení vstupu: čtení ze STDIN
+    vs. namapovaný soubor (`--input FILE`).
+    """
+    SOL25Code = generate_program(methodCount)
+    print(f"Špička RSS 'parse.py' pro vstup {len(SOL25Code) / 2**20:.1f} MiB:")
+    parseScript = os.path.join(parentDirectory, "parse.py")
+    with tempfile.TemporaryDirectory() as sourceDirectory:
+        sourcePath = os.path.join(sourceDirectory, "program.sol25")
+        with open(sourcePath, "w") as sourceFile:
+            sourceFile.write(SOL25Code)
+        # Špička RSS potomka se měří v samostatném procesu (RUSAGE_CHILDREN
+        # vrací maximum přes všechny dosud ukončené potomky)
+        for name, arguments, stdin in (("STDIN", [], sourcePath), ("--input FILE", ["--input", sourcePath], None)):
+            code = ("import resource, subprocess, sys\n"
+                    f"stdin = open({stdin!r}) if {stdin!r} else subprocess.DEVNULL\n"
+                    f"subprocess.run([sys.executable, {parseScript!r}, *{arguments!r}], stdin=stdin,\n"
+                    "               stdout=subprocess.DEVNULL, check=True)\n"
+                    "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)\n")
+            report(name, int(run_python(code)) / 1024, "MiB")
+
+        # Samotné načtení vstupu (STDIN se čte stejně jako soubor v textovém režimu)
+        from parse import read_source_file
+        with open(sourcePath) as sourceFile:
+            report("načtení STDIN (alokace)", measure_peak_memory(sourceFile.read) / 2**20, "MiB")
+        report("načtení --input FILE (alokace)",
+               measure_peak_memory(lambda: read_source_file(sourcePath)) / 2**20, "MiB")
+
+
+def bench_ast_node_memory(nodeCount=100000, methodCount=5000):
+    """
+    Paměť jednoho uzlu AST (bajty na uzel) s `__slots__` a pro srovnání
+    s ekvivalentními třídami s `__dict__` (původní definice uzlů): pro
+    samotné uzly každého typu a pro celý AST vygenerovaného programu
+    (včetně seznamů a řetězců).
+    """
+    from MyPyModules.AbstractSyntaxTree import ASTNodes
+    from MyPyModules.LarkParser import LarkParser
+    print("Paměť uzlů AST (bajty na uzel, __dict__ -> __slots__):")
+    nodeClasses = {name: getattr(ASTNodes, name) for name in (
+        "ProgramNode", "ClassNode", "MethodNode", "BlockNode", "IdentifierNode",
+        "LiteralNode", "AssignNode", "ExpressionNode")}
+    dictClasses = {name: type(name, (), {"__init__": nodeClass.__init__, "visit_by": nodeClass.visit_by})
+                   for name, nodeClass in nodeClasses.items()}
+
+    def measure_retained(function):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            result = function()
+            return result, tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+    for name, nodeClass in nodeClasses.items():
+        argumentCount = nodeClass.__init__.__code__.co_argcount - 1
+        sizes = []
+        for createdClass in (dictClasses[name], nodeClass):
+            _, size = measure_retained(lambda: [createdClass(*[None] * argumentCount) for _ in range(nodeCount)])
+            sizes.append((size - sys.getsizeof([None] * nodeCount)) / nodeCount)
+        print(f"  {name:<40} {sizes[0]:>8.1f} -> {sizes[1]:>6.1f} B")
+
+    def count_nodes(ASTRoot):
+        count, stack = 0, [ASTRoot]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, ASTNodes.ASTAbstractNode):
+                count += 1
+                stack.extend(getattr(node, slot) for slot in type(node).__slots__)
+        return count
+
+    SOL25Code = generate_program(methodCount)
+    parser = LarkParser()
+    ASTRoot, slotsSize = measure_retained(lambda: parser.parse_code(SOL25Code))
+    totalCount = count_nodes(ASTRoot)
+    del ASTRoot
+    try:
+        for name, dictClass in dictClasses.items():
+            setattr(ASTNodes, name, dictClass)
+        ASTRoot, dictSize = measure_retained(lambda: parser.parse_code(SOL25Code))
+        assert type(ASTRoot) is dictClasses["ProgramNode"]
+        del ASTRoot
+    finally:
+        for name, nodeClass in nodeClasses.items():
+            setattr(ASTNodes, name, nodeClass)
+    print(f"  {f'celý AST ({totalCount} uzlů)':<40} {dictSize / totalCount:>8.1f} -> "
+          f"{slotsSize / totalCount:>6.1f} B")
+
+
+def bench_interning(methodCount=5000, repeat=5):
+    """
+    Paměť AST a doba sémantické analýzy (vyhledávání v tabulce symbolů)
+    vygenerovaného programu s internovanými a neinternovanými identifikátory
+    a selektory.
+    """
+    from MyPyModules import LarkParser as LarkParserModule
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    print(f"Internování identifikátorů a selektorů (program s {methodCount} metodami):")
+    SOL25Code = generate_program(methodCount)
+    parser = LarkParserModule.LarkParser()
+
+    def parse_retained():
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            ASTRoot = parser.parse_code(SOL25Code)
+            return ASTRoot, tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+
+    results = {}
+    intern = LarkParserModule.intern
+    try:
+        for name, internFunction in (("bez internování", lambda string: string), ("internování", intern)):
+            LarkParserModule.intern = internFunction
+            ASTRoot, size = parse_retained()
+            elapsed = measure(lambda ASTRoot=ASTRoot: SemanticAnalyser().analyse_semantic(ASTRoot), repeat)
+            results[name] = (size, elapsed)
+            del ASTRoot
+    finally:
+        LarkParserModule.intern = intern
+    for name, (size, elapsed) in results.items():
+        report(f"{name} (paměť AST)", size / 2**20, "MiB")
+        report(f"{name} (sémantická analýza)", elapsed * 1000)
+
+
+def bench_flat_ast(methodCount=5000, repeat=3):
+    """
+    Paměť AST (bajty na uzel) a doba parsování, sémantické analýzy a generování
+    XML vygenerovaného programu pro strom objektů a plochý AST.
+    """
+    from MyPyModules.LarkParser import LarkParser, AST_BACKENDS
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    from MyPyModules.XMLGenerator import XMLGenerator
+    print(f"Reprezentace AST (program s {methodCount} metodami):")
+    SOL25Code = generate_program(methodCount)
+    nodeCount = None
+    for backend in AST_BACKENDS:
+        parser = LarkParser(astBackend=backend)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            ASTRoot = parser.parse_code(SOL25Code)
+            size = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        if nodeCount is None:
+            nodeCount = sum(1 for _ in iterate_nodes(ASTRoot))
+        report(f"{backend} (paměť AST)", size / nodeCount, "B/uzel")
+        report(f"{backend} (parsování)", measure(lambda: parser.parse_code(SOL25Code), repeat) * 1000)
+        report(f"{backend} (sémantika + XML)", measure(lambda ASTRoot=ASTRoot: (SemanticAnalyser().analyse_semantic(ASTRoot),
+                                                                         XMLGenerator().generate_XML(ASTRoot, SOL25Code)),
+                                                                repeat) * 1000)
+        del ASTRoot
+
+
+
+def bench_iterative_traversal(methodCount=5000, depth=100000, repeat=5):
+    """
+    Doba sémantické analýzy a generování XML vygenerovaného programu (běžné
+    zanoření) a doba sémantické analýzy programu se zanořením `depth`
+    zasílání zpráv (XML výstup takového programu má kvadratickou velikost).
+    """
+    from MyPyModules.LarkParser import LarkParser
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    from MyPyModules.XMLGenerator import XMLGenerator
+    print(f"Iterativní průchod AST (program s {methodCount} metodami, zanoření {depth}):")
+    parser = LarkParser()
+    SOL25Code = generate_program(methodCount)
+    ASTRoot = parser.parse_code(SOL25Code)
+    report("sémantická analýza", measure(lambda ASTRoot=ASTRoot: SemanticAnalyser().analyse_semantic(ASTRoot), repeat) * 1000)
+    report("generování XML", measure(lambda ASTRoot=ASTRoot: XMLGenerator().generate_XML(ASTRoot, SOL25Code), repeat) * 1000)
+    del ASTRoot
+
+    deepCode = ("class Main : Object { run [| x := " + "(1 plus: " * depth + "1"
+                + ")" * depth + ". ] }")
+    ASTRoot = parser.parse_code(deepCode)
+    report("sémantická analýza (hluboké zanoření)",
+           measure(lambda ASTRoot=ASTRoot: SemanticAnalyser().analyse_semantic(ASTRoot), repeat) * 1000)
+    del ASTRoot
+
+def bench_fused_pass(methodCount=5000, blockCount=20000, repeat=5):
+    """
+    Doba sémantické analýzy následované generováním XML (dva průchody) vs.
+    sloučený průchod `FusedAnalyser` na vygenerovaném programu a na programu
+    s velkým počtem zanořených bloků a přiřazení (převažuje průchod AST).
+    """
+    from MyPyModules.LarkParser import LarkParser
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    from MyPyModules.XMLGenerator import XMLGenerator
+    from MyPyModules.FusedAnalyser import FusedAnalyser
+
+    def two_pass(ASTRoot, SOL25Code):
+        SemanticAnalyser().analyse_semantic(ASTRoot)
+        XMLGenerator().generate_XML(ASTRoot, SOL25Code)
+
+    print(f"Sloučený průchod (program s {methodCount} metodami, {blockCount} bloků):")
+    parser = LarkParser()
+    blockCode = ("class Main : Object { run [|"
+                 + " x := [:a | y := a. z := [:b | w := b. ]. ]." * blockCount
+                 + " ] }")
+    for name, SOL25Code in (("vygenerovaný program", generate_program(methodCount)),
+                            ("zanořené bloky", blockCode)):
+        ASTRoot = parser.parse_code(SOL25Code)
+        report(f"dva průchody ({name})",
+               measure(lambda ASTRoot=ASTRoot: two_pass(ASTRoot, SOL25Code), repeat) * 1000)
+        report(f"sloučený průchod ({name})",
+               measure(lambda ASTRoot=ASTRoot: FusedAnalyser().generate_XML(ASTRoot, SOL25Code), repeat) * 1000)
+        del ASTRoot
+
+def bench_sol25_lexer(methodCount=5000, repeat=5):
+    """
+    Propustnost (MB/s) samotné lexikální analýzy vygenerovaného programu:
+    lexer knihovny 'lark' (`Lark.lex()`, všechny terminály) vs. lexer SOL25
+    bez stavu parseru, a propustnost parsování s kontextovým lexerem 'lark'
+    vs. s lexerem SOL25.
+    """
+    from lark.lexer import LexerState
+    from MyPyModules.LarkParser import LarkParser, LARK_LEXER, SOL25_LEXER
+    SOL25Code = generate_program(methodCount)
+    megabytes = len(SOL25Code.encode("utf-8")) / 1e6
+    print(f"Lexer SOL25 (program s {methodCount} metodami, {megabytes:.1f} MB):")
+    larkParser = LarkParser(lexer=LARK_LEXER)
+    SOL25Parser = LarkParser(lexer=SOL25_LEXER)
+    larkLexer = larkParser._larkParser
+    SOL25Lexer = SOL25Parser._larkParser.parser.lexer
+    report("lexikální analýza, 'lark'",
+           megabytes / measure(lambda: sum(1 for _ in larkLexer.lex(SOL25Code)), repeat), "MB/s")
+    report("lexikální analýza, SOL25",
+           megabytes / measure(lambda: sum(1 for _ in SOL25Lexer.lex(LexerState(SOL25Code), None)), repeat),
+           "MB/s")
+    report("parsování, kontextový lexer 'lark'",
+           megabytes / measure(lambda: larkParser.parse_code(SOL25Code), repeat), "MB/s")
+    report("parsování, lexer SOL25",
+           megabytes / measure(lambda: SOL25Parser.parse_code(SOL25Code), repeat), "MB/s")
+
+def bench_literal_spans(methodCount=1000, repeat=5):
+    """
+    Propustnost (MB/s) na programu s dlouhými komentáři a literály: samotný
+    předběžný průchod literálů, lexikální analýza lexerem 'lark' a lexerem
+    SOL25 (včetně předběžného průchodu) a parsování s oběma lexery.
+    """
+    from lark.lexer import LexerState
+    from MyPyModules.LarkParser import LarkParser, LARK_LEXER, SOL25_LEXER
+    from MyPyModules.LiteralSpans import find_literal_spans
+    methods = [f"    \"{'komentář ' * 500}\"\n"
+               f"    method{index} [| x := '{'text ' * 1000}'. y := x. ]\n"
+               for index in range(methodCount)]
+    SOL25Code = "class Main : Object {\n    run [| ]\n" + "".join(methods) + "}\n"
+    megabytes = len(SOL25Code.encode("utf-8")) / 1e6
+    print(f"Předběžný průchod literálů (program s {methodCount} metodami, {megabytes:.1f} MB):")
+    larkParser = LarkParser(lexer=LARK_LEXER)
+    SOL25Parser = LarkParser(lexer=SOL25_LEXER)
+    larkLexer = larkParser._larkParser
+    SOL25Lexer = SOL25Parser._larkParser.parser.lexer
+
+    report("předběžný průchod",
+           megabytes / measure(lambda: find_literal_spans(SOL25Code), repeat), "MB/s")
+    report("lexikální analýza, 'lark'",
+           megabytes / measure(lambda: sum(1 for _ in larkLexer.lex(SOL25Code)), repeat), "MB/s")
+    report("lexikální analýza, SOL25",
+           megabytes / measure(lambda: sum(1 for _ in SOL25Lexer.lex(LexerState(SOL25Code), None)), repeat),
+           "MB/s")
+    report("parsování, kontextový lexer 'lark'",
+           megabytes / measure(lambda: larkParser.parse_code(SOL25Code), repeat), "MB/s")
+    report("parsování, lexer SOL25",
+           megabytes / measure(lambda: SOL25Parser.parse_code(SOL25Code), repeat), "MB/s")
+
+def bench_check_syntax(methodCount=5000, repeat=5):
+    """
+    Doba pouhé kontroly syntaxe (`--check-syntax`, bez stavby AST) vs. parsování
+    se stavbou AST a celé analýzy (parsování, sémantická analýza a generování XML).
+    """
+    from MyPyModules.LarkParser import LarkParser
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    from MyPyModules.XMLGenerator import XMLGenerator
+    SOL25Code = generate_program(methodCount)
+    fullParser = LarkParser()
+    checkParser = LarkParser(syntaxOnly=True)
+
+    def analyse():
+        ASTRoot = fullParser.parse_code(SOL25Code)
+        SemanticAnalyser().analyse_semantic(ASTRoot)
+        XMLGenerator().write_XML(ASTRoot, SOL25Code, io.StringIO())
+
+    print(f"Kontrola syntaxe (program s {methodCount} metodami):")
+    report("celá analýza", measure(analyse, repeat) * 1000)
+    report("parsování se stavbou AST", measure(lambda: fullParser.parse_code(SOL25Code), repeat) * 1000)
+    report("kontrola syntaxe", measure(lambda: checkParser.parse_code(SOL25Code), repeat) * 1000)
+
+def bench_error_recovery(methodCount=5000, errorCount=10, repeat=5):
+    """
+    Nalezení všech chyb programu s chybějícími tečkami za příkazy: opakované
+    parsování (po každém běhu se opraví první hlášená chyba) vs. jediný běh se
+    zotavením z chyb (`--max-errors`), a režie zotavení na správném programu.
+    """
+    from MyPyModules.CustomErrors import CustomError
+    from MyPyModules.LarkParser import LarkParser
+    SOL25Code = generate_program(methodCount)
+    step = methodCount // errorCount
+    marks = [f"x := a plus: {index}.\n" for index in range(step // 2, methodCount, step)]
+
+    def remove_dots(marksToBreak):
+        brokenCode = SOL25Code
+        for mark in marksToBreak:
+            brokenCode = brokenCode.replace(mark, mark[:-2] + "\n")
+        return brokenCode
+
+    # Postupně opravované verze programu (v každé je opravena první chyba té předchozí)
+    versions = [remove_dots(marks[index:]) for index in range(errorCount)]
+    normalParser = LarkParser(syntaxOnly=True)
+    recoveryParser = LarkParser(syntaxOnly=True, maxErrors=errorCount)
+
+    def parse_until_fixed():
+        for version in versions:
+            try:
+                normalParser.parse_code(version)
+            except CustomError:
+                pass
+
+    def parse_with_recovery():
+        try:
+            recoveryParser.parse_code(versions[0])
+        except CustomError as e:
+            assert len(e.errorDetail.split("\n")) == errorCount
+
+    print(f"Zotavení z chyb (program s {methodCount} metodami a {errorCount} chybami, kontrola syntaxe):")
+    report(f"{errorCount} běhů s opravou první chyby", measure(parse_until_fixed, repeat) * 1000)
+    report("jeden běh se zotavením z chyb", measure(parse_with_recovery, repeat) * 1000)
+    report("správný program, bez zotavení", measure(lambda: normalParser.parse_code(SOL25Code), repeat) * 1000)
+    report("správný program, se zotavením", measure(lambda: recoveryParser.parse_code(SOL25Code), repeat) * 1000)
+
+def bench_semantic_errors(methodCount=5000, errorCount=10, repeat=5):
+    """
+    Nalezení všech sémantických chyb programu s nedefinovanými proměnnými:
+    opakovaná analýza (po každém běhu se opraví první hlášená chyba) vs. jediný
+    běh se sbíráním chyb (`--max-errors`), a režie sbírání na správném programu.
+    """
+    from MyPyModules.CustomErrors import CustomError
+    from MyPyModules.LarkParser import LarkParser
+    from MyPyModules.SemanticAnalyser import SemanticAnalyser
+    SOL25Code = generate_program(methodCount)
+    step = methodCount // errorCount
+    indices = list(range(step // 2, methodCount, step))
+
+    def break_variables(indicesToBreak):
+        brokenCode = SOL25Code
+        for index in indicesToBreak:
+            brokenCode = brokenCode.replace(f"x := a plus: {index}.", f"x := q{index} plus: {index}.")
+        return brokenCode
+
+    # Postupně opravované verze programu (v každé je opravena první chyba té předchozí)
+    versions = [break_variables(indices[index:]) for index in range(errorCount)]
+    parser = LarkParser()
+
+    def analyse_until_fixed():
+        for version in versions:
+            try:
+                SemanticAnalyser().analyse_semantic(parser.parse_code(version))
+            except CustomError:
+                pass
+
+    def analyse_with_collecting():
+        try:
+            SemanticAnalyser(maxErrors=errorCount).analyse_semantic(parser.parse_code(versions[0]))
+        except CustomError as e:
+            assert len(e.errorDetail.split("\n")) == errorCount
+
+    ASTRoot = parser.parse_code(SOL25Code)
+    print(f"Sbírání sémantických chyb (program s {methodCount} metodami a {errorCount} chybami):")
+    report(f"{errorCount} běhů s opravou první chyby", measure(analyse_until_fixed, repeat) * 1000)
+    report("jeden běh se sbíráním chyb", measure(analyse_with_collecting, repeat) * 1000)
+    report("správný program, bez sbírání (jen analýza)",
+           measure(lambda: SemanticAnalyser().analyse_semantic(ASTRoot), repeat) * 1000)
+    report("správný program, se sbíráním (jen analýza)",
+           measure(lambda: SemanticAnalyser(maxErrors=errorCount).analyse_semantic(ASTRoot), repeat) * 1000)
+
+def iterate_nodes(ASTRoot):
+    """
+    Projde všechny uzly AST (pro oba druhy reprezentace AST).
+    """
+    from MyPyModules.AbstractSyntaxTree import ASTNodes
+    stack = [ASTRoot]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ASTNodes.ASTAbstractNode):
+            yield node
+            nodeClass = next(nodeClass for nodeClass in type(node).__mro__
+                             if nodeClass.__qualname__.startswith("ASTNodes."))
+            stack.extend(getattr(node, slot) for slot in nodeClass.__slots__)
+
+
+BENCHMARKS = {
+    "startup": bench_parser_startup,
+    "standalone": bench_standalone_startup,
+    "inline": bench_inline_transform,
+    "batch": bench_batch_throughput,
+    "parallel": bench_parallel_scaling,
+    "methods": bench_method_lookup,
+    "cyclic": bench_cyclic_inheritance,
+    "incremental": bench_incremental_edit,
+    "cache": bench_result_cache,
+    "input": bench_input_memory,
+    "nodes": bench_ast_node_memory,
+    "intern": bench_interning,
+    "flat": bench_flat_ast,
+    "iterative": bench_iterative_traversal,
+    "fused": bench_fused_pass,
+    "lexer": bench_sol25_lexer,
+    "literals": bench_literal_spans,
+    "syntax": bench_check_syntax,
+    "recovery": bench_error_recovery,
+    "semantic": bench_semantic_errors,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for benchmarkName in selected:
+        BENCHMARKS[benchmarkName]()
@@ -25,12 +25,35 @@ import contextlib  # redirect_stdout()
 import xml.etree.ElementTree as ET
 import subprocess
 import re
+from xml.dom import minidom
+import threading   # Thread()
+import json        # dumps(), loads()
+import signal      # SIGTERM
+import time        # sleep()
+from concurrent.futures import ThreadPoolExecutor
+import random      # Random()
+from lark.lexer import LexerState
 
 # Import skriptu 'parse.py'
 currentDirectory = os.path.dirname(os.path.abspath(__file__))
 parentDirectory = os.path.abspath(os.path.join(currentDirectory, os.pardir))
 sys.path.append(parentDirectory)
 import parse  # main()
+from MyPyModules import LarkParser as LarkParserModule
+from MyPyModules import BatchAnalyser as Batch
+from MyPyModules import ResultCache as ResultCacheModule
+from MyPyModules.XMLGenerator import XMLGenerator, get_first_comment
+from MyPyModules.LarkParser import (LarkParser, FLAT_AST_BACKEND, LARK_LEXER, SOL25_LEXER,
+                                    UnexpectedCharacters, UnexpectedToken)
+from MyPyModules.AbstractSyntaxTree import ASTNodes
+from MyPyModules.BatchAnalyser import BatchAnalyser
+from MyPyModules.ParseServer import ParseServer, PARSE_COMMAND, send_request, STATS_COMMAND, UPDATE_COMMAND
+from MyPyModules.Symtable import BUILTIN_CLASS_TABLE, Symtable, Symbols
+from MyPyModules.SemanticAnalyser import SemanticAnalyser
+from MyPyModules.IncrementalAnalyser import split_class_regions, IncrementalAnalyser
+from MyPyModules.ResultCache import ResultCache
+from MyPyModules.FusedAnalyser import FusedAnalyser
+from MyPyModules.LiteralSpans import scan_literal_spans, find_literal_spans
 
 
 ################################################################################
@@ -2799,4 +2822,1829 @@ def test_arg_bad_help_and_short_help(monkeypatch):
 def test_arg_bad_short_help_and_help(monkeypatch):
     run_arg_test(['-h', '--help'], 10)
 
+################################################################################
+#                                                                              #
+#                         MEZIPAMĚŤ LALR TABULEK TESTY                         #
+#                                                                              #
+################################################################################
+
+CACHE_TEST_CODE = """
+    class Main : Object {
+        run [| x := 1 plus: 2. ]
+    }
+"""
+
+def test_cache_ok_created_and_reused(tmp_path):
+    LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    cachePath = LarkParserModule.get_cache_path(str(tmp_path))
+    assert os.path.exists(cachePath)
+    assert [f for f in os.listdir(tmp_path) if f.endswith(".tmp")] == []
+
+    modified = os.path.getmtime(cachePath)
+    parser = LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    assert os.path.getmtime(cachePath) == modified
+    assert parser.parse_code(CACHE_TEST_CODE).classNodeList[0].identifier == "Main"
+
+def test_cache_ok_corrupt_file_rebuilds(tmp_path):
+    cachePath = LarkParserModule.get_cache_path(str(tmp_path))
+    with open(cachePath, "wb") as f:
+        f.write(LarkParserModule.get_grammar_fingerprint().encode("ascii") + b"\nnot a pickle")
+    parser = LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    assert parser.parse_code(CACHE_TEST_CODE).classNodeList[0].identifier == "Main"
+    assert LarkParserModule.load_cached_parser(cachePath) is not None
+
+def test_cache_ok_fingerprint_mismatch_ignored(tmp_path):
+    cachePath = LarkParserModule.get_cache_path(str(tmp_path))
+    LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    with open(cachePath, "rb") as f:
+        content = f.read().split(b"\n", 1)[1]
+    with open(cachePath, "wb") as f:
+        f.write(b"0" * 64 + b"\n" + content)
+    assert LarkParserModule.load_cached_parser(cachePath) is None
+
+def test_cache_ok_fingerprint_depends_on_grammar(monkeypatch):
+    original = LarkParserModule.get_grammar_fingerprint()
+    monkeypatch.setattr(LarkParserModule, "SOL25_GRAMMAR", LarkParserModule.SOL25_GRAMMAR + "\n")
+    assert LarkParserModule.get_grammar_fingerprint() != original
+    monkeypatch.setattr(LarkParserModule, "LARK_VERSION", "0.0.0")
+    assert LarkParserModule.get_grammar_fingerprint() != original
+
+def test_cache_ok_missing_lark_internals(tmp_path, monkeypatch):
+    monkeypatch.delattr(LarkParserModule.Lark, "_load_from_dict")
+    parser = LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    assert parser.parse_code(CACHE_TEST_CODE).classNodeList[0].identifier == "Main"
+    assert os.listdir(tmp_path) == []
+
+def test_cache_ok_lexical_error_from_cache(tmp_path):
+    LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    parser = LarkParserModule.LarkParser(cacheDirectory=str(tmp_path))
+    with pytest.raises(LarkParserModule.LexicalError):
+        parser.parse_code("class Main : Object { run [| x := +-1. ] }")
+
+################################################################################
+#                                                                              #
+#                    SAMOSTATNÝ PARSER (PARITA S 'lark') TESTY                 #
+#                                                                              #
+################################################################################
+
+PARITY_PROGRAMS = [
+    # úspěšná analýza
+    """
+    "Popis programu"
+    class Main : Object {
+        run [|
+            x := 1 plus: 2.
+            y := 'a\\n<&>' concatenateWith: (x asString).
+            z := [:a :b | c := a plus: b. ] value: 1 value: 2.
+            w := (Foo new) foo: nil bar: true.
+        ]
+    }
+    class Foo : Object {
+        foo:bar: [:p :q | r := self. s := super. ]
+    }
+    """,
+    # lexikální chyba (21)
+    "class Main : Object { run [| x := +-12. ] }",
+    "class Main : Object { \"neuzavřený komentář run [| ] }",
+    # syntaktická chyba (22)
+    "class Main : Object { run [| x := 1 ] }",
+    "class Main Object { run [| ] }",
+    # klíčové a rezervované slovo (22, kontroly v transformeru)
+    "class Main : Object { run [| class := 1. ] }",
+    "class Main : Object { run [| Main := 1. ] }",
+    "class Main : Object { foo: [:self | ] run [| ] }",
+    # sémantická chyba (32)
+    "class Main : Object { run [| x := y. ] }",
+]
+
+def run_parse_process(SOL25Code, env):
+    return subprocess.run(
+        [sys.executable, os.path.join(parentDirectory, "parse.py")],
+        input=SOL25Code,
+        capture_output=True,
+        text=True,
+        env=env
+        )
+
+@pytest.fixture(scope="module")
+def standalone_parser_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("standalone") / "SOL25StandaloneParser.py")
+    LarkParserModule.build_standalone_parser(path)
+    return path
+
+@pytest.mark.parametrize("SOL25Code", PARITY_PROGRAMS)
+def test_standalone_ok_parity(SOL25Code, standalone_parser_path):
+    standalone = run_parse_process(SOL25Code, dict(os.environ, SOL25_STANDALONE_PATH=standalone_parser_path))
+    dynamic = run_parse_process(SOL25Code, dict(os.environ, SOL25_STANDALONE_PATH=""))
+    assert standalone.returncode == dynamic.returncode
+    assert standalone.stdout == dynamic.stdout
+    assert standalone.stderr == dynamic.stderr
+
+def test_standalone_ok_no_lark_import(standalone_parser_path):
+    process = subprocess.run(
+        [sys.executable, "-c",
+         "import sys\n"
+         "from MyPyModules.LarkParser import LarkParser, StandaloneParser\n"
+         "LarkParser().parse_code('class Main : Object { run [| ] }')\n"
+         "print(StandaloneParser is not None, 'lark' in sys.modules)\n"],
+        cwd=parentDirectory,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, SOL25_STANDALONE_PATH=standalone_parser_path)
+        )
+    assert process.stdout.split() == ["True", "False"]
+
+def test_standalone_ok_stale_module_ignored(tmp_path, standalone_parser_path):
+    stalePath = tmp_path / "SOL25StandaloneParser.py"
+    with open(standalone_parser_path) as f:
+        stalePath.write_text(f.read().replace("SOL25_GRAMMAR_SHA256 = '", "SOL25_GRAMMAR_SHA256 = 'x"))
+    process = subprocess.run(
+        [sys.executable, "-c",
+         "from MyPyModules.LarkParser import StandaloneParser\n"
+         "print(StandaloneParser is None)\n"],
+        cwd=parentDirectory,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, SOL25_STANDALONE_PATH=str(stalePath))
+        )
+    assert process.stdout.strip() == "True"
+
+################################################################################
+#                                                                              #
+#                  PARSOVÁNÍ BEZ PARSE STROMU (INLINE AST) TESTY               #
+#                                                                              #
+################################################################################
+
+def parse_with_mode(SOL25Code, buildParseTree):
+    parser = LarkParser(buildParseTree=buildParseTree)
+    try:
+        ASTRoot = parser.parse_code(SOL25Code)
+    except Exception as e:
+        return (type(e).__name__, e.errorCode, e.errorDetail)
+    return XMLGenerator().generate_XML(ASTRoot, SOL25Code)
+
+@pytest.mark.parametrize("SOL25Code", PARITY_PROGRAMS + [
+    # chyba transformeru (22) před pozdější lexikální chybou (21) => 21
+    "class Main : Object { run [| class := 1. x := +-1. ] }",
+    # chyba transformeru (22) před pozdější syntaktickou chybou => 22 bez detailu
+    "class Main : Object { run [| Main := 1. x := 1 ] }",
+    # více chyb transformeru => hlásí se první z nich
+    "class Main : Object { run [| nil := 1. Main := 2. ] }",
+])
+def test_inline_ok_parity_with_tree(SOL25Code):
+    assert parse_with_mode(SOL25Code, False) == parse_with_mode(SOL25Code, True)
+
+def test_inline_ok_parser_reusable_after_error():
+    parser = LarkParser()
+    with pytest.raises(parse.Error.SyntacticError):
+        parser.parse_code("class Main : Object { run [| class := 1. ] }")
+    ASTRoot = parser.parse_code("class Main : Object { run [| x := 1. ] }")
+    assert ASTRoot.classNodeList[0].methodNodeList[0].selector == "run"
+
+################################################################################
+#                                                                              #
+#                       PROUDOVÝ GENERÁTOR XML TESTY                           #
+#                                                                              #
+################################################################################
+
+def render_with_minidom(ASTRoot, SOL25Code, monkeypatch):
+    """
+    Referenční výstup původní implementace (ElementTree -> minidom bez
+    escapování, hodnoty atributů jsou escapovány předem).
+    """
+
+    def escape(value):
+        return (value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+                     .replace("'", "&apos;").replace('"', "&quot;"))
+
+    def expression(node):
+        exprTag = ET.Element("expr")
+        if isinstance(node, ASTNodes.LiteralNode):
+            exprTag.append(ET.Element("literal", {"class": node.literalType, "value": escape(str(node.literalValue))}))
+        elif isinstance(node, ASTNodes.IdentifierNode):
+            exprTag.append(variable(node))
+        elif isinstance(node, ASTNodes.BlockNode):
+            exprTag.append(block(node))
+        else:
+            sendTag = ET.SubElement(exprTag, "send", {"selector": node.selector})
+            sendTag.append(expression(node.receiver))
+            for order, argument in enumerate(node.argNodeList, 1):
+                ET.SubElement(sendTag, "arg", {"order": str(order)}).append(expression(argument))
+        return exprTag
+
+    def variable(node):
+        if node.identifier[0].isupper():
+            return ET.Element("literal", {"class": "class", "value": node.identifier})
+        return ET.Element("var", {"name": node.identifier})
+
+    def block(node):
+        blockTag = ET.Element("block", {"arity": str(len(node.parameterNodeList))})
+        for order, param in enumerate(node.parameterNodeList, 1):
+            ET.SubElement(blockTag, "parameter", {"order": str(order), "name": param})
+        for order, statement in enumerate(node.statementNodeList, 1):
+            assignTag = ET.SubElement(blockTag, "assign", {"order": str(order)})
+            assignTag.append(variable(statement.identifierNode))
+            assignTag.append(expression(statement.exprNode))
+        return blockTag
+
+    attributes = {"language": "SOL25"}
+    if get_first_comment(SOL25Code):
+        attributes["description"] = escape(get_first_comment(SOL25Code)).replace("\n", "&nbsp;")
+    programTag = ET.Element("program", attributes)
+    for classNode in ASTRoot.classNodeList:
+        classTag = ET.SubElement(programTag, "class", {"name": classNode.identifier,
+                                                       "parent": classNode.perentIdentifier})
+        for methodNode in classNode.methodNodeList:
+            ET.SubElement(classTag, "method", {"selector": methodNode.selector}).append(block(methodNode.blockNode))
+
+    monkeypatch.setattr(minidom, "_write_data", lambda writer, data: writer.write(data))
+    reparsed = minidom.parseString(ET.tostring(programTag, encoding="utf-8"))
+    return reparsed.toprettyxml(indent="  ", encoding="UTF-8").decode("UTF-8")
+
+@pytest.mark.parametrize("SOL25Code", [
+    PARITY_PROGRAMS[0],
+    "class Main : Object { }",
+    "",
+    """
+    "první
+    komentář s <tagy> & 'apostrofy'"
+    class Main : Object {
+        run [| s := 'a\\'b<c>&d"e'. t := 'tab\tx'. ]
+        "druhý komentář"
+    }
+    class A : Main { x [| ] y:z: [:u :v | ] }
+    """,
+])
+def test_xml_ok_byte_identical_to_minidom(SOL25Code, monkeypatch):
+    ASTRoot = LarkParser().parse_code(SOL25Code)
+    expected = render_with_minidom(ASTRoot, SOL25Code, monkeypatch)
+    assert XMLGenerator().generate_XML(ASTRoot, SOL25Code) == expected
+
+def test_xml_ok_write_to_sink():
+    ASTRoot = LarkParser().parse_code(PARITY_PROGRAMS[0])
+    sink = io.StringIO()
+    XMLGenerator().write_XML(ASTRoot, PARITY_PROGRAMS[0], sink)
+    assert sink.getvalue() == XMLGenerator().generate_XML(ASTRoot, PARITY_PROGRAMS[0])
+    assert sink.getvalue().startswith('<?xml version="1.0" encoding="UTF-8"?>\n<program language="SOL25"')
+
+################################################################################
+#                                                                              #
+#                       REENTRANTNÍ GENERÁTOR XML TESTY                        #
+#                                                                              #
+################################################################################
+
+def test_xml_ok_description_escaped():
+    SOL25Code = '"a < b & \'c\' \n> d" class Main : Object { run [| s := \'"<&>\'. ] }'
+    XMLCode = XMLGenerator().generate_XML(LarkParser().parse_code(SOL25Code), SOL25Code)
+    assert 'description="a &lt; b &amp; &apos;c&apos; &nbsp;&gt; d"' in XMLCode
+    assert 'value="&quot;&lt;&amp;&gt;"' in XMLCode
+    programTag = ET.fromstring(XMLCode.replace("&nbsp;", "&#10;").encode("UTF-8"))
+    assert programTag.get("description") == "a < b & 'c' \n> d"
+    assert programTag.find(".//literal").get("value") == '"<&>'
+
+def test_xml_ok_minidom_untouched():
+    originalWriteData = minidom._write_data
+    XMLGenerator().generate_XML(LarkParser().parse_code(PARITY_PROGRAMS[0]), PARITY_PROGRAMS[0])
+    assert minidom._write_data is originalWriteData
+    document = minidom.parseString('<a b="&lt;&amp;"/>')
+    assert document.documentElement.toxml() == '<a b="&lt;&amp;"/>'
+
+def test_xml_ok_concurrent_generators():
+    programs = [PARITY_PROGRAMS[0],
+                "class Main : Object { }",
+                '"<&>" class Main : Object { run [| s := \'&\'. b := [:x | y := x. ]. ] }']
+    ASTRoots = [LarkParser().parse_code(SOL25Code) for SOL25Code in programs]
+    expected = [XMLGenerator().generate_XML(ASTRoot, SOL25Code)
+                for ASTRoot, SOL25Code in zip(ASTRoots, programs)]
+    barrier = threading.Barrier(8)
+    mismatches = []
+
+    def worker(offset):
+        generator = XMLGenerator()
+        barrier.wait()
+        for i in range(200):
+            index = (offset + i) % len(programs)
+            # Souběžně používáme i minidom, jehož chování nesmí generátor ovlivnit.
+            if minidom.parseString('<a b="&amp;"/>').documentElement.toxml() != '<a b="&amp;"/>':
+                mismatches.append("minidom")
+            if generator.generate_XML(ASTRoots[index], programs[index]) != expected[index]:
+                mismatches.append(index)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert mismatches == []
+
+################################################################################
+#                                                                              #
+#                            DÁVKOVÝ REŽIM TESTY                               #
+#                                                                              #
+################################################################################
+
+BATCH_PROGRAMS = {
+    "ok.sol25": PARITY_PROGRAMS[0],
+    "syntax.sol25": "class Main : Object { run [| x := 1 ] }",
+    "empty.src": "",
+    "sub/semantic.sol25": "class Main : Object { run [| x := y. ] }",
+    "ignored.txt": "neanalyzuje se",
+}
+
+def run_batch(args):
+    process = subprocess.run(
+        ["python3.11", "../parse.py", "--batch"] + args,
+        capture_output=True,
+        text=True
+        )
+    manifest = [json.loads(line) for line in process.stdout.splitlines()]
+    return process, manifest
+
+def write_batch_programs(directory):
+    for name, SOL25Code in BATCH_PROGRAMS.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SOL25Code, encoding="utf-8")
+
+def test_batch_ok_manifest(tmp_path):
+    write_batch_programs(tmp_path)
+    process, manifest = run_batch([str(tmp_path)])
+    assert [(os.path.relpath(record["path"], tmp_path), record["exitCode"]) for record in manifest] == [
+        ("empty.src", 11), ("ok.sol25", 0), ("syntax.sol25", 22), (os.path.join("sub", "semantic.sol25"), 32)]
+    assert process.returncode == 11
+    assert "files/s" in process.stderr
+    single = subprocess.run(["python3.11", "../parse.py"], input=PARITY_PROGRAMS[0],
+                            capture_output=True, text=True)
+    assert manifest[1]["xml"] == single.stdout
+    assert manifest[3]["message"] == parse.Error.SemanticUndefinedSymbolError.errorMessage
+    assert manifest[3]["detail"]
+
+def test_batch_ok_output_directory(tmp_path):
+    write_batch_programs(tmp_path / "src")
+    process, manifest = run_batch([str(tmp_path / "src" / "sub"), str(tmp_path / "src" / "ok.sol25"),
+                                   "--output-dir", str(tmp_path / "out")])
+    assert process.returncode == 32
+    assert [record["exitCode"] for record in manifest] == [32, 0]
+    assert "xml" not in manifest[1]
+    assert manifest[1]["output"] == str(tmp_path / "out" / "ok.xml")
+    assert sorted(os.listdir(tmp_path / "out")) == ["ok.xml"]
+
+def test_batch_ok_all_successful(tmp_path):
+    for i in range(3):
+        (tmp_path / f"{i}.sol25").write_text(PARITY_PROGRAMS[0], encoding="utf-8")
+    process, manifest = run_batch([str(tmp_path)])
+    assert process.returncode == 0
+    assert len(manifest) == 3 and len({record["xml"] for record in manifest}) == 1
+
+def test_batch_ok_crlf_line_endings(tmp_path):
+    SOL25Code = '"a\r\nb"\r\nclass Main : Object {\r\n    run [| x := \'c\r\nd\'. ]\r\n}\r\n'
+    path = tmp_path / "crlf.sol25"
+    path.write_bytes(SOL25Code.encode("utf-8"))
+    sink = io.StringIO()
+    parse.Facade(parse.read_source_file(str(path))).run_analysis(sink)
+    result = BatchAnalyser().analyse_file(str(path))
+    assert result.exitCode == 0
+    assert 'description="a\r&nbsp;b"' in sink.getvalue()
+    assert result.XMLCode == sink.getvalue()
+
+def test_batch_bad_missing_path(tmp_path):
+    process, manifest = run_batch([str(tmp_path / "neexistuje")])
+    assert process.returncode == 11 and manifest == []
+
+def test_batch_bad_output_name_collision(tmp_path):
+    for name in ("a/x.sol25", "b/x.sol25", "c/foo.sol25", "c/foo.src"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(PARITY_PROGRAMS[0], encoding="utf-8")
+    output = str(tmp_path / "out")
+    for paths in ([str(tmp_path / "a" / "x.sol25"), str(tmp_path / "b" / "x.sol25")],
+                  [str(tmp_path / "a"), str(tmp_path / "b")],
+                  [str(tmp_path / "c")]):
+        process, manifest = run_batch(paths + ["--output-dir", output])
+        assert process.returncode == 10 and manifest == []
+        assert not os.path.exists(output)
+    # bez výstupního adresáře ke kolizi nedojde, tentýž soubor lze zadat vícekrát
+    assert run_batch([str(tmp_path / "a"), str(tmp_path / "b")])[0].returncode == 0
+    sameFile = str(tmp_path / "a" / "x.sol25")
+    assert run_batch([sameFile, sameFile, "--output-dir", output])[0].returncode == 0
+
+def test_batch_bad_parameters():
+    run_arg_test(['--batch'], 10)
+    run_arg_test(['--output-dir', 'xml'], 10)
+    run_arg_test(['--help', '--batch', '.'], 10)
+
+################################################################################
+#                                                                              #
+#                      PARALELNÍ DÁVKOVÝ REŽIM TESTY                           #
+#                                                                              #
+################################################################################
+
+def test_parallel_ok_split_into_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(Batch, "MIN_CHUNK_BYTES", 1)
+    paths = []
+    for i, size in enumerate([10, 10, 10, 10, 1000, 10, 10, 10]):
+        path = tmp_path / f"{i}.sol25"
+        path.write_text("x" * size)
+        paths.append(str(path))
+    paths.append(str(tmp_path / "neexistuje.sol25"))
+    chunks = Batch.split_into_chunks(paths, 2)
+    assert [path for chunk in chunks for path in chunk] == paths
+    assert chunks == [paths[:4], [paths[4]], paths[5:]]
+
+def test_parallel_ok_same_manifest_as_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(Batch, "MIN_CHUNK_BYTES", 1)
+    for i in range(4):
+        write_batch_programs(tmp_path / str(i))
+    serialManifest = io.StringIO()
+    serialExitCode = Batch.BatchAnalyser().run([str(tmp_path)], manifest=serialManifest)
+    parallelManifest = io.StringIO()
+    parallelExitCode = Batch.ParallelBatchAnalyser(3).run([str(tmp_path)], manifest=parallelManifest)
+    assert parallelExitCode == serialExitCode == 11
+    assert parallelManifest.getvalue() == serialManifest.getvalue()
+    assert len(parallelManifest.getvalue().splitlines()) == 16
+
+def test_parallel_ok_command_line(tmp_path):
+    write_batch_programs(tmp_path)
+    process, manifest = run_batch([str(tmp_path), "--jobs", "2"])
+    serialProcess, serialManifest = run_batch([str(tmp_path)])
+    assert process.returncode == serialProcess.returncode == 11
+    assert manifest == serialManifest
+
+def test_parallel_bad_parameters():
+    run_arg_test(['--jobs', '2'], 10)
+    run_arg_test(['--batch', '.', '--jobs', '-1'], 10)
+    run_arg_test(['--batch', '.', '--jobs', 'x'], 10)
+
+################################################################################
+#                                                                              #
+#                           SERVEROVÝ REŽIM TESTY                              #
+#                                                                              #
+################################################################################
+
+@pytest.fixture
+def parse_server(tmp_path):
+    server = ParseServer(str(tmp_path / "parse.sock"), maxRequestSize=4096)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server, str(tmp_path / "parse.sock")
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+def expected_response(SOL25Code):
+    try:
+        return 0, BatchAnalyser().analyse_code(SOL25Code)
+    except parse.Error.CustomError as e:
+        return e.errorCode, f"{e}\n"
+
+def test_server_ok_responses_match_parse(parse_server):
+    server, socketPath = parse_server
+    for SOL25Code in PARITY_PROGRAMS + [""]:
+        assert send_request(socketPath, PARSE_COMMAND, SOL25Code.encode("utf-8")) == expected_response(SOL25Code)
+
+def test_server_ok_concurrent_requests(parse_server):
+    server, socketPath = parse_server
+    programs = PARITY_PROGRAMS * 8
+    expected = [expected_response(SOL25Code) for SOL25Code in programs]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(
+            lambda SOL25Code: send_request(socketPath, PARSE_COMMAND, SOL25Code.encode("utf-8")), programs))
+    assert responses == expected
+    exitCode, output = send_request(socketPath, STATS_COMMAND)
+    histogram = json.loads(output)
+    assert exitCode == 0
+    assert histogram["requests"] == len(programs)
+    assert sum(bucket["count"] for bucket in histogram["buckets"]) == len(programs)
+    assert histogram["buckets"][-1]["le"] is None
+
+def test_server_bad_request_too_large(parse_server):
+    server, socketPath = parse_server
+    exitCode, output = send_request(socketPath, PARSE_COMMAND, b" " * 5000)
+    assert exitCode == parse.Error.InputFileError.errorCode
+    assert "4096 bytes" in output
+    assert send_request(socketPath, PARSE_COMMAND, PARITY_PROGRAMS[0].encode("utf-8"))[0] == 0
+
+def test_server_bad_request_larger_than_socket_buffer(parse_server):
+    server, socketPath = parse_server
+    exitCode, output = send_request(socketPath, PARSE_COMMAND, b" " * (4 * 1024 * 1024))
+    assert exitCode == parse.Error.InputFileError.errorCode
+    assert "4096 bytes" in output
+
+def test_server_bad_unknown_command_and_encoding(parse_server):
+    server, socketPath = parse_server
+    assert send_request(socketPath, b"HELLO")[0] == parse.Error.ScriptParameterError.errorCode
+    assert send_request(socketPath, PARSE_COMMAND, b"\xff\xfe")[0] == parse.Error.InputFileError.errorCode
+
+def test_server_ok_command_line(tmp_path):
+    socketPath = str(tmp_path / "parse.sock")
+    process = subprocess.Popen(["python3.11", "../parse.py", "--serve", socketPath])
+    try:
+        for _ in range(100):
+            if os.path.exists(socketPath):
+                break
+            time.sleep(0.05)
+        assert send_request(socketPath, PARSE_COMMAND, PARITY_PROGRAMS[0].encode("utf-8")) == \
+            expected_response(PARITY_PROGRAMS[0])
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+    assert not os.path.exists(socketPath)
+
+def test_server_bad_parameters():
+    run_arg_test(['--serve', 'a.sock', '--batch', '.'], 10)
+    run_arg_test(['--serve=a.sock', '--input', 'a.sol25'], 10)
+    run_arg_test(['--serve=a.sock', '--cache', 'cache'], 10)
+    run_arg_test(['--serve'], 10)
+
+################################################################################
+#                                                                              #
+#                      SDÍLENÉ VESTAVĚNÉ SYMBOLY TESTY                         #
+#                                                                              #
+################################################################################
+
+def snapshot_builtin_classes():
+    return {identifier: (classSymbol.parentIdentifier, classSymbol.isDefined,
+                         {selector: (methodSymbol.paramCount, methodSymbol.block)
+                          for selector, methodSymbol in classSymbol.methods.items()})
+            for identifier, classSymbol in BUILTIN_CLASS_TABLE.items()}
+
+def test_builtins_ok_shared_by_reference():
+    first, second = Symtable().classManager, Symtable().classManager
+    first.load_builtin_symbols()
+    second.load_builtin_symbols()
+    for identifier, classSymbol in BUILTIN_CLASS_TABLE.items():
+        assert first.classes[identifier] is classSymbol
+        assert second.classes[identifier] is classSymbol
+    first.insert_class_symbol("Foo", "Object", True)
+    assert "Foo" in first.classes and "Foo" not in second.classes
+    assert "Foo" not in BUILTIN_CLASS_TABLE
+
+def test_builtins_bad_direct_mutation():
+    integerClass = BUILTIN_CLASS_TABLE["Integer"]
+    before = snapshot_builtin_classes()
+    with pytest.raises(TypeError):
+        BUILTIN_CLASS_TABLE["Foo"] = integerClass
+    with pytest.raises(TypeError):
+        integerClass.methods["foo"] = Symbols.MethodSymbol("foo")
+    with pytest.raises(parse.Error.InternalError):
+        integerClass.parentIdentifier = "Foo"
+    with pytest.raises(parse.Error.InternalError):
+        integerClass.isDefined = False
+    with pytest.raises(parse.Error.InternalError):
+        integerClass.methods["plus:"].paramCount = 5
+    with pytest.raises(parse.Error.InternalError):
+        integerClass.add_method("foo", Symbols.MethodSymbol("foo", isBuiltIn=True))
+    assert snapshot_builtin_classes() == before
+
+@pytest.mark.parametrize("SOL25Code", [
+    "class Main : Object { run [| ] } class Integer : Object { foo [| ] }",
+    "class Main : Object { run [| ] } class Object : Main { }",
+    "class Main : Object { run [| ] } class String : Object { }",
+    "class Main : Integer { run [| ] plus: [:x | ] asString [| ] }",
+    "class Main : Object { run [| x := Integer foo. y := String new: 1. ] }",
+    "class Main : Object { run [| ] } class A : True { not [| ] and: [:x | ] }",
+] + PARITY_PROGRAMS)
+def test_builtins_ok_user_code_cannot_mutate(SOL25Code):
+    before = snapshot_builtin_classes()
+    try:
+        BatchAnalyser().analyse_code(SOL25Code)
+    except parse.Error.CustomError as e:
+        assert not isinstance(e, parse.Error.InternalError)
+    assert snapshot_builtin_classes() == before
+
+################################################################################
+#                                                                              #
+#                   MEZIPAMĚŤ VYHLEDÁVÁNÍ METOD TESTY                          #
+#                                                                              #
+################################################################################
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = 0
+
+    def get(self, *args):
+        self.lookups += 1
+        return super().get(*args)
+
+def create_class_chain(depth):
+    manager = Symtable().classManager
+    manager.load_builtin_symbols()
+    manager.insert_class_symbol("C0", "Object", True)
+    manager.insert_method_symbol("C0", "foo", None)
+    for i in range(1, depth):
+        manager.insert_class_symbol(f"C{i}", f"C{i - 1}", True)
+    return manager
+
+def test_method_cache_ok_deep_chain_constant_after_warm_up():
+    manager = create_class_chain(1000)
+    assert manager.get_method_symbol("C999", "foo").selector == "foo"
+    assert manager.get_method_symbol("C999", "bar") is None
+    manager.classes = CountingDict(manager.classes)
+    for i in range(1000):
+        assert manager.get_method_symbol(f"C{i}", "foo").selector == "foo"
+        assert manager.get_method_symbol(f"C{i}", "bar") is None
+    assert manager.classes.lookups == 0
+
+def test_method_cache_ok_invalidated_by_insert_method():
+    manager = create_class_chain(3)
+    assert manager.get_method_symbol("C2", "foo") is manager.classes["C0"].methods["foo"]
+    assert manager.get_method_symbol("C2", "bar") is None
+    manager.insert_method_symbol("C1", "foo", None)
+    manager.insert_method_symbol("C0", "bar", None)
+    assert manager.get_method_symbol("C2", "foo") is manager.classes["C1"].methods["foo"]
+    assert manager.get_method_symbol("C0", "foo") is manager.classes["C0"].methods["foo"]
+    assert manager.get_method_symbol("C2", "bar") is manager.classes["C0"].methods["bar"]
+
+def test_method_cache_ok_invalidated_by_class_changes():
+    manager = create_class_chain(1)
+    assert manager.get_method_symbol("D", "foo") is None
+    manager.insert_class_symbol("D", None, False)
+    assert manager.get_method_symbol("D", "foo") is None
+    manager.set_class_as_defined(ASTNodes.ClassNode("D", "C0", []))
+    assert manager.get_method_symbol("D", "foo") is manager.classes["C0"].methods["foo"]
+
+def test_method_cache_ok_cycle_terminates():
+    manager = create_class_chain(1)
+    manager.insert_class_symbol("A", "B", True)
+    manager.insert_class_symbol("B", "A", True)
+    assert manager.get_method_symbol("A", "foo") is None
+    assert manager.get_method_symbol("B", "foo") is None
+    assert manager.get_method_symbol("A", "asString") is None
+
+def test_method_cache_ok_deep_chain_program(monkeypatch):
+    classes = [f"class C{i} : C{i - 1} {{ }}" for i in range(1, 1000)]
+    SOL25Code = ("class Main : C999 { run [| x := self foo. y := self foo: 1. ] foo: [:a | ] }\n"
+                 "class C0 : Object { foo [| ] }\n" + "\n".join(classes))
+    assert run_parse(SOL25Code, monkeypatch) == 0
+
+################################################################################
+#                                                                              #
+#                      DETEKCE CYKLICKÉ DĚDIČNOSTI TESTY                       #
+#                                                                              #
+################################################################################
+
+def create_inheritance_analyser(parents):
+    analyser = SemanticAnalyser()
+    manager = analyser._symtable.classManager
+    manager.load_builtin_symbols()
+    for identifier, parentIdentifier in parents:
+        manager.insert_class_symbol(identifier, parentIdentifier, True)
+    return analyser
+
+def test_cyclic_bad_reports_all_cycles():
+    SOL25Code = """
+        class Main : Object { run [| ] }
+        class A : B {}
+        class B : C {}
+        class C : A {}
+        class D : D {}
+        class E : A {}
+        class F : Main {}
+    """
+    with pytest.raises(parse.Error.SemanticOtherError) as exceptionInfo:
+        BatchAnalyser().analyse_code(SOL25Code)
+    assert exceptionInfo.value.errorDetail == (
+        "Cyclic inheritance detected: 'A' -> 'B' -> 'C' -> 'A'; 'D' -> 'D'.")
+
+def test_cyclic_ok_long_chain():
+    parents = [("C0", "Object")] + [(f"C{i}", f"C{i - 1}") for i in range(1, 10000)]
+    create_inheritance_analyser(parents).check_cyclic_inheritance()
+
+def test_cyclic_bad_long_ring_and_tail():
+    parents = [(f"C{i}", f"C{(i + 1) % 10000}") for i in range(10000)]
+    parents += [("T0", "C5000"), ("T1", "T0")]
+    with pytest.raises(parse.Error.SemanticOtherError) as exceptionInfo:
+        create_inheritance_analyser(parents).check_cyclic_inheritance()
+    detail = exceptionInfo.value.errorDetail
+    assert detail.count(" -> ") == 10000
+    assert detail.startswith("Cyclic inheritance detected: 'C0' -> 'C1' -> ")
+    assert "'T0'" not in detail and "'T1'" not in detail
+
+################################################################################
+#                                                                              #
+#                        INKREMENTÁLNÍ ANALÝZA TESTY                           #
+#                                                                              #
+################################################################################
+
+INCREMENTAL_CLASS_NAMES = ["Main", "A", "B", "C", "D", "E", "F"]
+INCREMENTAL_SELECTORS = [("run", 0), ("foo", 0), ("bar", 0), ("foo:", 1), ("foo:bar:", 2), ("value", 0)]
+INCREMENTAL_STATEMENTS = [
+    "x := {cls} new.",
+    "x := 'text'.",
+    "x := nil.",
+    "x := self {sel}.",
+    "x := {cls} {sel}.",
+    "x := {cls} foo: 1.",
+    "x := {cls} foo: 1 bar: 'a{{b}}c'.",
+    "x := self foo: 1.",
+    "x := self foo: 1 bar: 2.",
+    "x := super {sel}.",
+    "x := [:a | b := a. ] value: {cls}.",
+    "x := (1 plus: 2) foo: nil.",
+    "x := \"{{\" true.",
+    "x := y plus: 1.",
+]
+
+def render_class(identifier, parentIdentifier, methods):
+    body = "\n".join(
+        f"  {selector} [{''.join(f':p{i} ' for i in range(arity))}| {' '.join(statements)} ]"
+        for selector, arity, statements in methods)
+    return f"class {identifier} : {parentIdentifier} {{\n{body}\n}}"
+
+def random_statement(rng, statements):
+    # Pozn. 'Main' a 'run' jsou v těle metod rezervovaná slova.
+    return rng.choice(statements).format(
+        cls=rng.choice(INCREMENTAL_CLASS_NAMES[1:] + ["Object", "String"]),
+        sel=rng.choice(["foo", "bar", "value"]))
+
+def random_methods(rng, statements):
+    return [(selector, arity, [random_statement(rng, statements) for _ in range(rng.randint(0, 1))])
+            for selector, arity in rng.sample(INCREMENTAL_SELECTORS[1:], rng.randint(0, 3))]
+
+def edit_program(rng, classes, statements):
+    """
+    Provede jednu náhodnou úpravu programu (seznamu tříd [název, rodič, metody]).
+    """
+    identifiers = [identifier for identifier, _, _ in classes]
+    unusedIdentifiers = [identifier for identifier in INCREMENTAL_CLASS_NAMES if identifier not in identifiers]
+    index = rng.randrange(len(classes))
+    edit = rng.randrange(10)
+    if edit == 0 and unusedIdentifiers:
+        # Nová třída
+        classes.insert(rng.randint(0, len(classes)),
+                       [rng.choice(unusedIdentifiers), rng.choice(identifiers + ["Object"]), random_methods(rng, statements)])
+    elif edit in (1, 2):
+        # Změna těla metody
+        methods = classes[index][2]
+        if methods:
+            selector, arity, body = methods[rng.randrange(len(methods))]
+            if body and rng.random() < 0.5:
+                del body[rng.randrange(len(body))]
+            else:
+                body.insert(rng.randint(0, len(body)), random_statement(rng, statements))
+    elif edit == 3:
+        # Změna pořadí tříd
+        classes.insert(rng.randint(0, len(classes) - 1), classes.pop(index))
+    elif edit == 4:
+        # Přejmenování třídy (občas na již použitý název)
+        if unusedIdentifiers and rng.random() < 0.8:
+            classes[index][0] = rng.choice(unusedIdentifiers)
+        else:
+            classes[index][0] = rng.choice(INCREMENTAL_CLASS_NAMES)
+    elif edit == 5 and len(classes) > 1:
+        # Smazání třídy
+        del classes[index]
+    elif edit == 6 and rng.random() < 0.3:
+        # Duplikace třídy
+        identifier, parentIdentifier, methods = classes[index]
+        classes.insert(index + 1, [identifier, parentIdentifier,
+                                   [(selector, arity, list(body)) for selector, arity, body in methods]])
+    elif edit == 7:
+        # Změna rodičovské třídy (může vzniknout cyklus nebo nedefinovaná třída)
+        classes[index][1] = rng.choice(identifiers + ["Object", "Object", "Integer", "G"])
+    elif edit == 8:
+        # Změna arity metody
+        methods = classes[index][2]
+        if methods:
+            position = rng.randrange(len(methods))
+            selector, arity, body = methods[position]
+            methods[position] = (selector, max(0, arity + rng.choice((-1, 1))), body)
+    elif edit == 9:
+        # Oprava: odstranění duplicitních tříd a dědění přímo z 'Object'
+        seen = set()
+        classes[:] = [definition for definition in classes
+                      if definition[0] not in seen and not seen.add(definition[0])]
+        classes[rng.randrange(len(classes))][1] = "Object"
+        if "Main" not in seen:
+            classes.append(["Main", "Object", [("run", 0, [])]])
+
+def full_analysis_result(SOL25Code):
+    try:
+        return BatchAnalyser().analyse_code(SOL25Code)
+    except Exception as e:
+        return type(e), getattr(e, "errorCode", None), getattr(e, "errorDetail", str(e))
+
+def incremental_analysis_result(analyser, SOL25Code):
+    try:
+        return analyser.analyse_code(SOL25Code)
+    except Exception as e:
+        return type(e), getattr(e, "errorCode", None), getattr(e, "errorDetail", str(e))
+
+def test_incremental_ok_split_class_regions():
+    SOL25Code = ' "a { comment" class A : Object { x [| y := \'}\\\'\'. ] }\n"}"class B : A {}  '
+    assert split_class_regions(SOL25Code) == [
+        "class A : Object { x [| y := '}\\''. ] }", "class B : A {}"]
+    assert split_class_regions("") == []
+    assert split_class_regions("class A : Object { \"x") is None
+    assert split_class_regions("class A : Object { x [| y := 'a ] }") is None
+    assert split_class_regions("class A : Object { } }") is None
+    assert split_class_regions("class A : Object { } class B") is None
+
+def test_incremental_ok_reparses_and_rechecks_only_changed_class():
+    classes = [render_class("Main", "Object", [("run", 0, ["x := A new.", "y := x foo."])])]
+    classes += [render_class(f"C{i}", "Object", [("foo", 0, ["x := 1."])]) for i in range(20)]
+    classes.append(render_class("A", "Object", [("foo", 0, [])]))
+    analyser = IncrementalAnalyser()
+    SOL25Code = "\n".join(classes)
+    assert analyser.analyse_code(SOL25Code) == full_analysis_result(SOL25Code)
+    assert (analyser.parsedClassCount, analyser.checkedClassCount) == (22, 22)
+
+    classes[5] = classes[5].replace("x := 1.", "x := 2.")
+    SOL25Code = "\n".join(classes)
+    assert analyser.analyse_code(SOL25Code) == full_analysis_result(SOL25Code)
+    assert (analyser.parsedClassCount, analyser.checkedClassCount) == (1, 1)
+
+    # Změna arity metody třídy A ovlivní jen třídy definované za A, které na ni závisí.
+    classes[-1] = render_class("A", "Object", [("foo:", 1, [])])
+    classes.append(render_class("D", "A", [("foo:", 1, [])]))
+    SOL25Code = "\n".join(classes)
+    assert analyser.analyse_code(SOL25Code) == full_analysis_result(SOL25Code)
+    assert (analyser.parsedClassCount, analyser.checkedClassCount) == (2, 2)
+
+def test_incremental_bad_errors_match_full_analysis():
+    analyser = IncrementalAnalyser()
+    for SOL25Code in ["class Main : Object { run [| ] }",
+                      "class Main : Object { run [| ] } class A : Object { foo [| x := . ] }",
+                      "class Main : Object { run [| ] } class A : Object { foo [| x := # ] }",
+                      "class Main : Object { run [| ] } class A : Object { foo [| x := y. ] }",
+                      "class Main : Object { run [| ] } class A : Object {",
+                      "",
+                      "class Main : Object { run [| ] } class A : Object { foo [| ] }"]:
+        assert incremental_analysis_result(analyser, SOL25Code) == full_analysis_result(SOL25Code)
+
+@pytest.mark.parametrize("statements", [INCREMENTAL_STATEMENTS, INCREMENTAL_STATEMENTS[:4]])
+def test_incremental_ok_differential_fuzz(statements):
+    rng = random.Random(25)
+    analyser = IncrementalAnalyser()
+    classes = [["Main", "Object", [("run", 0, [])]]]
+    classes += [[identifier, "Object", random_methods(rng, statements)] for identifier in INCREMENTAL_CLASS_NAMES[1:5]]
+    history = []
+    for _ in range(300):
+        edit_program(rng, classes, statements)
+        SOL25Code = "\"fuzz\"\n" + "\n".join(render_class(*definition) for definition in classes)
+        if rng.random() < 0.1:
+            position = rng.randint(0, len(SOL25Code))
+            SOL25Code = SOL25Code[:position] + rng.choice(["}", "{", "'", "\"", "#", "class", "]"]) + SOL25Code[position:]
+        elif history and rng.random() < 0.1:
+            SOL25Code = rng.choice(history)
+        history.append(SOL25Code)
+        assert incremental_analysis_result(analyser, SOL25Code) == full_analysis_result(SOL25Code), SOL25Code
+
+def test_incremental_ok_server_update(parse_server):
+    server, socketPath = parse_server
+    for SOL25Code in PARITY_PROGRAMS + [""]:
+        for documentName in (b"first.sol25", b"second.sol25"):
+            response = send_request(socketPath, UPDATE_COMMAND, documentName + b"\n" + SOL25Code.encode("utf-8"))
+            assert response == expected_response(SOL25Code)
+    assert server.histogram.snapshot()["requests"] == 0
+
+################################################################################
+#                                                                              #
+#                        MEZIPAMĚŤ VÝSLEDKŮ TESTY                              #
+#                                                                              #
+################################################################################
+
+CACHE_PROGRAMS = PARITY_PROGRAMS[:3] + [
+    "class Main : Object { run [| x := 1 ] }",
+    "class Main : Object { run [| x := y. ] }",
+    "class Main : Object { run [| x := # ] }",
+    "class Main : Object { run [| ] } class Main : Object { }",
+    "\"popis\" class Main : Object { run [| x := 'řetězec \\' <&>'. ] }",
+]
+
+def run_process(SOL25Code, args=(), importTime=False):
+    command = ["python3.11"] + (["-X", "importtime"] if importTime else []) + ["../parse.py", *args]
+    return subprocess.run(command, input=SOL25Code, capture_output=True, text=True)
+
+def imported_modules(stderr):
+    return {line.split("|")[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+
+@pytest.mark.parametrize("SOL25Code", CACHE_PROGRAMS)
+def test_cache_ok_hit_matches_analysis(tmp_path, SOL25Code):
+    expected = run_process(SOL25Code)
+    for _ in range(2):
+        process = run_process(SOL25Code, ["--cache", str(tmp_path)])
+        assert (process.returncode, process.stdout, process.stderr) == \
+            (expected.returncode, expected.stdout, expected.stderr)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+@pytest.mark.parametrize("SOL25Code", [CACHE_PROGRAMS[0], CACHE_PROGRAMS[4]])
+def test_cache_ok_hit_does_not_import_lark(tmp_path, SOL25Code):
+    miss = run_process(SOL25Code, ["--cache", str(tmp_path)], importTime=True)
+    assert "lark" in imported_modules(miss.stderr)
+    hit = run_process(SOL25Code, ["--cache", str(tmp_path)], importTime=True)
+    modules = imported_modules(hit.stderr)
+    assert hit.returncode == miss.returncode
+    assert not any(module.split(".")[0] == "lark" for module in modules)
+    assert "MyPyModules.LarkParser" not in modules
+
+def test_cache_ok_key_includes_fingerprint(monkeypatch, tmp_path):
+    cache = ResultCacheModule.ResultCache(str(tmp_path))
+    key = cache.get_key(CACHE_PROGRAMS[0])
+    assert key == cache.get_key(CACHE_PROGRAMS[0]) != cache.get_key(CACHE_PROGRAMS[1])
+    monkeypatch.setattr(ResultCacheModule, "_analyserFingerprint", b"jina verze")
+    assert cache.get_key(CACHE_PROGRAMS[0]) != key
+
+def test_cache_ok_stores_errors_from_source_only(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.store_error("a", parse.Error.SemanticArityError("detail"))
+    cache.store_error("b", parse.Error.SyntacticError())
+    cache.store_error("c", parse.Error.InternalError("x"))
+    cache.store_error("d", RecursionError())
+    with pytest.raises(parse.Error.SemanticArityError) as exceptionInfo:
+        cache.lookup("a")
+    assert exceptionInfo.value.errorDetail == "detail"
+    with pytest.raises(parse.Error.SyntacticError) as exceptionInfo:
+        cache.lookup("b")
+    assert exceptionInfo.value.errorDetail is None
+    assert cache.lookup("c") is None and cache.lookup("d") is None
+
+def test_cache_ok_corrupted_entry_is_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for key, content in (("a", "{nejde o JSON"), ("b", "[]"), ("c", '{"exitCode": 99, "detail": "x"}'),
+                         ("d", '{"exitCode": 0}'), ("e", '{"exitCode": [21]}')):
+        (tmp_path / f"{key}.json").write_text(content)
+        assert cache.lookup(key) is None
+    assert cache.lookup("neexistuje") is None
+
+def test_cache_ok_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path), maxSize=10000)
+    for i in range(8):
+        cache.store_result(f"key{i}", "x" * 1000)
+        os.utime(tmp_path / f"key{i}.json", ns=(i * 10**9, i * 10**9))
+    assert cache.lookup("key0") == "x" * 1000  # key0 se stane naposledy použitým
+    cache.store_result("key8", "x" * 1000)
+    cache.store_result("key9", "x" * 1000)
+    cache.store_result("key10", "x" * 1000)
+    remaining = sorted(path.stem for path in tmp_path.glob("*.json"))
+    assert "key0" in remaining and "key10" in remaining
+    assert "key1" not in remaining and "key2" not in remaining
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 10000
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_cache_ok_concurrent_writers_and_readers(tmp_path):
+    outputs = {"x" * size for size in (10, 10000, 100000)}
+    errors = []
+
+    def writer(size):
+        cache = ResultCache(str(tmp_path))
+        for _ in range(50):
+            cache.store_result("shared", "x" * size)
+
+    def reader():
+        cache = ResultCache(str(tmp_path))
+        for _ in range(200):
+            XMLCode = cache.lookup("shared")
+            if XMLCode is not None and XMLCode not in outputs:
+                errors.append(len(XMLCode))
+
+    threads = [threading.Thread(target=writer, args=(size,)) for size in (10, 10000, 100000)]
+    threads += [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert [path.name for path in tmp_path.iterdir()] == ["shared.json"]
+
+def test_cache_ok_batch(tmp_path):
+    write_batch_programs(tmp_path / "src")
+    cacheDirectory = str(tmp_path / "cache")
+    first, firstManifest = run_batch([str(tmp_path / "src"), "--cache", cacheDirectory])
+    second, secondManifest = run_batch([str(tmp_path / "src"), "--cache", cacheDirectory, "--jobs", "2"])
+    assert firstManifest == secondManifest
+    assert first.returncode == second.returncode == 11
+    assert len(os.listdir(cacheDirectory)) == 3  # prázdný soubor se neukládá
+
+def test_cache_bad_parameters(tmp_path):
+    run_arg_test(["--cache-size", "100"], 10)
+    run_arg_test(["--cache", str(tmp_path), "--cache-size", "0"], 10)
+    run_arg_test(["--cache", str(tmp_path), "--serve", "a.sock"], 10)
+    run_arg_test(["--help", "--cache", str(tmp_path)], 10)
+
+################################################################################
+#                                                                              #
+#                             ČAS IMPORTU TESTY                                #
+#                                                                              #
+################################################################################
+
+# Horní mez času importu modulů skriptu (bez inicializace interpretu) v µs;
+# s knihovnou 'lark' a celým analyzátorem se import pohybuje kolem 100 ms.
+HELP_IMPORT_LIMIT = 60000
+EMPTY_INPUT_IMPORT_LIMIT = 40000
+
+# Moduly, které se smí načíst až při samotné analýze (resp. zpracování argumentů)
+ANALYSER_MODULES = {"lark", "MyPyModules.LarkParser", "MyPyModules.SemanticAnalyser",
+                    "MyPyModules.XMLGenerator", "MyPyModules.Symtable", "MyPyModules.ResultCache",
+                    "MyPyModules.SOL25Lexer", "MyPyModules.LiteralSpans",
+                    "xml.dom.minidom", "hashlib", "json", "tempfile", "pickle"}
+
+def import_profile(args, repeat=3):
+    """
+    Spustí 'parse.py' s '-X importtime' (prázdný STDIN) a vrátí návratový kód,
+    množinu modulů importovaných po inicializaci interpretu (modul 'site')
+    a nejmenší celkový čas jejich importu v µs z `repeat` běhů.
+    """
+    times = []
+    for _ in range(repeat):
+        process = subprocess.run(["python3.11", "-X", "importtime", "../parse.py", *args],
+                                 input="", capture_output=True, text=True)
+        records = []
+        for line in process.stderr.splitlines():
+            if line.startswith("import time:") and "self [us]" not in line:
+                selfTime, _, name = line[len("import time:"):].split("|")
+                records.append((name.strip(), int(selfTime)))
+        names = [name for name, _ in records]
+        records = records[names.index("site") + 1:]
+        times.append(sum(selfTime for _, selfTime in records))
+    return process.returncode, {name for name, _ in records}, min(times)
+
+def test_import_time_ok_help():
+    exitCode, modules, importTime = import_profile(["--help"])
+    assert exitCode == 0
+    assert "argparse" in modules
+    assert not {module.split(".")[0] for module in modules} & {"lark", "xml"}
+    assert not modules & ANALYSER_MODULES
+    assert importTime < HELP_IMPORT_LIMIT
+
+def test_import_time_bad_empty_input():
+    exitCode, modules, importTime = import_profile([])
+    assert exitCode == 11
+    assert not {module.split(".")[0] for module in modules} & {"lark", "xml", "argparse"}
+    assert not modules & ANALYSER_MODULES
+    assert importTime < EMPTY_INPUT_IMPORT_LIMIT
+
+def test_import_time_ok_analysis_imports_analyser():
+    process = subprocess.run(["python3.11", "-X", "importtime", "../parse.py"],
+                             input=PARITY_PROGRAMS[0], capture_output=True, text=True)
+    assert process.returncode == 0
+    modules = imported_modules(process.stderr)
+    assert {"lark", "MyPyModules.LarkParser", "MyPyModules.XMLGenerator"} <= modules
+    assert "argparse" not in modules and "MyPyModules.ResultCache" not in modules
+
+################################################################################
+#                                                                              #
+#                           VSTUPNÍ SOUBOR TESTY                               #
+#                                                                              #
+################################################################################
+
+INPUT_PROGRAMS = CACHE_PROGRAMS + [
+    "\"první\r\nřádek\" class Main : Object {\r\n run [| x := 'ž'. ] }\r\n",
+    "class Main : Object { run [| ] } \"a\" \"b\" 'c\"'",
+]
+
+@pytest.mark.parametrize("SOL25Code", INPUT_PROGRAMS)
+def test_input_ok_matches_stdin(tmp_path, SOL25Code):
+    sourcePath = tmp_path / "program.sol25"
+    sourcePath.write_bytes(SOL25Code.encode("utf-8"))
+    expected = run_process(SOL25Code)
+    process = run_process("", ["--input", str(sourcePath)])
+    assert (process.returncode, process.stdout, process.stderr) == \
+        (expected.returncode, expected.stdout, expected.stderr)
+
+def test_input_ok_with_cache(tmp_path):
+    sourcePath = tmp_path / "program.sol25"
+    sourcePath.write_text(INPUT_PROGRAMS[0])
+    cacheDirectory = str(tmp_path / "cache")
+    expected = run_process(INPUT_PROGRAMS[0])
+    for _ in range(2):
+        process = run_process("", ["--input", str(sourcePath), "--cache", cacheDirectory])
+        assert (process.returncode, process.stdout) == (expected.returncode, expected.stdout)
+    assert len(os.listdir(cacheDirectory)) == 1
+
+@pytest.mark.parametrize("content", [None, b"", b"class Main : Object { run [| x := '\xff'. ] }"])
+def test_input_bad_file(tmp_path, content):
+    sourcePath = tmp_path / "program.sol25"
+    if content is not None:
+        sourcePath.write_bytes(content)
+    process = run_process("class Main : Object { run [| ] }", ["--input", str(sourcePath)])
+    assert process.returncode == 11
+    assert process.stdout == ""
+
+def test_input_bad_directory(tmp_path):
+    run_arg_test(["--input", str(tmp_path)], 11)
+
+def test_input_bad_parameters(tmp_path):
+    sourcePath = str(tmp_path / "program.sol25")
+    run_arg_test(["--input"], 10)
+    run_arg_test(["--input", sourcePath, "--batch", str(tmp_path)], 10)
+    run_arg_test(["--input", sourcePath, "--serve", "a.sock"], 10)
+    run_arg_test(["--input", sourcePath, "--jobs", "2"], 10)
+
+@pytest.mark.parametrize("SOL25Code, expected", [
+    ("class Main : Object { }", None),
+    ('"nedokončený komentář', None),
+    ('""', ""),
+    ('"první" "druhý"', "první"),
+    ('x "víc\nřádků" y "', "víc\nřádků"),
+    ('"a"' + "'" * 100000 + '"', "a"),
+])
+def test_input_ok_first_comment(SOL25Code, expected):
+    assert get_first_comment(SOL25Code) == expected
+
+################################################################################
+#                                                                              #
+#                             UZLY AST TESTY                                   #
+#                                                                              #
+################################################################################
+
+def collect_ast_nodes(ASTRoot):
+    nodes, stack = [], [ASTRoot]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, ASTNodes.ASTAbstractNode):
+            nodes.append(node)
+            # Atributy podle třídy uzlu v `ASTNodes` (i pro pohledy plochého AST)
+            nodeClass = next(nodeClass for nodeClass in type(node).__mro__
+                             if nodeClass.__qualname__.startswith("ASTNodes."))
+            stack.extend(getattr(node, slot) for slot in nodeClass.__slots__)
+    return nodes
+
+def test_ast_nodes_ok_slots_keep_attribute_names():
+    ASTRoot = LarkParser().parse_code(PARITY_PROGRAMS[0])
+    nodes = collect_ast_nodes(ASTRoot)
+    assert {type(node).__name__ for node in nodes} >= {"ProgramNode", "ClassNode", "MethodNode",
+                                                        "BlockNode", "LiteralNode"}
+    for node in nodes:
+        assert not hasattr(node, "__dict__")
+    classNode = ASTRoot.classNodeList[0]
+    assert (classNode.identifier, classNode.perentIdentifier) == ("Main", "Object")
+    expression = ASTNodes.ExpressionNode(ASTNodes.IdentifierNode("x"), "plus:", [ASTNodes.LiteralNode("Integer", 1)])
+    assert (expression.receiver.identifier, expression.selector, expression.argNodeList[0].literalValue) == \
+        ("x", "plus:", 1)
+    with pytest.raises(AttributeError):
+        expression.unknownAttribute = None
+
+def test_ast_nodes_ok_names_are_interned():
+    SOL25Code = """
+    class Main : Object {
+        run [| x := 1. y := x plus: 2. z := x. w := self foo: y bar: x. v := Foo new. ]
+        foo:bar: [:a :b | c := a. ]
+    }
+    class Foo : Main { }
+    """
+    ASTRoot = LarkParser().parse_code(SOL25Code)
+    treeRoot = LarkParser(buildParseTree=True).parse_code(SOL25Code)
+    assert treeRoot.classNodeList[0].identifier is ASTRoot.classNodeList[0].identifier
+    mainNode, fooNode = ASTRoot.classNodeList
+    runNode, fooBarNode = mainNode.methodNodeList
+    statements = runNode.blockNode.statementNodeList
+    assert statements[0].identifierNode.identifier is statements[1].exprNode.receiver.identifier
+    assert statements[2].exprNode.identifier is statements[0].identifierNode.identifier
+    assert statements[3].exprNode.selector is fooBarNode.selector
+    assert fooNode.perentIdentifier is mainNode.identifier
+    assert statements[4].exprNode.receiver.identifier is fooNode.identifier
+    assert fooBarNode.blockNode.parameterNodeList[0] is \
+        fooBarNode.blockNode.statementNodeList[0].exprNode.identifier
+    builtinSelector = next(key for key in BUILTIN_CLASS_TABLE["Integer"].methods if key == "plus:")
+    assert statements[1].exprNode.selector is builtinSelector
+
+################################################################################
+#                                                                              #
+#                              PLOCHÝ AST TESTY                                #
+#                                                                              #
+################################################################################
+
+def backend_analysis_result(SOL25Code, parser):
+    try:
+        ASTRoot = parser.parse_code(SOL25Code)
+        SemanticAnalyser().analyse_semantic(ASTRoot)
+        return XMLGenerator().generate_XML(ASTRoot, SOL25Code)
+    except Exception as e:
+        return type(e), getattr(e, "errorCode", None), getattr(e, "errorDetail", str(e))
+
+def random_program(rng):
+    classes = [("Main", "Object", [("run", 0, [random_statement(rng, INCREMENTAL_STATEMENTS)])])]
+    for identifier in rng.sample(INCREMENTAL_CLASS_NAMES[1:], rng.randint(0, 4)):
+        parentIdentifier = rng.choice(["Object", "Main", "String"] + [name for name, _, _ in classes])
+        classes.append((identifier, parentIdentifier, random_methods(rng, INCREMENTAL_STATEMENTS)))
+    rng.shuffle(classes)
+    return "\n".join(render_class(*parts) for parts in classes)
+
+@pytest.mark.parametrize("buildParseTree", [False, True])
+def test_flat_ast_ok_identical_output(buildParseTree):
+    objectParser = LarkParser(buildParseTree=buildParseTree)
+    flatParser = LarkParser(buildParseTree=buildParseTree, astBackend=FLAT_AST_BACKEND)
+    rng = random.Random(18)
+    programs = INPUT_PROGRAMS + [random_program(rng) for _ in range(200)]
+    results = set()
+    for SOL25Code in programs:
+        expected = backend_analysis_result(SOL25Code, objectParser)
+        assert backend_analysis_result(SOL25Code, flatParser) == expected
+        results.add(expected if isinstance(expected, tuple) else 0)
+    assert 0 in results and len(results) > 3  # úspěšné i různé chybové programy
+
+def test_flat_ast_ok_views():
+    ASTRoot = LarkParser(astBackend=FLAT_AST_BACKEND).parse_code(PARITY_PROGRAMS[0])
+    tree = ASTRoot.tree
+    assert isinstance(ASTRoot, ASTNodes.ProgramNode)
+    assert len(collect_ast_nodes(ASTRoot)) == len(tree)
+    assert ASTRoot.index == len(tree) - 1
+    assert tree.kinds.itemsize == 1 and tree.children.itemsize == 4
+    classNode = ASTRoot.classNodeList[0]
+    assert isinstance(classNode, ASTNodes.ClassNode)
+    assert (classNode.identifier, classNode.perentIdentifier) == ("Main", "Object")
+    blockNode = classNode.methodNodeList[0].blockNode
+    assert isinstance(blockNode, ASTNodes.BlockNode) and blockNode.parameterNodeList == []
+    expression = blockNode.statementNodeList[0].exprNode
+    assert isinstance(expression, ASTNodes.ExpressionNode)
+    assert (expression.selector, expression.receiver.literalValue, expression.argNodeList[0].literalValue) == \
+        ("plus:", 1, 2)
+    assert len(tree.stringTable) == len(set(tree.stringTable))
+
+def test_flat_ast_bad_backend():
+    with pytest.raises(parse.Error.InternalError):
+        LarkParser(astBackend="tree")
+
+@pytest.mark.parametrize("SOL25Code", CACHE_PROGRAMS)
+def test_flat_ast_ok_command_line(SOL25Code):
+    expected = run_process(SOL25Code)
+    process = run_process(SOL25Code, ["--ast-backend", "flat"])
+    assert (process.returncode, process.stdout, process.stderr) == \
+        (expected.returncode, expected.stdout, expected.stderr)
+
+def test_flat_ast_bad_parameters(tmp_path):
+    run_arg_test(["--ast-backend", "tree"], 10)
+    run_arg_test(["--ast-backend", "flat", "--batch", str(tmp_path)], 10)
+    run_arg_test(["--ast-backend", "flat", "--serve", "a.sock"], 10)
+
+################################################################################
+#                                                                              #
+#                         ITERATIVNÍ PRŮCHOD AST TESTY                         #
+#                                                                              #
+################################################################################
+
+DEEP_NESTING = 100000
+
+def deep_send_program(depth, innermost):
+    return ("class Main : Object { run [| x := " + "(1 plus: " * depth + innermost
+            + ")" * depth + ". ] }")
+
+def deep_ast(depth, innermost):
+    expression = ASTNodes.IdentifierNode(innermost)
+    for i in range(depth):
+        if i % 2:
+            expression = ASTNodes.ExpressionNode(ASTNodes.LiteralNode("Integer", 1), "plus:", [expression])
+        else:
+            assign = ASTNodes.AssignNode(ASTNodes.IdentifierNode("y"), expression)
+            expression = ASTNodes.BlockNode(["p%d" % i], [assign])
+    run = ASTNodes.MethodNode("run", ASTNodes.BlockNode([], [
+        ASTNodes.AssignNode(ASTNodes.IdentifierNode("x"), expression)]))
+    return ASTNodes.ProgramNode([ASTNodes.ClassNode("Main", "Object", [run])])
+
+def test_iterative_ok_deep_semantic():
+    SemanticAnalyser().analyse_semantic(deep_ast(DEEP_NESTING, "p0"))
+
+def test_iterative_bad_deep_semantic():
+    with pytest.raises(parse.Error.SemanticUndefinedSymbolError, match="'z'"):
+        SemanticAnalyser().analyse_semantic(deep_ast(DEEP_NESTING, "z"))
+
+def test_iterative_bad_deep_command_line():
+    process = run_process(deep_send_program(20000, "y"))
+    assert process.returncode == 32 and "Variable 'y' is not defined." in process.stderr
+
+@pytest.mark.parametrize("SOL25Code, sendCount, blockCount", [
+    ("class Main : Object { run [| x := 1. y := " + "(" * 1000 + "x" + " asString)" * 1000
+     + " asString. ] }", 1001, 1),
+    ("class Main : Object { run [| " + "x := [:a | " * 700 + "x := a." + " ]." * 700 + " ] }", 0, 701),
+])
+def test_iterative_ok_deep_xml(SOL25Code, sendCount, blockCount):
+    process = run_process(SOL25Code)
+    assert process.returncode == 0
+    root = ET.fromstring(process.stdout)
+    assert (len(list(root.iter("send"))), len(list(root.iter("block")))) == (sendCount, blockCount)
+
+@pytest.mark.parametrize("SOL25Code, errorCode, detail", [
+    # příjemce se kontroluje před argumenty, argumenty před selektorem
+    ("class Main : Object { run [| x := a plus: b. ] }", 32, "Variable 'a' is not defined."),
+    ("class Main : Object { run [| x := Integer foo: (y plus: 1). ] }", 32, "Variable 'y' is not defined."),
+    ("class Main : Object { run [| x := Integer foo. ] }", 32,
+     "Class 'Integer' doesn't know any class method 'foo'."),
+    # proměnná bloku po jeho skončení zaniká
+    ("class Main : Object { run [| x := [:a | b := a. ]. c := b. ] }", 32, "Variable 'b' is not defined."),
+    ("class Main : Object { run [| x := [:a :a | ]. ] }", 35, "Trying to redefine formal parameter 'a'."),
+    ("class Main : Object { run [| x := [:a | a := 1. ]. ] }", 34,
+     "Assignment to formal parameter (a) is not allowed."),
+])
+def test_iterative_bad_error_order(SOL25Code, errorCode, detail):
+    for parser in (LarkParser(), LarkParser(astBackend=FLAT_AST_BACKEND)):
+        _, code, errorDetail = backend_analysis_result(SOL25Code, parser)
+        assert (code, errorDetail) == (errorCode, detail)
+
+################################################################################
+#                                                                              #
+#                            SLOUČENÝ PRŮCHOD TESTY                            #
+#                                                                              #
+################################################################################
+
+def fused_analysis_result(SOL25Code, parser):
+    try:
+        return FusedAnalyser().generate_XML(parser.parse_code(SOL25Code), SOL25Code)
+    except Exception as e:
+        return type(e), getattr(e, "errorCode", None), getattr(e, "errorDetail", str(e))
+
+@pytest.mark.parametrize("astBackend", ["object", "flat"])
+def test_fused_ok_identical_output(astBackend):
+    parser = LarkParser(astBackend=astBackend)
+    rng = random.Random(20)
+    programs = INPUT_PROGRAMS + [random_program(rng) for _ in range(300)]
+    results = set()
+    for SOL25Code in programs:
+        expected = backend_analysis_result(SOL25Code, parser)
+        assert fused_analysis_result(SOL25Code, parser) == expected
+        results.add(expected if isinstance(expected, tuple) else 0)
+    assert 0 in results and len(results) > 3  # úspěšné i různé chybové programy
+
+def test_fused_ok_deep_nesting():
+    parser = LarkParser()
+    for SOL25Code in (deep_send_program(300, "x"),
+                      "class Main : Object { run [| " + "x := [:a | " * 300 + "x := a." + " ]." * 300 + " ] }"):
+        assert fused_analysis_result(SOL25Code, parser) == backend_analysis_result(SOL25Code, parser)
+
+def test_fused_bad_discards_output():
+    SOL25Code = "class Main : Object { run [| x := 1. ] }\nclass A : Object { foo [| y := z. ] }"
+    sink = io.StringIO()
+    with pytest.raises(parse.Error.SemanticUndefinedSymbolError):
+        FusedAnalyser().write_XML(LarkParser().parse_code(SOL25Code), SOL25Code, sink)
+    assert sink.getvalue() == ""
+
+@pytest.mark.parametrize("SOL25Code", CACHE_PROGRAMS)
+def test_fused_ok_command_line(SOL25Code):
+    expected = run_process(SOL25Code)
+    for args in (["--fused"], ["--fused", "--ast-backend", "flat"]):
+        process = run_process(SOL25Code, args)
+        assert (process.returncode, process.stdout, process.stderr) == \
+            (expected.returncode, expected.stdout, expected.stderr)
+
+def test_fused_bad_parameters(tmp_path):
+    run_arg_test(["--fused", "--batch", str(tmp_path)], 10)
+    run_arg_test(["--fused", "--serve", "a.sock"], 10)
+    run_arg_test(["--serve=a.sock", "--fused"], 10)
+
+################################################################################
+#                                                                              #
+#                              LEXER SOL25 TESTY                               #
+#                                                                              #
+################################################################################
+
+LEXER_ALPHABET = list("abxzSN_09+-:=.|[](){}'\"\\ \n\t;#é٣") + \
+    ["self", "class", "nil", "true", "super", "Main", "run", ":=", "x:", ":a", "'a\\n'", '"c"']
+
+def mutated_program(rng, SOL25Code):
+    characters = list(SOL25Code)
+    for _ in range(rng.randint(1, 4)):
+        index = rng.randrange(len(characters) + 1)
+        operation = rng.random()
+        if operation < 0.4 or not characters:
+            characters.insert(index, rng.choice(LEXER_ALPHABET))
+        elif operation < 0.7:
+            del characters[min(index, len(characters) - 1)]
+        else:
+            characters[min(index, len(characters) - 1)] = rng.choice(LEXER_ALPHABET)
+    return "".join(characters)
+
+def lexer_programs(seed, count):
+    rng = random.Random(seed)
+    programs = INPUT_PROGRAMS + [random_program(rng) for _ in range(50)]
+    return programs + [mutated_program(rng, rng.choice(programs)) for _ in range(count)]
+
+def token_stream(tokens):
+    result = []
+    try:
+        for token in tokens:
+            result.append((token.type, str(token), token.start_pos, token.line, token.column,
+                           token.end_line, token.end_column, token.end_pos))
+    except Exception as e:
+        result.append((type(e).__name__, e.line, e.column, sorted(e.allowed)))
+    return result
+
+def parse_error(SOL25Code, parser):
+    try:
+        parser._larkParser.parse(SOL25Code)
+        return None
+    except Exception as e:
+        token = getattr(e, "token", None)
+        expected = getattr(e, "expected", None) or getattr(e, "allowed", None)
+        return (type(e).__name__, e.line, e.column, sorted(expected),
+                token and (token.type, str(token), token.start_pos, token.end_pos))
+
+@pytest.mark.parametrize("buildParseTree", [False, True])
+def test_lexer_ok_identical_results(buildParseTree):
+    larkParser = LarkParser(buildParseTree=buildParseTree, lexer=LARK_LEXER)
+    SOL25Parser = LarkParser(buildParseTree=buildParseTree, lexer=SOL25_LEXER)
+    results = set()
+    for SOL25Code in lexer_programs(21, 1500):
+        expected = backend_analysis_result(SOL25Code, larkParser)
+        assert backend_analysis_result(SOL25Code, SOL25Parser) == expected
+        results.add(expected[1] if isinstance(expected, tuple) else 0)
+    assert {0, 21, 22} <= results
+
+def test_lexer_ok_identical_tokens_and_errors():
+    larkParser = LarkParser(lexer=LARK_LEXER)
+    SOL25Parser = LarkParser(lexer=SOL25_LEXER)
+    lexer = SOL25Parser._larkParser.parser.lexer
+    for SOL25Code in lexer_programs(22, 1000):
+        # bez stavu parseru se rozpoznávají všechny terminály (jako 'Lark.lex()')
+        assert token_stream(lexer.lex(LexerState(SOL25Code), None)) == \
+            token_stream(larkParser._larkParser.lex(SOL25Code))
+        assert parse_error(SOL25Code, SOL25Parser) == parse_error(SOL25Code, larkParser)
+
+@pytest.mark.parametrize("SOL25Code, errorCode", [
+    ("class Main : Object { run [| x := 'a\nb'. y := 'c\\'d'. ] }", 0),
+    ("class Main : Object { run [| x:=1. y := x foo:2. ] }", 0),
+    ("class Main : Object { run [| x := 1. y := ٣. ] }", 0),
+    ("class Main : Object { run [| x := 'a\\t'. ] }", 21),
+    ("class Main : Object { run [| x := 'a. ] }", 21),
+    ("class Main : Object { run [| x := 1 # 2. ] }", 21),
+    ("class Main : Object { run [| x := 1; ] }", 21),
+    ("class Main : Object { run [| x := 1. ] }\n\"komentář", 21),
+    # terminál existuje, ale v daném místě jej parser nepřijímá
+    ("class Main : Object { run [| x := 1 self. ] }", 22),
+    ("class Main : Object { run [| x := y: 1. ] }", 22),
+    # kde parser nepřijímá 'ID', rozpozná se klíčové slovo i na začátku identifikátoru
+    ("classMain : Object { run [| ] }", 0),
+])
+def test_lexer_ok_error_codes(SOL25Code, errorCode):
+    for lexer in (LARK_LEXER, SOL25_LEXER):
+        result = backend_analysis_result(SOL25Code, LarkParser(lexer=lexer))
+        assert (result[1] if isinstance(result, tuple) else 0) == errorCode
+
+def test_lexer_ok_positions():
+    lexer = LarkParser()._larkParser.parser.lexer
+    tokens = list(lexer.lex(LexerState("x\n 'a\nbc' \"k\nk\"\n\t y:"), None))
+    assert [(token.type, token.line, token.column, token.end_line, token.end_column) for token in tokens] == \
+        [("ID", 1, 1, 1, 2), ("STRING_LITERAL", 2, 2, 3, 4), ("ID_SELECTOR", 5, 3, 5, 5)]
+
+class PublicOnlyLark:
+    def __init__(self, larkParser):
+        self.parse = larkParser.parse
+
+def test_lexer_ok_missing_lark_internals(monkeypatch):
+    createLarkParser = LarkParser._create_lark_parser
+    monkeypatch.setattr(LarkParser, "_create_lark_parser", staticmethod(
+        lambda cacheDirectory, transformer=None: PublicOnlyLark(createLarkParser(cacheDirectory, transformer))))
+    parser = LarkParser()
+    assert parser.parse_code("class Main : Object { run [| x := 1. ] }").classNodeList[0].identifier == "Main"
+    with pytest.raises(parse.Error.LexicalError):
+        parser.parse_code("class Main : Object { run [| x := 1 # 2. ] }")
+
+def test_lexer_bad_name():
+    with pytest.raises(parse.Error.InternalError):
+        LarkParser(lexer="dfa")
+
+################################################################################
+#                                                                              #
+#                       PŘEDBĚŽNÝ PRŮCHOD LITERÁLŮ TESTY                       #
+#                                                                              #
+################################################################################
+
+def test_literal_spans_ok_match_tokens():
+    larkParser = LarkParser(lexer=LARK_LEXER)._larkParser
+    checked = 0
+    for SOL25Code in lexer_programs(23, 1000):
+        try:
+            tokens = list(larkParser.lex(SOL25Code, dont_ignore=True))
+        except Exception:
+            continue  # úseky za lexikální chybou lexer nepoužije
+        expected = {token.start_pos: token.end_pos for token in tokens
+                    if token.type in ("COMMENT", "STRING_LITERAL")}
+        assert scan_literal_spans(SOL25Code)[0] == expected
+        checked += 1
+    assert checked > 100
+
+@pytest.mark.parametrize("SOL25Code, ends", [
+    ("'a\\'b' \"c'd\" 'e\"f'", {0: 6, 7: 12, 13: 18}),
+    ("'a\\\\' 'b'", {0: 5, 6: 9}),
+    ("'a\\\\\\'' x", {0: 7}),
+    ("'neuzavřený \"k\"", {}),
+    ("\"k\" 'neuzavřený", {0: 3}),
+])
+def test_literal_spans_ok_escapes(SOL25Code, ends):
+    assert scan_literal_spans(SOL25Code)[0] == ends
+
+@pytest.mark.parametrize("SOL25Code, description", [
+    ("class Main : Object { run [| x := 'a \"b\" c'. ] } \"skutečný\"", "skutečný"),
+    ("class Main : Object { run [| x := 'a \"b\" c'. ] }", None),
+    ("\"it's\" class Main : Object { run [| x := 'y'. ] }", "it's"),
+])
+def test_literal_spans_ok_description(SOL25Code, description):
+    process = run_process(SOL25Code)
+    assert process.returncode == 0
+    assert ET.fromstring(process.stdout).get("description") == description
+
+def test_literal_spans_ok_first_comment_shared():
+    SOL25Code = "class Main : Object { run [| x := '\"'. ] } \"popis\""
+    literalSpans = find_literal_spans(SOL25Code)
+    parser = LarkParser()
+    parser.parse_code(SOL25Code, literalSpans)
+    # parser si předběžný průchod po parsování nedrží
+    assert parser._SOL25Lexer.literalSpans is None
+    assert get_first_comment(SOL25Code, literalSpans) == "popis"
+    # průchod jiného kódu se nepoužije, kód se prohledá znovu
+    otherCode = "class Main : Object { run [| ] } \"jiný\""
+    assert get_first_comment(otherCode, literalSpans) == "jiný"
+    assert get_first_comment(SOL25Code) == "popis"
+
+@pytest.mark.parametrize("maxErrors", [None, 5])
+def test_literal_spans_ok_passed_to_parser(monkeypatch, maxErrors):
+    SOL25Code = "class Main : Object { run [| x := 'a \"b\" c'. y := 1 1. ] } \"popis\""
+    literalSpans = find_literal_spans(SOL25Code)
+    expected = syntax_check_result(LarkParser(maxErrors=maxErrors), SOL25Code)
+    # lexer ani obsluha chyb nesmí předaný průchod provádět znovu
+    def fail(code):
+        raise AssertionError("literal spans scanned again")
+    monkeypatch.setattr(LarkParserModule, "find_literal_spans", fail)
+    monkeypatch.setattr(sys.modules["MyPyModules.SOL25Lexer"], "find_literal_spans", fail)
+    with pytest.raises(parse.Error.CustomError) as error:
+        LarkParser(maxErrors=maxErrors).parse_code(SOL25Code, literalSpans)
+    assert (error.value.errorCode, error.value.errorDetail) == expected
+
+################################################################################
+#                                                                              #
+#                            KONTROLA SYNTAXE TESTY                            #
+#                                                                              #
+################################################################################
+
+def syntax_check_result(parser, SOL25Code):
+    try:
+        parser.parse_code(SOL25Code)
+        return 0
+    except parse.Error.CustomError as e:
+        return (e.errorCode, e.errorDetail)
+
+@pytest.mark.parametrize("lexer", ["sol25", "lark"])
+def test_check_syntax_ok_matches_parser(lexer):
+    fullParser = LarkParser(lexer=lexer)
+    checkParser = LarkParser(lexer=lexer, syntaxOnly=True)
+    for SOL25Code in lexer_programs(29, 1500):
+        assert syntax_check_result(checkParser, SOL25Code) == syntax_check_result(fullParser, SOL25Code)
+
+@pytest.mark.parametrize("SOL25Code, expected", [
+    ("class Main : Object { run [| x := 1. ] }", 0),
+    ("class Main : Object { foo [| x := y. ] }", 0),
+    ("class Main : Object { run [| run := 1. ] }", 22),
+    ("class Main : Object { run [| x := Main. ] }", 22),
+    ("class Main : Object { run [| x := run. ] }", 22),
+    ("class Main : Object { run [| self := 1. ] }", 22),
+    ("class Main : Object { self [| ] }", 22),
+    ("class Main : Object { run [:nil | ] }", 22),
+    ("class Main : Object { run [:run | ] }", 22),
+    ("class Main : Object { run [| run := 1. x := # ] }", 21),
+    ("class Main : Object { run [| x := 1 ] }", 22),
+])
+def test_check_syntax_ok_exit_codes(SOL25Code, expected):
+    process = run_process(SOL25Code, ["--check-syntax"])
+    assert process.returncode == expected
+    assert process.stdout == ""
+
+def test_check_syntax_ok_input_file(tmp_path):
+    sourceFile = tmp_path / "program.sol25"
+    sourceFile.write_text("class Main : Object { run [| x := 1. ] }", encoding="utf-8")
+    process = run_process("", ["--check-syntax", "--input", str(sourceFile)])
+    assert (process.returncode, process.stdout) == (0, "")
+
+def test_check_syntax_ok_no_ast():
+    assert LarkParser(syntaxOnly=True).parse_code("class Main : Object { run [| x := 1. ] }") is None
+
+def test_check_syntax_ok_missing_lark_internals(monkeypatch):
+    createLarkParser = LarkParser._create_lark_parser
+    monkeypatch.setattr(LarkParser, "_create_lark_parser", staticmethod(
+        lambda cacheDirectory, transformer=None: PublicOnlyLark(createLarkParser(cacheDirectory, transformer))))
+    checkParser = LarkParser(syntaxOnly=True)
+    assert syntax_check_result(checkParser, "class Main : Object { run [| x := 1. ] }") == 0
+    assert syntax_check_result(checkParser, "class Main : Object { run [| run := 1. ] }")[0] == 22
+
+def test_check_syntax_bad_parameters(tmp_path):
+    run_arg_test(["--check-syntax", "--fused"], 10)
+    run_arg_test(["--check-syntax", "--ast-backend", "flat"], 10)
+    run_arg_test(["--check-syntax", "--batch", str(tmp_path)], 10)
+    run_arg_test(["--check-syntax", "--cache", str(tmp_path)], 10)
+    run_arg_test(["--check-syntax", "--serve", "a.sock"], 10)
+
+def test_check_syntax_bad_parse_tree():
+    with pytest.raises(parse.Error.InternalError):
+        LarkParser(syntaxOnly=True, buildParseTree=True)
+
+################################################################################
+#                                                                              #
+#                            ZOTAVENÍ Z CHYB TESTY                             #
+#                                                                              #
+################################################################################
+
+def recovery_result(parser, SOL25Code):
+    try:
+        parser.parse_code(SOL25Code)
+        return 0, None
+    except parse.Error.CustomError as e:
+        return e.errorCode, e.errorDetail
+
+def first_error_location(SOL25Code):
+    try:
+        LarkParser(buildParseTree=True)._larkParser.parse(SOL25Code)
+    except UnexpectedToken as e:
+        return None if e.token.type == "$END" else (e.token.line, e.token.column)
+    except UnexpectedCharacters as e:
+        return e.line, e.column
+
+@pytest.mark.parametrize("lexer", ["sol25", "lark"])
+@pytest.mark.parametrize("options", [{}, {"syntaxOnly": True}, {"astBackend": "flat"}])
+def test_recovery_ok_matches_parser(lexer, options):
+    normalParser = LarkParser(lexer=lexer, **options)
+    recoveryParser = LarkParser(lexer=lexer, maxErrors=3, **options)
+    for SOL25Code in lexer_programs(31, 600):
+        errorCode, errorDetail = recovery_result(normalParser, SOL25Code)
+        recoveredCode, recoveredDetail = recovery_result(recoveryParser, SOL25Code)
+        assert recoveredCode == errorCode
+        if errorCode in (21, 22) and errorDetail is None:
+            lines = recoveredDetail.split("\n")
+            assert 1 <= len(lines) <= 3
+            location = first_error_location(SOL25Code)
+            if location is not None:
+                assert lines[0].startswith("line %d, column %d: " % location)
+        else:
+            assert recoveredDetail == errorDetail
+
+def test_recovery_ok_lexers_identical():
+    SOL25Parser = LarkParser(lexer="sol25", maxErrors=5)
+    larkParser = LarkParser(lexer="lark", maxErrors=5)
+    for SOL25Code in lexer_programs(37, 1500):
+        assert recovery_result(SOL25Parser, SOL25Code) == recovery_result(larkParser, SOL25Code)
+
+@pytest.mark.parametrize("SOL25Code, errorCode, lines", [
+    ("class Main : Object { run [| x := 1 ]\n foo [| y := 2 ] }", 22,
+     ["line 1, column 37: unexpected token ']'", "line 2, column 16: unexpected token ']'"]),
+    ("class Main : Object { run [| x := (1 plus: 2. ]\n}", 22,
+     ["line 1, column 45: unexpected token '.'"]),
+    ("class Main : Object { run [| x := ### 1. y := @ ] }", 21,
+     ["line 1, column 35: unexpected character '#'", "line 1, column 47: unexpected character '@'"]),
+    ("class Main : Object { run [| x := 1. ]\n foo [| y := 'abc ] }\n\"a\" bar [| ] }", 21,
+     ["line 2, column 14: unexpected character \"'\"", "line 2, column 19: unexpected token ']'",
+      "line 3, column 5: unexpected token 'bar'"]),
+    ("class Main : Object { run [| x := 1. ]\n", 22,
+     ["line 2, column 1: unexpected end of input"]),
+    # po chybě se vstup zahodí až po '.', ']', '}' nebo 'class' ve stejném zanoření
+    ("class Main : Object { run [| x := . y := 1 1. ] }", 22,
+     ["line 1, column 35: unexpected token '.'", "line 1, column 44: unexpected token '1'"]),
+    ("class Main : Object { run [| x := [:a | y := 1 1 ]. z := 2 2. ] }", 22,
+     ["line 1, column 48: unexpected token '1'", "line 1, column 60: unexpected token '2'"]),
+    ("class Main : Object run [| x := 1. ] }\nclass ok : Object { }\nclass B : Object { m [| x := 1 1. ] }", 22,
+     ["line 1, column 21: unexpected token 'run'", "line 2, column 7: unexpected token 'ok'",
+      "line 3, column 32: unexpected token '1'"]),
+])
+def test_recovery_ok_errors(SOL25Code, errorCode, lines):
+    assert recovery_result(LarkParser(maxErrors=10), SOL25Code) == (errorCode, "\n".join(lines))
+
+def test_recovery_ok_valid_class_between_errors():
+    SOL25Code = ("class Main : Object { run [| x := ). ] }\n"
+                 "class Ok : Object { foo [| y := 1. z := y. ] bar [| ] }\n"
+                 "class Bad : Object { baz [| w := 1 1. ] }")
+    for lexer in ("sol25", "lark"):
+        assert recovery_result(LarkParser(lexer=lexer, maxErrors=10), SOL25Code) == \
+            (22, "line 1, column 35: unexpected token ')'\nline 3, column 36: unexpected token '1'")
+
+def test_recovery_ok_max_errors():
+    SOL25Code = "class Main : Object {" + "".join(f" m{index} [| x := 1 ]" for index in range(10)) + " }"
+    for maxErrors in (1, 4, 10):
+        errorCode, errorDetail = recovery_result(LarkParser(maxErrors=maxErrors), SOL25Code)
+        assert errorCode == 22 and len(errorDetail.split("\n")) == maxErrors
+
+@pytest.mark.parametrize("SOL25Code", CACHE_PROGRAMS)
+def test_recovery_ok_same_analysis(SOL25Code):
+    expected = backend_analysis_result(SOL25Code, LarkParser())
+    result = backend_analysis_result(SOL25Code, LarkParser(maxErrors=5))
+    # Výstup i sémantické chyby se nemění, lexikální a syntaktické chyby mají navíc polohu
+    if isinstance(expected, tuple) and expected[1] in (21, 22):
+        assert result[:2] == expected[:2]
+    else:
+        assert result == expected
+
+def test_recovery_ok_command_line():
+    SOL25Code = "class Main : Object { run [| x := 1 ]\n foo [| y := # ] }"
+    for args in (["--max-errors", "5"], ["--max-errors", "5", "--check-syntax"], ["--max-errors", "5", "--fused"]):
+        process = run_process(SOL25Code, args)
+        assert (process.returncode, process.stdout) == (22, "")
+        assert "line 1, column 37: unexpected token ']'" in process.stderr
+        assert "line 2, column 14: unexpected character '#'" in process.stderr
+    process = run_process(CACHE_PROGRAMS[0], ["--max-errors", "5"])
+    assert process.stdout == run_process(CACHE_PROGRAMS[0]).stdout
+
+def test_recovery_bad_parameters(tmp_path):
+    run_arg_test(["--max-errors", "0"], 10)
+    run_arg_test(["--max-errors", "5", "--batch", str(tmp_path)], 10)
+    run_arg_test(["--max-errors", "5", "--cache", str(tmp_path)], 10)
+    run_arg_test(["--max-errors", "5", "--serve", "a.sock"], 10)
+    with pytest.raises(parse.Error.InternalError):
+        LarkParser(maxErrors=0)
+
+################################################################################
+#                                                                              #
+#                       SBÍRÁNÍ SÉMANTICKÝCH CHYB TESTY                        #
+#                                                                              #
+################################################################################
+
+def semantic_result(analyser, ASTRoot):
+    try:
+        analyser.analyse_semantic(ASTRoot)
+        return None
+    except parse.Error.CustomError as e:
+        return e
+
+@pytest.mark.parametrize("astBackend", ["object", "flat"])
+def test_semantic_errors_ok_contains_first_error(astBackend):
+    rng = random.Random(41)
+    parser = LarkParser(astBackend=astBackend)
+    checked = 0
+    for SOL25Code in lexer_programs(41, 1500) + [random_program(rng) for _ in range(500)]:
+        try:
+            ASTRoot = parser.parse_code(SOL25Code)
+        except parse.Error.CustomError:
+            continue
+        error = semantic_result(SemanticAnalyser(), ASTRoot)
+        collected = semantic_result(SemanticAnalyser(maxErrors=1000), ASTRoot)
+        if error is None:
+            assert collected is None
+            continue
+        lines = collected.errorDetail.split("\n")
+        assert f"error {error.errorCode}: {error.errorDetail}" in lines
+        assert lines[0].startswith(f"error {collected.errorCode}: ")
+        checked += 1
+    assert checked > 100
+
+def test_semantic_errors_ok_source_order():
+    SOL25Code = ("class Main : Object { run [| x := y. z := w foo. ] }\n"
+                 "class A : Object { foo: [:a | a := 1. b := Q new. ] bar [| x := Integer fooo. ] }\n"
+                 "class A : B { }")
+    ASTRoot = LarkParser().parse_code(SOL25Code)
+    # Bez sbírání chyb se nejprve kontrolují hlavičky všech tříd
+    assert isinstance(semantic_result(SemanticAnalyser(), ASTRoot), parse.Error.SemanticOtherError)
+    error = semantic_result(SemanticAnalyser(maxErrors=10), ASTRoot)
+    assert isinstance(error, parse.Error.SemanticUndefinedSymbolError)
+    assert error.errorDetail.split("\n") == [
+        "error 32: Variable 'y' is not defined.",
+        "error 32: Variable 'w' is not defined.",
+        "error 34: Assignment to formal parameter (a) is not allowed.",
+        "error 32: Class 'Q' is not defined.",
+        "error 32: Class 'Integer' doesn't know any class method 'fooo'.",
+        "error 35: Class 'A' is already defined.",
+    ]
+    error = semantic_result(SemanticAnalyser(maxErrors=2), ASTRoot)
+    assert error.errorDetail.split("\n") == ["error 32: Variable 'y' is not defined.",
+                                             "error 32: Variable 'w' is not defined."]
+
+@pytest.mark.parametrize("SOL25Code, lines", [
+    ("class A : B { foo [| x := y. ] }",
+     ["error 32: Class 'B' is not defined.", "error 32: Variable 'y' is not defined.",
+      "error 31: Class 'Main' is missing."]),
+    ("class Main : Object { run [:a | ] }\nclass A : Main { run [:a :a | x := 1. ] }",
+     ["error 33: Method 'run' must have no parameters.", "error 33: Method 'run' must have no parameters.",
+      "error 33: Override of method 'run' in class 'A' has incorrect arity. "
+      "Original method has arity '1'; new method has arity '2'.",
+      "error 35: Trying to redefine formal parameter 'a'."]),
+    ("class Main : Object { run [ | x := a. ] foo [ | y := a. ] }",
+     ["error 32: Variable 'a' is not defined.", "error 32: Variable 'a' is not defined."]),
+    ("class Main : Object { run [ | x := w foo. y := w bar: w. ] }",
+     ["error 32: Variable 'w' is not defined.", "error 32: Variable 'w' is not defined.",
+      "error 32: Variable 'w' is not defined."]),
+    ("class Main : A { run [| ] }\nclass A : Main { }",
+     ["error 35: Cyclic inheritance detected: 'Main' -> 'A' -> 'Main'."]),
+])
+def test_semantic_errors_ok_details(SOL25Code, lines):
+    error = semantic_result(SemanticAnalyser(maxErrors=10), LarkParser().parse_code(SOL25Code))
+    assert error.errorDetail.split("\n") == lines
+
+@pytest.mark.parametrize("SOL25Code", CACHE_PROGRAMS + [
+    "class Main : Object { run [| x := y. ] foo [| z := Q. ] }",
+    "class Main : Object { run [| x := [:a | a := b. ] value: 1. ] }",
+])
+def test_semantic_errors_ok_fused(SOL25Code):
+    try:
+        ASTRoot = LarkParser().parse_code(SOL25Code)
+    except parse.Error.CustomError:
+        return
+    error = semantic_result(SemanticAnalyser(maxErrors=5), ASTRoot)
+    sink = io.StringIO()
+    try:
+        FusedAnalyser(maxErrors=5).write_XML(ASTRoot, SOL25Code, sink)
+        fusedError = None
+    except parse.Error.CustomError as e:
+        fusedError = e
+    if error is None:
+        assert fusedError is None and sink.getvalue() == XMLGenerator().generate_XML(ASTRoot, SOL25Code)
+    else:
+        assert (type(fusedError), fusedError.errorDetail) == (type(error), error.errorDetail)
+        assert sink.getvalue() == ""
+
+def test_semantic_errors_ok_command_line():
+    SOL25Code = "class Main : Object { run [| x := y. z := w. ] }\nclass Main : Object { }"
+    for args in (["--max-errors", "5"], ["--max-errors", "5", "--fused"],
+                 ["--max-errors", "5", "--ast-backend", "flat"]):
+        process = run_process(SOL25Code, args)
+        assert (process.returncode, process.stdout) == (32, "")
+        for line in ("error 32: Variable 'y' is not defined.", "error 32: Variable 'w' is not defined.",
+                     "error 35: Class 'Main' is already defined."):
+            assert line in process.stderr
+    assert run_process(SOL25Code).returncode == 35
+
 ### konec souboru 'test.py' ###